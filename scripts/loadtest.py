@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Prueba de carga de la demo FM con sesiones concurrentes sin navegador.
+
+Cada sesión simulada es una instancia de streamlit.testing.v1.AppTest que
+ejecuta src/main.py y mueve controles del sidebar y de la pestaña de
+demodulación como lo haría un estudiante. Se mide la latencia de cada
+reejecución y se informan percentiles p50/p95/p99, CPU y RSS por sesión.
+
+Uso:
+    python scripts/loadtest.py --sessions 8 --reruns 10 --scenario pequeño
+    python scripts/loadtest.py --scenario peor --no-cache --json resultado.json
+
+Las sesiones comparten el proceso, como en un servidor real: la caché, el
+pool de cómputo y el hilo de renderizado son comunes a todas. La CPU y el
+RSS por sesión son los del proceso completo divididos por el número de
+sesiones.
+"""
+import argparse
+import json
+import os
+import random
+import resource
+import sys
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+from streamlit.testing.v1 import AppTest
+
+APP_PATH = Path(__file__).resolve().parent.parent / "src" / "main.py"
+
+# Estado inicial del sidebar por escenario (valores en unidades de los controles)
+SCENARIOS = {
+    "pequeño": {"auto_fs": True, "Duración de la señal (ms)": 1},
+    "defecto": {"auto_fs": True},
+    "peor": {"auto_fs": False, "Frecuencia de muestreo (MHz)": 20.0, "Duración de la señal (ms)": 20},
+}
+
+# Cambios realistas: (control, valores posibles)
+SLIDER_MOVES = [
+    ("Índice de modulación β", [1.0, 2.5, 5.0, 8.0, 12.0]),
+    ("Frecuencia del mensaje fm (kHz)", [0.5, 1.0, 2.0, 5.0]),
+    ("Amplitud del mensaje Am (V)", [0.5, 1.0, 2.0]),
+    ("Ajuste el nivel de SNR [dB]:", [5, 10, 20, 30, 50]),
+]
+WAVEFORMS = ["Senoidal", "Cuadrada", "Diente de Sierra", "Triangular"]
+
+
+def current_rss_bytes() -> int:
+    """RSS actual del proceso (Linux: /proc; en otros sistemas, el pico)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _find(widgets, label):
+    for widget in widgets:
+        if widget.label == label:
+            return widget
+    return None
+
+
+def _apply_scenario(at: AppTest, scenario: dict):
+    auto = _find(at.sidebar.checkbox, "Fs automática (mínima válida)")
+    if auto is not None and auto.value != scenario["auto_fs"]:
+        auto.set_value(scenario["auto_fs"])
+        at.run()
+    for label, value in scenario.items():
+        if label == "auto_fs":
+            continue
+        slider = _find(at.sidebar.slider, label)
+        if slider is not None:
+            slider.set_value(value)
+    at.run()
+
+
+def _random_move(at: AppTest, rng: random.Random):
+    """Aplica un cambio aleatorio de control, como un usuario real."""
+    if rng.random() < 0.2:
+        radio = _find(at.sidebar.radio, "Seleccione el tipo de mensaje:")
+        radio.set_value(rng.choice(WAVEFORMS))
+        return
+    label, values = rng.choice(SLIDER_MOVES)
+    slider = _find(at.sidebar.slider, label) or _find(at.slider, label)
+    if slider is not None:
+        slider.set_value(rng.choice(values))
+
+
+def run_session(index: int, scenario: dict, reruns: int, latencies: list, errors: list, seed: int):
+    """Una sesión simulada: estado inicial del escenario y reejecuciones aleatorias."""
+    rng = random.Random(seed + index)
+    at = AppTest.from_file(str(APP_PATH), default_timeout=600)
+    try:
+        at.run()
+        _apply_scenario(at, scenario)
+        for _ in range(reruns):
+            _random_move(at, rng)
+            start = time.perf_counter()
+            at.run()
+            latencies.append(time.perf_counter() - start)
+            if at.exception:
+                errors.append(str(at.exception[0].message))
+    except Exception as exc:  # Se reporta, no se aborta la prueba completa
+        errors.append(repr(exc))
+
+
+def run_load_test(sessions: int, reruns: int, scenario_name: str, seed: int = 0) -> dict:
+    """
+    Lanza las sesiones concurrentes y resume las métricas.
+
+    Args:
+        sessions: Número de sesiones simultáneas
+        reruns: Reejecuciones medidas por sesión
+        scenario_name: Clave de SCENARIOS
+        seed: Semilla de los cambios aleatorios
+
+    Returns:
+        dict con percentiles de latencia, CPU y RSS por sesión
+    """
+    scenario = SCENARIOS[scenario_name]
+    latencies, errors = [], []
+
+    rss_start = current_rss_bytes()
+    cpu_start = time.process_time()
+    wall_start = time.perf_counter()
+
+    threads = [
+        threading.Thread(target=run_session, args=(i, scenario, reruns, latencies, errors, seed))
+        for i in range(sessions)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    wall = time.perf_counter() - wall_start
+    cpu = time.process_time() - cpu_start
+    rss_end = current_rss_bytes()
+
+    lat_ms = np.array(latencies) * 1000 if latencies else np.array([np.nan])
+    return {
+        "escenario": scenario_name,
+        "sesiones": sessions,
+        "reejecuciones": len(latencies),
+        "p50_ms": float(np.percentile(lat_ms, 50)),
+        "p95_ms": float(np.percentile(lat_ms, 95)),
+        "p99_ms": float(np.percentile(lat_ms, 99)),
+        "media_ms": float(np.mean(lat_ms)),
+        "reejecuciones_por_s": len(latencies) / wall if wall > 0 else 0.0,
+        "cpu_s_por_sesion": cpu / sessions,
+        "rss_mb_por_sesion": (rss_end - rss_start) / sessions / 2**20,
+        "rss_mb_total": rss_end / 2**20,
+        "errores": errors,
+    }
+
+
+def format_summary(summary: dict) -> str:
+    """Resumen legible de una prueba de carga."""
+    return (
+        f"Escenario '{summary['escenario']}' con {summary['sesiones']} sesiones, "
+        f"{summary['reejecuciones']} reejecuciones medidas\n"
+        f"  latencia p50/p95/p99: {summary['p50_ms']:.0f} / {summary['p95_ms']:.0f} / "
+        f"{summary['p99_ms']:.0f} ms (media {summary['media_ms']:.0f} ms)\n"
+        f"  rendimiento: {summary['reejecuciones_por_s']:.2f} reejecuciones/s\n"
+        f"  CPU por sesión: {summary['cpu_s_por_sesion']:.2f} s, "
+        f"RSS por sesión: {summary['rss_mb_por_sesion']:.1f} MB "
+        f"(proceso: {summary['rss_mb_total']:.0f} MB)\n"
+        f"  errores: {len(summary['errores'])}"
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Prueba de carga de la demo FM.")
+    parser.add_argument("--sessions", type=int, default=4, help="Sesiones concurrentes")
+    parser.add_argument("--reruns", type=int, default=5, help="Reejecuciones medidas por sesión")
+    parser.add_argument("--scenario", choices=list(SCENARIOS) + ["todos"], default="todos",
+                        help="Escenario de parámetros (Fs·dur)")
+    parser.add_argument("--seed", type=int, default=0, help="Semilla de los cambios aleatorios")
+    parser.add_argument("--json", metavar="RUTA", help="Guardar los resultados en JSON")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Medir en frío: sin caché en disco ni precalentamiento")
+    args = parser.parse_args(argv)
+
+    if args.no_cache:
+        # El pool y la caché se crean en la primera ejecución de la app
+        os.environ["DEMO_FM_CACHE"] = "0"
+        os.environ["DEMO_FM_WARMUP"] = "0"
+
+    names = list(SCENARIOS) if args.scenario == "todos" else [args.scenario]
+    results = []
+    for name in names:
+        summary = run_load_test(args.sessions, args.reruns, name, args.seed)
+        print(format_summary(summary))
+        for error in summary["errores"][:5]:
+            print(f"    ! {error}")
+        results.append(summary)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    main()
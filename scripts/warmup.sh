@@ -0,0 +1,5 @@
+#!/bin/bash
+# Precalienta la caché de resultados de la demo FM (p. ej. tras un despliegue).
+# Argumentos opcionales: --defaults-only, --config lista.json, --snr 20
+
+cd "$(dirname "$0")/../src" && python3 -m core.warmup "$@"
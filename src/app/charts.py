@@ -0,0 +1,275 @@
+"""
+Gráficas interactivas en el navegador (Vega-Lite).
+
+Alternativa a las imágenes PNG de app.figures con la misma interfaz de
+plantilla: las trazas se reducen con min-max (core.traces) a un número
+acotado de puntos, viajan como un DataFrame float32 (Streamlit lo envía en
+formato Arrow, binario) y el navegador dibuja la gráfica. El zoom (rueda),
+el desplazamiento (arrastre) y los valores al pasar el cursor ocurren en el
+cliente, sin reejecutar el script.
+"""
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from core.traces import MAX_TRACE_POINTS, decimate_trace
+
+# Alto de la gráfica en píxeles por pulgada del figsize de matplotlib
+PIXELS_PER_INCH = 75
+
+# Estilos de matplotlib -> propiedades de marca de Vega-Lite
+_DASHES = {"--": [6, 4], ":": [2, 3], "-.": [6, 3, 2, 3]}
+_DEFAULT_COLOR = "#1f77b4"
+
+
+def _mark_style(style: dict) -> dict:
+    mark = {"color": style.get("color", _DEFAULT_COLOR)}
+    if "linewidth" in style:
+        mark["strokeWidth"] = style["linewidth"]
+    if "alpha" in style:
+        mark["opacity"] = style["alpha"]
+    if style.get("linestyle") in _DASHES:
+        mark["strokeDash"] = _DASHES[style["linestyle"]]
+    return mark
+
+
+class ChartTemplate:
+    """
+    Gráfica Vega-Lite con la interfaz de FigureTemplate.
+
+    No guarda estado entre reejecuciones: construir la especificación es
+    mucho más barato que rasterizar, y cada traza ya llega reducida.
+    """
+
+    def __init__(self, key: str, figsize: tuple, xlabel: str, ylabel: str,
+                 max_points: int = MAX_TRACE_POINTS):
+        """
+        Args:
+            key: Identificador de la gráfica (nombre del parámetro de zoom)
+            figsize: Tamaño de la figura equivalente en pulgadas (fija el alto)
+            xlabel: Etiqueta del eje x
+            ylabel: Etiqueta del eje y
+            max_points: Puntos máximos por traza
+        """
+        self.key = key
+        self.height = int(figsize[1] * PIXELS_PER_INCH)
+        self.xlabel = xlabel
+        self.ylabel = ylabel
+        self.max_points = max_points
+        self._lines = {}  # key -> (x, y, etiqueta, estilo)
+        self._fills = {}  # key -> (x, y1, y2, estilo)
+        self._rules = {}  # key -> (canal, valores, etiqueta, estilo)
+        self._title = None
+        self._domains = {}
+
+    def line(self, key: str, x, y, label: str = None, **style):
+        """Agrega una traza, reducida a max_points puntos."""
+        x, y = decimate_trace(np.asarray(x), np.asarray(y), self.max_points)
+        self._lines[key] = (x, y, label, style)
+
+    def hline(self, key: str, y: float, label: str = None, **style):
+        """Línea horizontal en y."""
+        self._rules[key] = ("y", [y], label, style)
+
+    def vline(self, key: str, x: float, label: str = None, **style):
+        """Línea vertical en x."""
+        self._rules[key] = ("x", [x], label, style)
+
+    def vlines(self, key: str, xs, **style):
+        """Grupo de líneas verticales sin etiqueta."""
+        self._rules[key] = ("x", list(xs), None, style)
+
+    def fill(self, key: str, x, y1, y2, **style):
+        """Relleno entre y1 (escalar o arreglo) e y2, reducido como y2."""
+        x, y2 = np.asarray(x), np.asarray(y2)
+        index = np.arange(len(y2))
+        index, _ = decimate_trace(index, y2, self.max_points)
+        y1 = np.broadcast_to(y1, y2.shape)[index]
+        self._fills[key] = (x[index], y1, y2[index], style)
+
+    def title(self, text: str, color: str = None, **style):
+        """Título de la gráfica (solo se usa el color del estilo)."""
+        self._title = {"text": text, "color": color} if color else {"text": text}
+
+    def xlim(self, low: float, high: float):
+        """Rango inicial del eje x (el zoom lo cambia en el navegador)."""
+        self._domains["x"] = [float(low), float(high)]
+
+    def ylim(self, low: float, high: float):
+        """Rango inicial del eje y."""
+        self._domains["y"] = [float(low), float(high)]
+
+    def legend(self, **style):
+        """La leyenda siempre se muestra; el estilo de matplotlib no aplica."""
+
+    def autoscale(self):
+        """Los ejes sin rango fijo se ajustan a los datos en el navegador."""
+
+    def data(self) -> pd.DataFrame:
+        """
+        Datos de todas las trazas en formato largo (float32).
+
+        Returns:
+            DataFrame con x, y, y2 (solo rellenos) y capa (categórica)
+        """
+        parts = [(key, x, y, None) for key, (x, y, _, _) in self._lines.items()]
+        parts += [(key, x, y1, y2) for key, (x, y1, y2, _) in self._fills.items()]
+        layers = [key for key, *_ in parts]
+        lengths = [len(x) for _, x, _, _ in parts]
+        return pd.DataFrame({
+            "x": np.concatenate([x for _, x, _, _ in parts]).astype(np.float32),
+            "y": np.concatenate([y for _, _, y, _ in parts]).astype(np.float32),
+            "y2": np.concatenate([
+                y2 if y2 is not None else np.full(len(x), np.nan) for _, x, _, y2 in parts
+            ]).astype(np.float32),
+            "capa": pd.Categorical.from_codes(np.repeat(np.arange(len(parts)), lengths), layers),
+        })
+
+    def spec(self) -> dict:
+        """
+        Especificación Vega-Lite por capas.
+
+        Returns:
+            dict con una capa por traza, relleno o grupo de líneas, más una
+            capa invisible de puntos para los valores al pasar el cursor
+        """
+        # Escala de color compartida: una entrada de la leyenda por etiqueta
+        labeled = [(label, style) for _, _, label, style in self._lines.values() if label]
+        labeled += [(label, style) for _, _, label, style in self._rules.values() if label]
+        color_scale = {
+            "domain": [label for label, _ in labeled],
+            "range": [style.get("color", _DEFAULT_COLOR) for _, style in labeled],
+        }
+
+        x = {"field": "x", "type": "quantitative", "title": self.xlabel,
+             "scale": {"domain": self._domains["x"]} if "x" in self._domains else {}}
+        y = {"field": "y", "type": "quantitative", "title": self.ylabel,
+             "scale": {"domain": self._domains["y"], "zero": False} if "y" in self._domains else {"zero": False}}
+
+        def only(layer):
+            return [{"filter": {"field": "capa", "equal": layer}}]
+
+        def color(label):
+            return {"color": {"datum": label, "scale": color_scale, "title": None}} if label else {}
+
+        layers = []
+        for key, (_, _, _, style) in self._fills.items():
+            layers.append({
+                "transform": only(key),
+                "mark": dict(_mark_style(style), type="area", opacity=style.get("alpha", 0.2)),
+                "encoding": {"x": x, "y": y, "y2": {"field": "y2"}},
+            })
+        for key, (_, _, label, style) in self._lines.items():
+            layers.append({
+                "transform": only(key),
+                "mark": dict(_mark_style(style), type="line", clip=True),
+                "encoding": dict({"x": x, "y": y}, **color(label)),
+            })
+        for channel, values, label, style in self._rules.values():
+            layers.append({
+                "data": {"values": [{"v": float(v)} for v in values]},
+                "mark": dict(_mark_style(style), type="rule", clip=True),
+                "encoding": dict({channel: dict(x if channel == "x" else y, field="v")}, **color(label)),
+            })
+
+        # Puntos invisibles: el cursor sobre la traza muestra serie, x e y
+        layers.append({
+            "transform": [{"filter": {"field": "capa", "oneOf": list(self._lines)}},
+                          {"lookup": "capa", "from": {
+                              "data": {"values": [{"capa": key, "serie": label or key}
+                                                  for key, (_, _, label, _) in self._lines.items()]},
+                              "key": "capa", "fields": ["serie"]}}],
+            "mark": {"type": "point", "opacity": 0, "size": 60},
+            "encoding": {"x": x, "y": y, "tooltip": [
+                {"field": "serie", "type": "nominal", "title": "Traza"},
+                {"field": "x", "type": "quantitative", "title": self.xlabel, "format": ".5~g"},
+                {"field": "y", "type": "quantitative", "title": self.ylabel, "format": ".4~g"},
+            ]},
+        })
+        # Zoom con la rueda y desplazamiento con arrastre, en el navegador
+        layers[0]["params"] = [{"name": f"zoom_{self.key}", "select": "interval", "bind": "scales"}]
+
+        spec = {"width": "container", "height": self.height, "layer": layers,
+                "config": {"legend": {"orient": "top-right"}}}
+        if self._title is not None:
+            spec["title"] = self._title
+        return spec
+
+    def show(self):
+        """Envía los datos y la especificación a Streamlit."""
+        st.vega_lite_chart(self.data(), self.spec())
+
+
+def sweep_chart(sweep: dict, fc: float, label: str, scale: float, unit: str, frame: int = None):
+    """
+    Espectros de un barrido con un deslizador del navegador para elegir el cuadro.
+
+    Todos los cuadros viajan juntos (cuadro, f, dB en int16/float32) y el
+    filtro por cuadro lo evalúa Vega-Lite: mover el deslizador no reejecuta
+    el script. Con frame se envía solo ese cuadro y sin deslizador (para la
+    reproducción).
+
+    Args:
+        sweep: Resultado de la etapa "sweep"
+        fc: Frecuencia portadora (Hz)
+        label: Nombre del parámetro barrido (p. ej. "β")
+        scale: Divisor de los valores para mostrarlos
+        unit: Unidad de los valores mostrados
+        frame: Cuadro único a enviar; None, todos
+
+    Returns:
+        tuple: (datos, especificación) para st.vega_lite_chart
+    """
+    mag_db = sweep["mag_db"]
+    frames, points = mag_db.shape
+    selected = range(frames) if frame is None else [frame]
+    offsets = (sweep["freqs"] - fc) / 1000  # kHz respecto de fc
+    data = pd.DataFrame({
+        "cuadro": np.repeat(np.asarray(selected, dtype=np.int16), points),
+        "f": np.tile(offsets.astype(np.float32), len(selected)),
+        "dB": mag_db[list(selected)].ravel(),
+    })
+    peak = float(mag_db.max())
+
+    # Rótulo y bordes de Carson de cada cuadro (unas decenas de filas)
+    info = [{
+        "cuadro": k,
+        "carson": float(sweep["B_carson"][k]) / 2000,
+        "etiqueta": (f"{label} = {sweep['values'][k] / scale:.3g}{unit} · β = {sweep['beta'][k]:.2f} · "
+                     f"Carson {sweep['B_carson'][k] / 1000:.1f} kHz · "
+                     f"ocupado (99 %) {sweep['B_occupied'][k] / 1000:.1f} kHz"),
+    } for k in selected]
+
+    current = {"filter": "datum.cuadro == cuadro"}
+    x = {"field": "f", "type": "quantitative", "title": "Frecuencia − fc [kHz]",
+         "scale": {"domain": [float(offsets[0]), float(offsets[-1])]}}
+    spec = {
+        "width": "container",
+        "height": 300,
+        "params": [{"name": "cuadro", "value": selected[0]}],
+        "layer": [
+            {
+                "transform": [current],
+                "mark": {"type": "line", "color": "#d62728", "strokeWidth": 1.2, "clip": True},
+                "encoding": {"x": x, "y": {"field": "dB", "type": "quantitative", "title": "Magnitud [dB]",
+                                           "scale": {"domain": [peak - 80, peak + 5]}}},
+            },
+            {
+                "data": {"values": info},
+                "transform": [current, {"calculate": "-datum.carson", "as": "carson_inf"},
+                              {"fold": ["carson", "carson_inf"], "as": ["borde", "f"]}],
+                "mark": {"type": "rule", "color": "green", "strokeDash": [2, 3], "clip": True},
+                "encoding": {"x": x},
+            },
+            {
+                "data": {"values": info},
+                "transform": [current],
+                "mark": {"type": "text", "align": "left", "baseline": "top", "fontWeight": "bold"},
+                "encoding": {"text": {"field": "etiqueta"}, "x": {"value": 5}, "y": {"value": 5}},
+            },
+        ],
+    }
+    if frame is None:
+        spec["params"][0]["bind"] = {"input": "range", "min": 0, "max": frames - 1, "step": 1,
+                                     "name": "Cuadro "}
+    return data, spec
@@ -1,19 +1,31 @@
 """
 Componentes reutilizables de la UI.
 """
+import json
+
 import streamlit as st
 import numpy as np
+from core.adc import ADCConfig
+from core.bandwidth import OCCUPIED_POWER_FRACTION, occupied_bandwidth_table
 from core.fm_calculator import FMParameters
+from core.waveforms import BUILTIN_WAVEFORMS, estimate_harmonics
+from core.fft_plan import FFTPlan
+from core.memory_profile import MemoryProfiler
+
+
+# Columnas de β de la comparación ocupado vs Carson
+BANDWIDTH_TABLE_BETAS = [0.5, 1, 2, 5, 10, 20]
 
 
-def render_metrics(params: FMParameters):
+def render_metrics(params: FMParameters, occupied_bw: float = None):
     """
     Renderiza las métricas principales en columnas.
     
     Args:
         params: Objeto FMParameters con los valores calculados
+        occupied_bw: Ancho de banda ocupado medido sobre s(t) (Hz), opcional
     """
-    col_m1, col_m2, col_m3, col_m4, col_m5 = st.columns(5)
+    col_m1, col_m2, col_m6, col_m3, col_m4, col_m5 = st.columns(6)
 
     with col_m1:
         st.metric(
@@ -29,6 +41,17 @@ def render_metrics(params: FMParameters):
             help="Para mensajes no senoidales usamos f_{m,max} = H·fm. H representa la cantidad aproximada de armónicos significativos de la señal moduladora.",
         )
 
+    with col_m6:
+        if occupied_bw is not None:
+            st.metric(
+                label=f"📐 Ancho de banda ocupado ({OCCUPIED_POWER_FRACTION:.0%})",
+                value=f"{occupied_bw / 1000:.2f} kHz",
+                delta=f"{(occupied_bw - params.B_carson) / 1000:+.2f} kHz vs Carson",
+                delta_color="off",
+                help="Medido sobre el espectro de s(t): banda que contiene esa fracción "
+                     "de la potencia (resolución Fs/N = 1/duración)",
+            )
+
     with col_m3:
         st.metric(
             label="📡 Frecuencia portadora",
@@ -52,6 +75,32 @@ def render_metrics(params: FMParameters):
         )
 
 
+def render_bandwidth_comparison(fm: float, beta: float):
+    """
+    Renderiza la comparación del ancho de banda ocupado con Carson.
+
+    Cubre todas las formas de onda y varios β (más el actual) en un solo
+    cálculo por lotes; Carson usa el H estimado de cada forma de onda.
+
+    Args:
+        fm: Frecuencia del mensaje (Hz)
+        beta: Índice de modulación actual
+    """
+    with st.expander(f"📐 Ancho de banda ocupado ({OCCUPIED_POWER_FRACTION:.0%}) vs Carson"):
+        betas = sorted(set(BANDWIDTH_TABLE_BETAS) | ({round(beta, 2)} if np.isfinite(beta) else set()))
+        waveforms = list(BUILTIN_WAVEFORMS)
+        occupied = occupied_bandwidth_table(waveforms, betas) * fm / 1000  # kHz
+
+        rows = {"Forma de onda": waveforms, "H estimado": [estimate_harmonics(w) for w in waveforms]}
+        for j, b in enumerate(betas):
+            rows[f"β={b:g}"] = [
+                f"{occupied[i, j]:,.1f} / {2 * (b + H) * fm / 1000:,.1f}"
+                for i, H in enumerate(rows["H estimado"])
+            ]
+        st.caption(f"Ocupado / Carson en kHz con fm = {fm / 1000:.2f} kHz")
+        st.table(rows)
+
+
 def render_snr_quality_indicator(snr_db: int):
     """
     Renderiza un indicador visual de calidad basado en SNR.
@@ -69,6 +118,121 @@ def render_snr_quality_indicator(snr_db: int):
         st.error("❌ Mala")
 
 
+def render_adc_metrics(demod: dict, adc: ADCConfig):
+    """
+    Métricas del conversor A/D: memoria de los códigos, SQNR y recorte de FM y AM.
+
+    Args:
+        demod: Resultado de la etapa "demodulation" con A/D
+        adc: Parámetros del conversor
+    """
+    codes = demod["s_fm_adc"]
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric(
+            label="Memoria por señal recibida",
+            value=f"{codes.nbytes / 1024:.0f} KiB",
+            delta=f"{np.dtype(np.float64).itemsize // codes.itemsize}× menos que float64 ({codes.dtype})",
+            delta_color="off",
+        )
+    with col2:
+        st.metric(
+            label="SQNR FM",
+            value=f"{demod['sqnr_fm_db']:.1f} dB",
+            delta=f"ideal {adc.ideal_sqnr_db:.1f} dB",
+            delta_color="off",
+            help="Potencia de la señal recibida sobre la del error de cuantización (incluye el recorte)",
+        )
+    with col3:
+        st.metric(
+            label="SQNR AM",
+            value=f"{demod['sqnr_am_db']:.1f} dB",
+            delta=f"ideal {adc.ideal_sqnr_db:.1f} dB",
+            delta_color="off",
+        )
+    with col4:
+        st.metric(
+            label="Muestras fuera de escala",
+            value=f"FM {demod['clipped_fm']:.1%} · AM {demod['clipped_am']:.1%}",
+            help="Fracción de muestras que superan el fondo de escala del conversor",
+        )
+
+
+def render_instrumentation(fft_plan: FFTPlan, startup_timings: dict = None,
+                           warmup_status: dict = None):
+    """
+    Renderiza el panel de instrumentación con la planificación de la FFT.
+
+    Args:
+        fft_plan: Plan de longitud elegido para N = Fs·dur
+        startup_timings: Tiempos de arranque del proceso (nombre -> segundos)
+        warmup_status: Estado del precalentamiento de cachés del servidor
+    """
+    with st.expander("🔧 Instrumentación"):
+        st.markdown("**Planificación de la FFT**")
+        st.table({
+            "N solicitado": [f"{fft_plan.n_requested:,}"],
+            "N elegido": [f"{fft_plan.n:,}"],
+            "Ajuste": [fft_plan.mode],
+            "Costo estimado": [f"{fft_plan.cost:,.0f}"],
+            "Aceleración": [f"×{fft_plan.speedup:.2f}"],
+            "Backend": [fft_plan.backend],
+        })
+
+        if startup_timings:
+            st.markdown("**Arranque en frío del proceso**")
+            st.table({
+                "Etapa": list(startup_timings),
+                "Tiempo [ms]": [f"{seconds * 1000:.1f}" for seconds in startup_timings.values()],
+            })
+
+        if warmup_status:
+            st.markdown(f"**Precalentamiento de cachés:** {warmup_status['estado']}")
+            if warmup_status["render_s"] is not None:
+                st.caption(f"Renderizador de figuras listo en {warmup_status['render_s'] * 1000:.1f} ms")
+            reports = warmup_status["configuraciones"]
+            if reports:
+                st.table({
+                    "Configuración": [r.label for r in reports],
+                    "Tiempo [ms]": [f"{r.seconds * 1000:.1f}" for r in reports],
+                    "Estado": ["ya en caché" if r.cached else "calculado" for r in reports],
+                })
+
+
+def render_memory_report(profiler: MemoryProfiler):
+    """
+    Renderiza el reporte de memoria por etapa (modo de memoria).
+
+    Args:
+        profiler: Reporte de la ejecución en curso
+    """
+    with st.expander("🧠 Memoria por etapa", expanded=True):
+        st.caption("tracemalloc mide todo el proceso: con varias sesiones simultáneas "
+                   "los valores se mezclan.")
+        st.table({
+            "Etapa": ["\u2003" * stage.depth + stage.name for stage in profiler.stages],
+            "Pico [MB]": [f"{stage.peak_bytes / 2**20:.2f}" for stage in profiler.stages],
+            "Retenido [MB]": [f"{stage.retained_bytes / 2**20:.2f}" for stage in profiler.stages],
+            "Tiempo [ms]": [f"{stage.seconds * 1000:.1f}" for stage in profiler.stages],
+        })
+
+        largest = profiler.largest_arrays()
+        if largest:
+            st.markdown("**Temporales más grandes**")
+            st.table({
+                "Variable": [f"{record.function}.{record.name}" for record in largest],
+                "Tamaño [MB]": [f"{record.nbytes / 2**20:.2f}" for record in largest],
+                "Tipo": [f"{record.dtype} {record.shape}" for record in largest],
+            })
+
+        st.download_button(
+            "⬇️ Descargar reporte (JSON)",
+            data=json.dumps(profiler.to_dict(), indent=2, ensure_ascii=False),
+            file_name="memoria_por_etapa.json",
+            mime="application/json",
+        )
+
+
 def render_about_section():
     """Renderiza la sección 'Acerca de' en un expander."""
     with st.expander("ℹ️ Acerca de esta demo"):
@@ -0,0 +1,255 @@
+"""
+Plantillas de figuras reutilizables entre reejecuciones de Streamlit.
+
+Cada figura se construye una sola vez por sesión (ejes, etiquetas, rejilla);
+en las reejecuciones siguientes solo se actualizan los datos de las líneas,
+los límites y los títulos, y se rasteriza directamente con el lienzo Agg.
+
+La rasterización de las figuras independientes se hace en paralelo en un
+pool de hilos compartido: cada figura tiene su propio lienzo Agg y no se
+usa pyplot (estado global), así que los hilos no comparten artistas.
+
+Con el backend interactivo (elegido en el sidebar) get_template devuelve en
+su lugar una gráfica Vega-Lite de app.charts con la misma interfaz.
+"""
+import io
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import streamlit as st
+
+from .plotting import get_matplotlib
+
+RENDER_DPI = 200  # Mismo valor que usa st.pyplot por defecto
+
+_SESSION_KEY = "_figure_templates"
+_PENDING_KEY = "_figure_pending"
+
+# Backend de las gráficas: clave del widget del sidebar y opciones
+CHART_BACKEND_KEY = "chart_backend"
+PNG_BACKEND = "Imágenes (servidor)"
+INTERACTIVE_BACKEND = "Interactivas (navegador)"
+CHART_BACKENDS = (PNG_BACKEND, INTERACTIVE_BACKEND)
+
+# Pool de rasterización compartido por todas las sesiones del servidor
+RENDER_THREADS = int(os.environ.get("DEMO_FM_RENDER_THREADS", os.cpu_count() or 1))
+_render_pool = ThreadPoolExecutor(max_workers=max(1, RENDER_THREADS),
+                                  thread_name_prefix="fig-render")
+
+
+class FigureTemplate:
+    """Figura Agg persistente cuyos artistas se actualizan en sitio."""
+
+    def __init__(self, figsize: tuple, xlabel: str, ylabel: str, label_fontsize: int = 11):
+        """
+        Args:
+            figsize: Tamaño de la figura en pulgadas
+            xlabel: Etiqueta del eje x
+            ylabel: Etiqueta del eje y
+            label_fontsize: Tamaño de fuente de las etiquetas de los ejes
+        """
+        get_matplotlib()
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+        self.fig = Figure(figsize=figsize, dpi=RENDER_DPI, layout="tight")
+        FigureCanvasAgg(self.fig)
+        self.ax = self.fig.add_subplot()
+        self.ax.set_xlabel(xlabel, fontsize=label_fontsize, fontweight="bold")
+        self.ax.set_ylabel(ylabel, fontsize=label_fontsize, fontweight="bold")
+        self.ax.grid(True, alpha=0.3, linestyle="--")
+
+        self._lines = {}
+        self._groups = {}
+        self.pending = None  # Rasterización en curso (Future)
+
+    def line(self, key: str, x, y, label: str = None, **style):
+        """
+        Crea la línea la primera vez; después solo actualiza sus datos.
+
+        Args:
+            key: Identificador de la línea dentro de la figura
+            x, y: Datos de la línea
+            label: Etiqueta para la leyenda (puede cambiar entre reejecuciones)
+            **style: Estilo aplicado solo al crearla
+        """
+        line = self._lines.get(key)
+        if line is None:
+            line, = self.ax.plot(x, y, label=label, **style)
+            self._lines[key] = line
+        else:
+            line.set_data(x, y)
+            line.set_label(label)
+        return line
+
+    def hline(self, key: str, y: float, label: str = None, **style):
+        """Línea horizontal persistente en y."""
+        line = self._lines.get(key)
+        if line is None:
+            line = self.ax.axhline(y, label=label, **style)
+            self._lines[key] = line
+        else:
+            line.set_ydata([y, y])
+            line.set_label(label)
+        return line
+
+    def vline(self, key: str, x: float, label: str = None, **style):
+        """Línea vertical persistente en x."""
+        line = self._lines.get(key)
+        if line is None:
+            line = self.ax.axvline(x, label=label, **style)
+            self._lines[key] = line
+        else:
+            line.set_xdata([x, x])
+            line.set_label(label)
+        return line
+
+    def vlines(self, key: str, xs, **style):
+        """Grupo de líneas verticales sin etiqueta (cantidad variable)."""
+        self.replace_group(key, [self.ax.axvline(x, **style) for x in xs])
+
+    def fill(self, key: str, x, y1, y2, **style):
+        """Relleno entre y1 e y2 (se reemplaza en cada reejecución)."""
+        self.replace_group(key, [self.ax.fill_between(x, y1, y2, **style)])
+
+    def title(self, text: str, **style):
+        """Título de los ejes."""
+        self.ax.set_title(text, **style)
+
+    def xlim(self, low: float, high: float):
+        """Límites del eje x."""
+        self.ax.set_xlim([low, high])
+
+    def ylim(self, low: float, high: float):
+        """Límites del eje y."""
+        self.ax.set_ylim([low, high])
+
+    def legend(self, **style):
+        """Leyenda con las etiquetas actuales."""
+        self.ax.legend(**style)
+
+    def replace_group(self, key: str, artists: list):
+        """
+        Sustituye un grupo de artistas de cantidad variable (rellenos, marcas).
+
+        Args:
+            key: Identificador del grupo
+            artists: Artistas nuevos, ya añadidos a self.ax
+        """
+        for artist in self._groups.pop(key, []):
+            artist.remove()
+        self._groups[key] = list(artists)
+
+    def autoscale(self):
+        """Recalcula los límites automáticos a partir de los datos actuales."""
+        self.ax.relim()
+        self.ax.autoscale_view()
+
+    def wait(self):
+        """Espera a que termine una rasterización pendiente antes de modificar la figura."""
+        if self.pending is not None:
+            try:
+                self.pending.result()
+            except Exception:
+                pass  # El error ya se reportó en la reejecución que la lanzó
+            self.pending = None
+
+    def render_png(self) -> bytes:
+        """
+        Rasteriza la figura con el lienzo Agg.
+
+        Returns:
+            Imagen PNG codificada
+        """
+        buffer = io.BytesIO()
+        self.fig.canvas.print_png(buffer)
+        return buffer.getvalue()
+
+
+def get_template(key: str, figsize: tuple, xlabel: str, ylabel: str,
+                 label_fontsize: int = 11) -> FigureTemplate:
+    """
+    Devuelve la plantilla de la sesión actual, construyéndola si no existe.
+
+    Con el backend interactivo devuelve una ChartTemplate nueva (misma
+    interfaz, sin estado entre reejecuciones).
+
+    Args:
+        key: Identificador de la figura dentro de la sesión
+        figsize: Tamaño de la figura en pulgadas
+        xlabel: Etiqueta del eje x
+        ylabel: Etiqueta del eje y
+        label_fontsize: Tamaño de fuente de las etiquetas de los ejes
+
+    Returns:
+        FigureTemplate persistente de la sesión, o ChartTemplate
+    """
+    if st.session_state.get(CHART_BACKEND_KEY) == INTERACTIVE_BACKEND:
+        from .charts import ChartTemplate
+        return ChartTemplate(key, figsize, xlabel, ylabel)
+
+    templates = st.session_state.setdefault(_SESSION_KEY, {})
+    template = templates.get(key)
+    if template is None:
+        template = FigureTemplate(figsize, xlabel, ylabel, label_fontsize)
+        templates[key] = template
+    else:
+        # Una reejecución interrumpida pudo dejar la figura rasterizándose
+        template.wait()
+    return template
+
+
+def show_figure(template: FigureTemplate):
+    """
+    Reserva el lugar de la figura y lanza su rasterización en segundo plano.
+
+    La imagen se coloca en su lugar al llamar a flush_figures(), por lo que
+    la plantilla no debe modificarse después de esta llamada en la misma
+    reejecución.
+
+    Las gráficas interactivas no se rasterizan: se envían en el acto.
+
+    Args:
+        template: Plantilla ya actualizada
+    """
+    if not isinstance(template, FigureTemplate):
+        template.show()
+        return
+    placeholder = st.empty()
+    template.pending = _render_pool.submit(template.render_png)
+    st.session_state.setdefault(_PENDING_KEY, []).append((placeholder, template.pending))
+
+
+def reset_figures():
+    """Descarta marcadores pendientes de una reejecución interrumpida."""
+    st.session_state[_PENDING_KEY] = []
+
+
+def flush_figures():
+    """Espera las rasterizaciones pendientes y las envía a Streamlit en orden."""
+    pending = st.session_state.get(_PENDING_KEY) or []
+    st.session_state[_PENDING_KEY] = []
+    for placeholder, future in pending:
+        placeholder.image(future.result(), output_format="PNG")
+
+
+def warm_up_rendering() -> float:
+    """
+    Construye y rasteriza una figura descartable para cargar matplotlib,
+    el estilo, las fuentes y el renderizador Agg antes de la primera sesión.
+
+    Returns:
+        Tiempo empleado (s)
+    """
+    import time
+
+    import numpy as np
+
+    start = time.perf_counter()
+    template = FigureTemplate((12, 3), "Tiempo [ms]", "Amplitud")
+    x = np.linspace(0, 1, 100)
+    template.line("y", x, np.sin(2 * np.pi * x), label="y")
+    template.ax.set_title("warm-up", fontsize=12, fontweight="bold")
+    template.ax.legend(loc="upper right")
+    template.render_png()
+    return time.perf_counter() - start
@@ -0,0 +1,67 @@
+"""
+Modo de memoria de la app (DEMO_FM_MEMORY=1).
+
+Cada ejecución del script crea un MemoryProfiler en la sesión; main.py y
+las pestañas marcan sus etapas con memory_stage(). Fuera del modo de
+memoria, memory_stage() no hace nada.
+"""
+import os
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Optional
+
+import streamlit as st
+
+from core.memory_profile import CORE_DIR, MemoryProfiler, memory_mode_enabled
+
+MEMORY_MODE = memory_mode_enabled()
+
+# Funciones de core y de app cuyas variables locales se inspeccionan
+_WATCHED_DIRS = (CORE_DIR, str(Path(__file__).resolve().parent))
+_SESSION_KEY = "_memory_profiler"
+
+
+def begin_memory_profile():
+    """Inicia el reporte de memoria de esta ejecución."""
+    if MEMORY_MODE:
+        st.session_state[_SESSION_KEY] = MemoryProfiler(_WATCHED_DIRS)
+
+
+def current_memory_profile() -> Optional[MemoryProfiler]:
+    """Reporte de la ejecución en curso, o None fuera del modo de memoria."""
+    if not MEMORY_MODE:
+        return None
+    return st.session_state.get(_SESSION_KEY)
+
+
+@contextmanager
+def memory_stage(name: str):
+    """
+    Mide el bloque como una etapa del reporte de memoria.
+
+    Args:
+        name: Nombre de la etapa
+    """
+    profiler = current_memory_profile()
+    if profiler is None:
+        yield
+        return
+    with profiler.stage(name):
+        yield
+
+
+def finish_memory_profile() -> Optional[MemoryProfiler]:
+    """
+    Cierra el reporte de la ejecución y lo guarda en DEMO_FM_MEMORY_REPORT si está definida.
+
+    Returns:
+        El reporte, o None fuera del modo de memoria
+    """
+    profiler = current_memory_profile()
+    path = os.environ.get("DEMO_FM_MEMORY_REPORT")
+    if profiler is not None and path:
+        try:
+            profiler.write_json(path)
+        except OSError:
+            pass  # El reporte en disco es opcional; la vista de depuración sigue disponible
+    return profiler
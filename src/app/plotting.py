@@ -0,0 +1,35 @@
+"""
+Carga diferida de matplotlib y configuración única del estilo de gráficas.
+"""
+import threading
+
+from .startup import startup_timer
+
+PLOT_STYLE = "seaborn-v0_8-darkgrid"
+
+_matplotlib = None
+_lock = threading.Lock()
+
+
+def get_matplotlib():
+    """
+    Importa matplotlib en el primer uso, fija Agg y aplica el estilo una vez.
+
+    Importar matplotlib y procesar la hoja de estilo domina el arranque en
+    frío; las páginas que no dibujan nada no pagan ese costo. No se importa
+    pyplot: las figuras se crean directamente sobre un lienzo Agg.
+
+    Returns:
+        Módulo matplotlib configurado
+    """
+    global _matplotlib
+    if _matplotlib is None:
+        with _lock:
+            if _matplotlib is None:
+                with startup_timer("matplotlib + estilo"):
+                    import matplotlib
+                    matplotlib.use("Agg")  # Servidor sin pantalla
+                    import matplotlib.style
+                    matplotlib.style.use(PLOT_STYLE)
+                _matplotlib = matplotlib
+    return _matplotlib
@@ -3,6 +3,21 @@ Panel lateral de controles para la app.
 """
 import streamlit as st
 
+from core.fm_calculator import carson_table
+from core.expressions import ALLOWED_CONSTANTS, ALLOWED_FUNCTIONS
+from core.traces import MAX_TRACE_POINTS
+from core.waveforms import (
+    HARMONIC_POWER_FRACTION, WAVEFORM_GENERATORS, estimate_harmonics, is_expression, register_expression,
+)
+from .figures import CHART_BACKEND_KEY, CHART_BACKENDS
+
+# Opciones de H (armónicos) y columnas de β de la tabla de Carson
+HARMONIC_OPTIONS = [1, 3, 5, 7, 9, 11, 13, 15]
+CARSON_TABLE_BETAS = [0.5, 1, 2, 5, 10, 20]
+# Opción del mensaje definido por expresión y su valor inicial
+EXPRESSION_OPTION = "✏️ Expresión"
+DEFAULT_EXPRESSION = "sin(2*pi*fm*t) + sin(6*pi*fm*t)/3"
+
 
 def render_sidebar():
     """
@@ -17,15 +32,24 @@ def render_sidebar():
         st.subheader("📊 Forma de Onda")
         waveform = st.radio(
             "Seleccione el tipo de mensaje:",
-            options=["Senoidal", "Cuadrada", "Diente de Sierra", "Triangular"],
+            options=[name for name in WAVEFORM_GENERATORS if not is_expression(name)] + [EXPRESSION_OPTION],
             index=0,
             help="Forma de onda de la señal moduladora m(t)",
         )
+        if waveform == EXPRESSION_OPTION:
+            waveform = render_expression_input()
 
         st.divider()
 
         st.subheader("🎛️ Parámetros del Sistema")
 
+        auto_fs = st.checkbox(
+            "Fs automática (mínima válida)",
+            value=True,
+            help="Elige la menor Fs que cumple Nyquist con margen, las muestras por período "
+                 "del mensaje y la visualización, con un N eficiente para la FFT",
+        )
+
         Fs = (
             st.slider(
                 "Frecuencia de muestreo (MHz)",
@@ -33,6 +57,7 @@ def render_sidebar():
                 max_value=20.0,
                 value=10.0,
                 step=0.5,
+                disabled=auto_fs,
                 help="Frecuencia de muestreo de las señales (regla práctica: Fs ≳ 10·fc)",
             )
             * 1_000_000
@@ -116,12 +141,26 @@ def render_sidebar():
                 * 1000
             )  # Convertir a Hz/V
 
+        auto_h = st.checkbox(
+            f"H automático ({HARMONIC_POWER_FRACTION:.0%} de la potencia)",
+            value=True,
+            help="Estima H como el menor número de armónicos que concentra esa fracción "
+                 "de la potencia de m(t), a partir de un solo período del mensaje",
+        )
         H = st.select_slider(
             "Armónicos considerados H (para Carson)",
-            options=[1, 3, 5, 7, 9, 11, 13, 15],
+            options=HARMONIC_OPTIONS,
             value=1,
+            disabled=auto_h,
             help="Para mensajes no senoidales usamos f_{m,max} = H·fm. H representa la cantidad aproximada de armónicos significativos de la señal moduladora.",
         )
+        if auto_h:
+            H = estimate_harmonics(waveform)
+            label = "definida por expresión" if is_expression(waveform) else waveform.lower()
+            st.caption(f"H estimado para la onda {label}: **{H}**")
+
+        with st.expander("📏 Tabla de Carson (kHz)"):
+            render_carson_table(fm, kf * Am / fm if fm > 0 else 0.0, H)
 
         st.divider()
 
@@ -132,6 +171,16 @@ def render_sidebar():
             help="Mostrar la señal portadora sin modular",
         )
 
+        st.radio(
+            "Gráficas:",
+            options=CHART_BACKENDS,
+            index=0,
+            key=CHART_BACKEND_KEY,
+            help="Imágenes: PNG dibujadas en el servidor. Interactivas: el navegador dibuja "
+                 f"trazas reducidas (≤ {MAX_TRACE_POINTS:,} puntos cada una) y permite zoom con "
+                 "la rueda, arrastre y valores al pasar el cursor sin reejecutar",
+        )
+
         st.divider()
 
         # Información de fórmulas
@@ -140,17 +189,38 @@ def render_sidebar():
 
     return {
         "waveform": waveform,
+        "auto_fs": auto_fs,
         "Fs": Fs,
         "dur": dur,
         "fc": fc,
         "fm": fm,
         "Am": Am,
         "kf": kf,
+        "auto_h": auto_h,
         "H": H,
         "show_carrier": show_carrier,
     }
 
 
+def render_carson_table(fm: float, beta: float, H: int):
+    """
+    Renderiza B_carson para cada H y varios β con el fm actual.
+
+    Args:
+        fm: Frecuencia del mensaje (Hz)
+        beta: Índice de modulación actual (se agrega como columna)
+        H: Número de armónicos actual (fila resaltada en el texto)
+    """
+    betas = sorted(set(CARSON_TABLE_BETAS) | {round(beta, 2)})
+    table = carson_table(fm, betas, HARMONIC_OPTIONS) / 1000  # Hz → kHz
+    columns = {"H": HARMONIC_OPTIONS}
+    for j, b in enumerate(betas):
+        label = f"β={b:g}" + (" (actual)" if b == round(beta, 2) else "")
+        columns[label] = [f"{value:,.1f}" for value in table[:, j]]
+    st.caption(f"B = 2·(β + H)·fm con fm = {fm / 1000:.1f} kHz; configuración actual: H = {H}")
+    st.table(columns)
+
+
 def render_formulas():
     """Renderiza las fórmulas matemáticas en el sidebar."""
     st.markdown("### Fórmulas utilizadas")
@@ -167,6 +237,9 @@ def render_formulas():
     st.latex(
         r"x_{\text{tri}}(t)=2\left|2\!\left(\frac{t}{T}-\left\lfloor\frac{t}{T}+\frac{1}{2}\right\rfloor\right)\right|-1"
     )
+    st.latex(
+        r"x_{\text{GFSK}}(t)=\sum_k a_k\,g(t-kT),~a_k=\pm 1,~T=\frac{1}{f_m},~BT=0{,}5"
+    )
     st.latex(r"m(t)=A_m\,x(t)")
 
     st.write("**Fase FM (Clark S. Hess)**")
@@ -186,3 +259,27 @@ def render_formulas():
 
     st.write("**Índice de modulación**")
     st.latex(r"\beta = \frac{\Delta f}{f_m}")
+
+
+def render_expression_input() -> str:
+    """
+    Renderiza el campo de la expresión m(t) y la registra como forma de onda.
+
+    Returns:
+        str: Nombre de la forma de onda registrada, o "Senoidal" si la
+            expresión no es válida
+    """
+    text = st.text_input(
+        "m(t) =",
+        value=DEFAULT_EXPRESSION,
+        help="Expresión en t (s) y fm (Hz); se normaliza a ±1",
+    )
+    st.caption(
+        f"Constantes: {', '.join(ALLOWED_CONSTANTS)}. "
+        f"Funciones: {', '.join(ALLOWED_FUNCTIONS)}."
+    )
+    try:
+        return register_expression(text)
+    except ValueError as exc:
+        st.error(f"❌ {exc}. Se usa la senoidal.")
+        return "Senoidal"
@@ -0,0 +1,29 @@
+"""
+Medición de tiempos de arranque (imports y configuración única).
+"""
+import time
+from contextlib import contextmanager
+
+# Tiempos del primer arranque del proceso: nombre -> segundos.
+# Las reejecuciones de Streamlit reutilizan los módulos ya importados,
+# así que cada entrada se registra una sola vez.
+STARTUP_TIMINGS = {}
+
+
+@contextmanager
+def startup_timer(name: str):
+    """
+    Registra la duración del bloque la primera vez que se ejecuta.
+
+    Args:
+        name: Nombre de la etapa de arranque
+    """
+    if name in STARTUP_TIMINGS:
+        yield
+        return
+
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        STARTUP_TIMINGS[name] = time.perf_counter() - start
@@ -1,14 +1,32 @@
 """
 Pestañas de visualización de la app.
 """
+import time
+
 import streamlit as st
-import matplotlib.pyplot as plt
 import numpy as np
+from core.adc import ADCConfig
 from core.fm_calculator import FMParameters
-from core.spectrum import compute_spectrum
-from core.demodulation import demodulate_fm, demodulate_am
-from core.fm_calculator import calculate_am_signal
-from .components import render_snr_quality_indicator
+from core.pipeline import PipelineConfig
+from core.waveforms import harmonic_power_fractions
+from core.workers import get_compute_pool
+from .charts import sweep_chart
+from .components import render_adc_metrics, render_snr_quality_indicator
+from .figures import flush_figures, get_template, show_figure
+from .memory import memory_stage
+
+# Fracción mínima de la potencia de m(t) para marcar un armónico en el espectro
+HARMONIC_MARKER_MIN_FRACTION = 1e-3
+# Muestras de la señal recibida que se grafican
+NOISY_SAMPLES_SHOWN = 1000
+# Parámetros del barrido: etiqueta -> (parámetro, divisor, unidad, límites, rango inicial, paso)
+SWEEP_OPTIONS = {
+    "β": ("beta", 1.0, "", (0.1, 20.0), (0.5, 10.0), 0.1),
+    "kf (kHz/V)": ("kf", 1000.0, " kHz/V", (0.1, 100.0), (1.0, 20.0), 0.1),
+    "Am (V)": ("Am", 1.0, " V", (0.05, 5.0), (0.2, 3.0), 0.05),
+}
+# Pausa entre cuadros de la reproducción (s)
+SWEEP_FRAME_SECONDS = 0.08
 
 
 def render_time_tab(t: np.ndarray, m: np.ndarray, s: np.ndarray, fi: np.ndarray,
@@ -25,53 +43,46 @@ def render_time_tab(t: np.ndarray, m: np.ndarray, s: np.ndarray, fi: np.ndarray,
         params: Parámetros FM
         show_carrier: Si se debe mostrar la portadora
     """
-    # Configuración de matplotlib para gráficas más limpias
-    plt.style.use("seaborn-v0_8-darkgrid")
     t_ms = t * 1000  # Tiempo en ms
 
     # --- Gráfica 1: Señal Moduladora m(t) ---
     st.subheader("1️⃣ Señal Moduladora m(t)")
-    fig1, ax1 = plt.subplots(figsize=(12, 3))
-    ax1.plot(t_ms, m, color="#1f77b4", linewidth=2, label="m(t)")
-    ax1.set_xlabel("Tiempo [ms]", fontsize=11, fontweight="bold")
-    ax1.set_ylabel("Amplitud [V]", fontsize=11, fontweight="bold")
-    ax1.set_title(
+    fig1 = get_template("tiempo_m", (12, 3), "Tiempo [ms]", "Amplitud [V]")
+    fig1.line("m", t_ms, m, label="m(t)", color="#1f77b4", linewidth=2)
+    fig1.title(
         f"Señal Moduladora", fontsize=12, fontweight="bold", pad=10
     )
-    ax1.grid(True, alpha=0.3, linestyle="--")
-    ax1.set_xlim([0, t[-1] * 1000])
-    ax1.legend(loc="upper right")
-    st.pyplot(fig1)
-    plt.close()
+    fig1.autoscale()
+    fig1.xlim(0, t[-1] * 1000)
+    fig1.legend(loc="upper right")
+    show_figure(fig1)
 
     # --- Gráfica 2: Frecuencia Instantánea fi(t) ---
     st.subheader("2️⃣ Frecuencia Instantánea fi(t) = fc + kf·m(t)")
-    fig2, ax2 = plt.subplots(figsize=(12, 3))
-    ax2.plot(
-        t_ms, fi / 1_000_000, color="#2ca02c", linewidth=2, label="fi(t) = fc + kf·m(t)"
+    fig2 = get_template("tiempo_fi", (12, 3), "Tiempo [ms]", "Frecuencia [MHz]")
+    fig2.line(
+        "fi", t_ms, fi / 1_000_000, label="fi(t) = fc + kf·m(t)", color="#2ca02c", linewidth=2
     )
-    ax2.axhline(
+    fig2.hline(
+        "fc",
         params.fc / 1_000_000,
+        label=f"fc = {params.fc_mhz:.2f} MHz",
         color="black",
         linestyle="--",
         linewidth=1.5,
         alpha=0.6,
-        label=f"fc = {params.fc_mhz:.2f} MHz",
     )
-    ax2.fill_between(t_ms, params.fc / 1_000_000, fi / 1_000_000, alpha=0.2, color="#2ca02c")
-    ax2.set_xlabel("Tiempo [ms]", fontsize=11, fontweight="bold")
-    ax2.set_ylabel("Frecuencia [MHz]", fontsize=11, fontweight="bold")
-    ax2.set_title(
+    fig2.fill("relleno", t_ms, params.fc / 1_000_000, fi / 1_000_000, alpha=0.2, color="#2ca02c")
+    fig2.title(
         "Frecuencia Instantánea fi(t) = fc + kf·m(t)",
         fontsize=12,
         fontweight="bold",
         pad=10,
     )
-    ax2.grid(True, alpha=0.3, linestyle="--")
-    ax2.set_xlim([0, t[-1] * 1000])
-    ax2.legend(loc="upper right")
-    st.pyplot(fig2)
-    plt.close()
+    fig2.autoscale()
+    fig2.xlim(0, t[-1] * 1000)
+    fig2.legend(loc="upper right")
+    show_figure(fig2)
 
     # --- Gráfica 3: Señal FM s(t) = cos(ϕ(t)) ---
     st.subheader("3️⃣ Señal FM s(t) = cos(ϕ(t))")
@@ -84,21 +95,18 @@ def render_time_tab(t: np.ndarray, m: np.ndarray, s: np.ndarray, fi: np.ndarray,
     # Encontrar índices
     idx_fm_max = np.searchsorted(t_ms, ventana_fm_ms)
 
-    fig3, ax3 = plt.subplots(figsize=(12, 3))
-    ax3.plot(
-        t_ms[:idx_fm_max], s[:idx_fm_max], color="#d62728",
-        linewidth=1.2, alpha=0.9, label="s(t) = cos(ϕ(t))"
+    fig3 = get_template("tiempo_s", (12, 3), "Tiempo [ms]", "Amplitud")
+    fig3.line(
+        "s", t_ms[:idx_fm_max], s[:idx_fm_max], label="s(t) = cos(ϕ(t))",
+        color="#d62728", linewidth=1.2, alpha=0.9
     )
-    ax3.set_xlabel("Tiempo [ms]", fontsize=11, fontweight="bold")
-    ax3.set_ylabel("Amplitud", fontsize=11, fontweight="bold")
-    ax3.set_title(
+    fig3.title(
         f"Señal FM (zoom): s(t) = cos(ϕ(t)), mostrando ~3 ciclos de m(t)",
         fontsize=12, fontweight="bold", pad=10
     )
-    ax3.grid(True, alpha=0.3, linestyle="--")
-    ax3.set_xlim([0, ventana_fm_ms])
-    ax3.set_ylim([-1.2, 1.2])
-    ax3.legend(loc="upper right")
+    fig3.xlim(0, ventana_fm_ms)
+    fig3.ylim(-1.2, 1.2)
+    fig3.legend(loc="upper right")
 
     # Nota informativa
     ciclos_portadora_mostrados = params.fc * ventana_fm_ms / 1000
@@ -106,8 +114,7 @@ def render_time_tab(t: np.ndarray, m: np.ndarray, s: np.ndarray, fi: np.ndarray,
               f"(~{ciclos_portadora_mostrados:.0f} ciclos de portadora modulados por 3 ciclos de m(t)). "
               f"La frecuencia varía entre {(params.fc-params.delta_f)/1e6:.3f} MHz y {(params.fc+params.delta_f)/1e6:.3f} MHz.")
 
-    st.pyplot(fig3)
-    plt.close()
+    show_figure(fig3)
 
     # --- Gráfica 4 (Opcional): Señal Portadora c(t) ---
     if show_carrier:
@@ -125,117 +132,138 @@ def render_time_tab(t: np.ndarray, m: np.ndarray, s: np.ndarray, fi: np.ndarray,
         # Encontrar índices para esta ventana
         idx_max = np.searchsorted(t_ms, ventana_tiempo_ms)
 
-        fig4, ax4 = plt.subplots(figsize=(12, 3))
-        ax4.plot(
+        fig4 = get_template("tiempo_c", (12, 3), "Tiempo [ms]", "Amplitud")
+        fig4.line(
+            "c",
             t_ms[:idx_max],
             c[:idx_max],
+            label=f"c(t) = cos(2π·fc·t), mostrando ~50 ciclos",
             color="#ff7f0e",
             linewidth=1.5,
             alpha=0.9,
-            label=f"c(t) = cos(2π·fc·t), mostrando ~50 ciclos",
         )
-        ax4.set_xlabel("Tiempo [ms]", fontsize=11, fontweight="bold")
-        ax4.set_ylabel("Amplitud", fontsize=11, fontweight="bold")
-        ax4.set_title(
+        fig4.title(
             f"Señal Portadora (zoom): fc = {params.fc_mhz:.2f} MHz, T = {periodo_portadora*1e6:.2f} µs",
             fontsize=12,
             fontweight="bold",
             pad=10,
         )
-        ax4.grid(True, alpha=0.3, linestyle="--")
-        ax4.set_xlim([0, ventana_tiempo_ms])
-        ax4.set_ylim([-1.2, 1.2])
-        ax4.legend(loc="upper right")
+        fig4.xlim(0, ventana_tiempo_ms)
+        fig4.ylim(-1.2, 1.2)
+        fig4.legend(loc="upper right")
 
         # Nota informativa
         st.caption(f"ℹ️ Mostrando los primeros {ventana_tiempo_ms:.4f} ms de la señal "
                   f"(~50 ciclos de {periodo_portadora*1e6:.2f} µs cada uno). "
                   f"Con fc = {params.fc/1e6:.1f} MHz, hay {params.fc*t[-1]:.0f} ciclos en total.")
 
-        st.pyplot(fig4)
-        plt.close()
+        show_figure(fig4)
 
 
-def render_spectrum_tab(m: np.ndarray, s: np.ndarray, params: FMParameters, Fs: float, waveform: str):
+def render_spectrum_tab(signals: dict, params: FMParameters, waveform: str):
     """
     Renderiza la pestaña de análisis espectral.
     
     Args:
-        m: Señal moduladora
-        s: Señal FM
+        signals: Resultado de la etapa "signals" del pipeline (incluye espectros)
         params: Parámetros FM
-        Fs: Frecuencia de muestreo
         waveform: Tipo de onda
     """
     st.markdown("### 📊 Análisis Espectral de Frecuencias")
 
-    # Calcular espectros con rangos apropiados para cada señal
-    # Para m(t): mostrar hasta ~20x fm para capturar armónicos
+    # Espectros calculados por el pipeline con rangos apropiados para cada señal
+    # Para m(t): hasta ~20x fm para capturar armónicos
     max_freq_m = params.fm * 20  # Rango apropiado para mensaje
-    # Para s(t): mostrar alrededor de fc ± ancho de banda
+    # Para s(t): alrededor de fc ± ancho de banda
     max_freq_s = params.fc + params.B_carson * 2  # Rango apropiado para FM
 
-    freqs_m, mag_m, mag_m_db = compute_spectrum(m, Fs, max_freq=max_freq_m)
-    freqs_s, mag_s, mag_s_db = compute_spectrum(s, Fs, max_freq=max_freq_s)
+    freqs_m, mag_m_db = signals["freqs_m"], signals["mag_m_db"]
+    freqs_s, mag_s_db = signals["freqs_s"], signals["mag_s_db"]
 
     col1, col2 = st.columns(2)
 
     with col1:
         # Espectro del mensaje m(t)
         st.subheader("Espectro de m(t)")
-        fig_spec_m, ax_spec_m = plt.subplots(figsize=(10, 4))
-        ax_spec_m.plot(freqs_m / 1000, mag_m_db, color="#1f77b4", linewidth=2)
+        fig_spec_m = get_template("espectro_m", (10, 4), "Frecuencia [kHz]", "Magnitud [dB]")
+        fig_spec_m.line("m", freqs_m / 1000, mag_m_db, color="#1f77b4", linewidth=2)
 
         # Marcar la frecuencia fundamental
-        ax_spec_m.axvline(params.fm / 1000, color="red", linestyle="--", linewidth=1.5,
-                         alpha=0.6, label=f"fm = {params.fm_khz:.2f} kHz")
-
-        # Marcar armónicos si no es senoidal
-        if waveform != "Senoidal":
-            for harmonic in range(3, min(params.H*2, 10), 2):  # Mostrar algunos armónicos impares
-                if harmonic * params.fm < max_freq_m:
-                    ax_spec_m.axvline(harmonic * params.fm / 1000, color="orange",
-                                    linestyle=":", linewidth=1, alpha=0.4)
-
-        ax_spec_m.set_xlabel("Frecuencia [kHz]", fontsize=11, fontweight="bold")
-        ax_spec_m.set_ylabel("Magnitud [dB]", fontsize=11, fontweight="bold")
-        ax_spec_m.set_title(f"Espectro de m(t) - {waveform}", fontsize=12, fontweight="bold")
-        ax_spec_m.grid(True, alpha=0.3, linestyle="--")
-        ax_spec_m.set_xlim([0, max_freq_m / 1000])
-        ax_spec_m.legend(loc="upper right")
-        st.pyplot(fig_spec_m)
-        plt.close()
+        fig_spec_m.vline("fm", params.fm / 1000, label=f"fm = {params.fm_khz:.2f} kHz",
+                         color="red", linestyle="--", linewidth=1.5, alpha=0.6)
+
+        # Marcar los armónicos con potencia apreciable hasta H
+        fractions = harmonic_power_fractions(waveform)
+        harmonics = [
+            harmonic * params.fm / 1000
+            for harmonic in range(2, min(params.H, len(fractions) - 1) + 1)
+            if fractions[harmonic] > HARMONIC_MARKER_MIN_FRACTION and harmonic * params.fm < max_freq_m
+        ]
+        fig_spec_m.vlines("armonicos", harmonics, color="orange", linestyle=":", linewidth=1, alpha=0.4)
+
+        fig_spec_m.title(f"Espectro de m(t) - {waveform}", fontsize=12, fontweight="bold")
+        fig_spec_m.autoscale()
+        fig_spec_m.xlim(0, max_freq_m / 1000)
+        fig_spec_m.legend(loc="upper right")
+        show_figure(fig_spec_m)
 
     with col2:
         # Espectro de la señal FM s(t)
         st.subheader("Espectro de s(t) FM")
-        fig_spec_s, ax_spec_s = plt.subplots(figsize=(10, 4))
-        ax_spec_s.plot(freqs_s / 1_000_000, mag_s_db, color="#d62728", linewidth=1.5)
+        fig_spec_s = get_template("espectro_s", (10, 4), "Frecuencia [MHz]", "Magnitud [dB]")
+        fig_spec_s.line("s", freqs_s / 1_000_000, mag_s_db, color="#d62728", linewidth=1.5)
 
         # Marcar fc y bandas laterales
-        ax_spec_s.axvline(params.fc / 1_000_000, color="black", linestyle="--", linewidth=1.5,
-                         alpha=0.6, label=f"fc = {params.fc_mhz:.2f} MHz")
-        ax_spec_s.axvline((params.fc - params.B_carson/2) / 1_000_000, color="green", linestyle=":",
-                         linewidth=1, alpha=0.5, label=f"±B/2 (Carson)")
-        ax_spec_s.axvline((params.fc + params.B_carson/2) / 1_000_000, color="green", linestyle=":",
-                         linewidth=1, alpha=0.5)
-
-        ax_spec_s.set_xlabel("Frecuencia [MHz]", fontsize=11, fontweight="bold")
-        ax_spec_s.set_ylabel("Magnitud [dB]", fontsize=11, fontweight="bold")
-        ax_spec_s.set_title("Espectro de la Señal FM", fontsize=12, fontweight="bold")
-        ax_spec_s.grid(True, alpha=0.3, linestyle="--")
-        ax_spec_s.set_xlim([0, max_freq_s / 1_000_000])
-        ax_spec_s.legend(loc="upper right", fontsize=9)
-        st.pyplot(fig_spec_s)
-        plt.close()
+        fig_spec_s.vline("fc", params.fc / 1_000_000, label=f"fc = {params.fc_mhz:.2f} MHz",
+                         color="black", linestyle="--", linewidth=1.5, alpha=0.6)
+        fig_spec_s.vline("carson_inf", (params.fc - params.B_carson/2) / 1_000_000,
+                         label=f"±B/2 (Carson)", color="green", linestyle=":", linewidth=1, alpha=0.5)
+        fig_spec_s.vline("carson_sup", (params.fc + params.B_carson/2) / 1_000_000,
+                         color="green", linestyle=":", linewidth=1, alpha=0.5)
+
+        fig_spec_s.title("Espectro de la Señal FM", fontsize=12, fontweight="bold")
+        fig_spec_s.autoscale()
+        fig_spec_s.xlim(0, max_freq_s / 1_000_000)
+        fig_spec_s.legend(loc="upper right", fontsize=9)
+        show_figure(fig_spec_s)
 
     # Información del ancho de banda
     st.info(f"📏 Ancho de banda teórico (Carson): {params.B_carson_khz:.2f} kHz "
             f"≈ {params.B_carson / 1_000_000:.4f} MHz")
 
 
+def render_adc_effect(demod: dict, adc: ADCConfig, params: FMParameters):
+    """
+    Muestra el efecto del conversor A/D: métricas y piso de cuantización en el espectro.
+
+    Args:
+        demod: Resultado de la etapa "demodulation" con A/D
+        adc: Parámetros del conversor
+        params: Parámetros FM
+    """
+    render_adc_metrics(demod, adc)
+
+    fig = get_template("adc_espectro", (12, 3), "Frecuencia [MHz]", "Magnitud [dB]")
+    fig.line("fm_adc", demod["freqs_adc"] / 1_000_000, demod["mag_fm_adc_db"],
+             label=f"FM + ruido + A/D de {adc.bits} bits", color="#9467bd", linewidth=1.2)
+    fig.vline("fc", params.fc / 1_000_000, label=f"fc = {params.fc_mhz:.2f} MHz",
+              color="black", linestyle="--", linewidth=1.5, alpha=0.6)
+    fig.title("Espectro de la FM digitalizada: ruido del canal + cuantización",
+                     fontsize=11, fontweight="bold")
+    fig.autoscale()
+    fig.xlim(0, demod["freqs_adc"][-1] / 1_000_000)
+    fig.legend(loc="upper right", fontsize=9)
+    show_figure(fig)
+
+    st.caption(
+        "ℹ️ La FM tiene envolvente constante: el mensaje está en los cruces por cero, así que "
+        "tolera pocos bits y hasta la saturación. La AM lleva el mensaje en la amplitud: el "
+        "error de cuantización y el recorte se suman directamente a la señal recuperada."
+    )
+
+
 def render_demodulation_tab(t: np.ndarray, m_norm: np.ndarray, s: np.ndarray, 
-                            params: FMParameters, Fs: float):
+                            params: FMParameters, config: PipelineConfig):
     """
     Renderiza la pestaña de demodulación y comparación FM vs AM.
     
@@ -244,7 +272,7 @@ def render_demodulation_tab(t: np.ndarray, m_norm: np.ndarray, s: np.ndarray,
         m_norm: Señal moduladora normalizada
         s: Señal FM
         params: Parámetros FM
-        Fs: Frecuencia de muestreo
+        config: Configuración del pipeline (para la etapa de demodulación)
     """
     st.markdown("### 🔧 Demodulación y Análisis de Ruido")
 
@@ -273,23 +301,45 @@ def render_demodulation_tab(t: np.ndarray, m_norm: np.ndarray, s: np.ndarray,
     with col_snr2:
         render_snr_quality_indicator(snr_db)
 
-    st.divider()
-
-    # Generar señal AM para comparación
-    s_am = calculate_am_signal(t, params.fc, m_norm)
-
-    # Agregar ruido AWGN a ambas señales
-    signal_power_fm = np.mean(s ** 2)
-    signal_power_am = np.mean(s_am ** 2)
-    noise_power_fm = signal_power_fm / (10 ** (snr_db / 10))
-    noise_power_am = signal_power_am / (10 ** (snr_db / 10))
+    # Conversor A/D tras el ruido
+    st.markdown("### 🔢 Conversor A/D")
+    use_adc = st.checkbox(
+        "Digitalizar la señal recibida",
+        value=False,
+        help="Cuantiza FM y AM (ya con ruido) como un receptor real de 8 a 16 bits antes de demodular",
+    )
+    adc = None
+    if use_adc:
+        col_adc1, col_adc2, col_adc3 = st.columns(3)
+        with col_adc1:
+            bits = st.slider("Resolución (bits)", min_value=2, max_value=16, value=8, step=1)
+        with col_adc2:
+            full_scale = st.slider(
+                "Fondo de escala (V)", min_value=0.25, max_value=4.0, value=2.0, step=0.25,
+                help="Amplitud máxima representable; la AM llega a 1,8 V y la FM a 1 V (más el ruido)",
+            )
+        with col_adc3:
+            clip = st.radio(
+                "Fuera de escala", options=["Saturar", "Desbordar"], index=0,
+                help="Saturar recorta al código extremo; desbordar envuelve como un entero en complemento a dos",
+            ) == "Saturar"
+        adc = ADCConfig(bits, full_scale, clip)
 
-    np.random.seed(42)  # Para reproducibilidad
-    noise_fm = np.random.normal(0, np.sqrt(noise_power_fm), len(s))
-    noise_am = np.random.normal(0, np.sqrt(noise_power_am), len(s_am))
+    st.divider()
 
-    s_fm_noisy = s + noise_fm
-    s_am_noisy = s_am + noise_am
+    # AM de comparación, ruido AWGN, A/D, demodulación y MSE en el pool compartido
+    with memory_stage("demodulación: cómputo"):
+        # Sin A/D, los mismos argumentos que el precalentamiento (misma clave de caché)
+        args = (config, snr_db) if adc is None else (config, snr_db, adc)
+        demod = get_compute_pool().run("demodulation", *args)
+    if adc is None:
+        s_fm_noisy = demod["s_fm_noisy"]
+        s_am_noisy = demod["s_am_noisy"]
+    else:
+        # Solo se convierten a voltios las muestras que se grafican
+        s_fm_noisy = demod["s_fm_adc"][:NOISY_SAMPLES_SHOWN] * demod["adc_lsb"]
+        s_am_noisy = demod["s_am_adc"][:NOISY_SAMPLES_SHOWN] * demod["adc_lsb"]
+        render_adc_effect(demod, adc, params)
 
     t_ms = t * 1000
 
@@ -300,17 +350,14 @@ def render_demodulation_tab(t: np.ndarray, m_norm: np.ndarray, s: np.ndarray,
 
     with col_noise1:
         st.markdown("**Señal FM Limpia (sin ruido)**")
-        fig_clean, ax_clean = plt.subplots(figsize=(10, 3))
-        samples_to_show = min(1000, len(t))
-        ax_clean.plot(t_ms[:samples_to_show], s[:samples_to_show],
-                     color="#2ca02c", linewidth=1.2, alpha=0.9, label="FM limpia")
-        ax_clean.set_xlabel("Tiempo [ms]", fontsize=10, fontweight="bold")
-        ax_clean.set_ylabel("Amplitud", fontsize=10, fontweight="bold")
-        ax_clean.set_title("Señal FM Original (Sin Ruido)", fontsize=11, fontweight="bold", color="green")
-        ax_clean.grid(True, alpha=0.3, linestyle="--")
-        ax_clean.legend(loc="upper right", fontsize=9)
-        st.pyplot(fig_clean)
-        plt.close()
+        fig_clean = get_template("ruido_limpia", (10, 3), "Tiempo [ms]", "Amplitud", label_fontsize=10)
+        samples_to_show = min(NOISY_SAMPLES_SHOWN, len(t))
+        fig_clean.line("s", t_ms[:samples_to_show], s[:samples_to_show], label="FM limpia",
+                       color="#2ca02c", linewidth=1.2, alpha=0.9)
+        fig_clean.title("Señal FM Original (Sin Ruido)", fontsize=11, fontweight="bold", color="green")
+        fig_clean.autoscale()
+        fig_clean.legend(loc="upper right", fontsize=9)
+        show_figure(fig_clean)
 
     with col_noise2:
         # Determinar color del título basado en SNR
@@ -322,17 +369,14 @@ def render_demodulation_tab(t: np.ndarray, m_norm: np.ndarray, s: np.ndarray,
             title_color = "red"
 
         st.markdown(f"**Señal FM con Ruido (SNR = {snr_db} dB)**")
-        fig_noisy, ax_noisy = plt.subplots(figsize=(10, 3))
-        ax_noisy.plot(t_ms[:samples_to_show], s_fm_noisy[:samples_to_show],
-                     color="#d62728", linewidth=1.2, alpha=0.8, label=f"FM + ruido (SNR={snr_db}dB)")
-        ax_noisy.set_xlabel("Tiempo [ms]", fontsize=10, fontweight="bold")
-        ax_noisy.set_ylabel("Amplitud", fontsize=10, fontweight="bold")
-        ax_noisy.set_title(f"Señal FM con Ruido (SNR = {snr_db} dB)",
-                          fontsize=11, fontweight="bold", color=title_color)
-        ax_noisy.grid(True, alpha=0.3, linestyle="--")
-        ax_noisy.legend(loc="upper right", fontsize=9)
-        st.pyplot(fig_noisy)
-        plt.close()
+        fig_noisy = get_template("ruido_ruidosa", (10, 3), "Tiempo [ms]", "Amplitud", label_fontsize=10)
+        fig_noisy.line("s", t_ms[:samples_to_show], s_fm_noisy[:samples_to_show],
+                       label=f"FM + ruido (SNR={snr_db}dB)", color="#d62728", linewidth=1.2, alpha=0.8)
+        fig_noisy.title(f"Señal FM con Ruido (SNR = {snr_db} dB)",
+                               fontsize=11, fontweight="bold", color=title_color)
+        fig_noisy.autoscale()
+        fig_noisy.legend(loc="upper right", fontsize=9)
+        show_figure(fig_noisy)
 
     # Mensaje educativo sobre el efecto observado
     if snr_db >= 30:
@@ -344,13 +388,11 @@ def render_demodulation_tab(t: np.ndarray, m_norm: np.ndarray, s: np.ndarray,
 
     st.divider()
 
-    # Demodular ambas señales
-    m_fm_recovered = demodulate_fm(s_fm_noisy, params.fc, Fs)
-    m_am_recovered = demodulate_am(s_am_noisy, params.fc, Fs)
-
-    # Calcular MSE (Mean Squared Error) como métrica de calidad
-    mse_fm = np.mean((m_norm - m_fm_recovered) ** 2)
-    mse_am = np.mean((m_norm - m_am_recovered) ** 2)
+    # Señales demoduladas y MSE (Mean Squared Error) como métrica de calidad
+    m_fm_recovered = demod["m_fm_recovered"]
+    m_am_recovered = demod["m_am_recovered"]
+    mse_fm = demod["mse_fm"]
+    mse_am = demod["mse_am"]
 
     # Comparación FM vs AM
     st.markdown("### 🔬 Comparación: Demodulación FM vs AM")
@@ -400,58 +442,50 @@ def render_demodulation_tab(t: np.ndarray, m_norm: np.ndarray, s: np.ndarray,
         st.subheader("Demodulación FM")
 
         # Señal con ruido
-        fig_fm1, ax_fm1 = plt.subplots(figsize=(10, 3))
-        ax_fm1.plot(t_ms[:500], s_fm_noisy[:500], color="#d62728", linewidth=1, alpha=0.7,
-                   label=f"FM con ruido (SNR={snr_db}dB)")
-        ax_fm1.set_xlabel("Tiempo [ms]", fontsize=10, fontweight="bold")
-        ax_fm1.set_ylabel("Amplitud", fontsize=10, fontweight="bold")
-        ax_fm1.set_title("Señal FM con Ruido", fontsize=11, fontweight="bold")
-        ax_fm1.grid(True, alpha=0.3, linestyle="--")
-        ax_fm1.legend(loc="upper right", fontsize=8)
-        st.pyplot(fig_fm1)
-        plt.close()
+        fig_fm1 = get_template("demod_fm_ruido", (10, 3), "Tiempo [ms]", "Amplitud", label_fontsize=10)
+        fig_fm1.line("s", t_ms[:500], s_fm_noisy[:500], label=f"FM con ruido (SNR={snr_db}dB)",
+                       color="#d62728", linewidth=1, alpha=0.7)
+        fig_fm1.title("Señal FM con Ruido", fontsize=11, fontweight="bold")
+        fig_fm1.autoscale()
+        fig_fm1.legend(loc="upper right", fontsize=8)
+        show_figure(fig_fm1)
 
         # Señal demodulada
-        fig_fm2, ax_fm2 = plt.subplots(figsize=(10, 3))
-        ax_fm2.plot(t_ms, m_norm, color="#1f77b4", linewidth=2, alpha=0.7, label="Original m(t)")
-        ax_fm2.plot(t_ms, m_fm_recovered, color="#d62728", linewidth=1.5, alpha=0.9,
-                   label="Recuperada FM")
-        ax_fm2.set_xlabel("Tiempo [ms]", fontsize=10, fontweight="bold")
-        ax_fm2.set_ylabel("Amplitud", fontsize=10, fontweight="bold")
-        ax_fm2.set_title("Comparación: Original vs Demodulada FM", fontsize=11, fontweight="bold")
-        ax_fm2.grid(True, alpha=0.3, linestyle="--")
-        ax_fm2.legend(loc="upper right", fontsize=8)
-        st.pyplot(fig_fm2)
-        plt.close()
+        fig_fm2 = get_template("demod_fm_comparacion", (10, 3), "Tiempo [ms]", "Amplitud",
+                                  label_fontsize=10)
+        fig_fm2.line("original", t_ms, m_norm, label="Original m(t)",
+                       color="#1f77b4", linewidth=2, alpha=0.7)
+        fig_fm2.line("recuperada", t_ms, m_fm_recovered, label="Recuperada FM",
+                       color="#d62728", linewidth=1.5, alpha=0.9)
+        fig_fm2.title("Comparación: Original vs Demodulada FM", fontsize=11, fontweight="bold")
+        fig_fm2.autoscale()
+        fig_fm2.legend(loc="upper right", fontsize=8)
+        show_figure(fig_fm2)
 
     with col_right:
         # Demodulación AM
         st.subheader("Demodulación AM")
 
         # Señal con ruido
-        fig_am1, ax_am1 = plt.subplots(figsize=(10, 3))
-        ax_am1.plot(t_ms[:500], s_am_noisy[:500], color="#2ca02c", linewidth=1, alpha=0.7,
-                   label=f"AM con ruido (SNR={snr_db}dB)")
-        ax_am1.set_xlabel("Tiempo [ms]", fontsize=10, fontweight="bold")
-        ax_am1.set_ylabel("Amplitud", fontsize=10, fontweight="bold")
-        ax_am1.set_title("Señal AM con Ruido", fontsize=11, fontweight="bold")
-        ax_am1.grid(True, alpha=0.3, linestyle="--")
-        ax_am1.legend(loc="upper right", fontsize=8)
-        st.pyplot(fig_am1)
-        plt.close()
+        fig_am1 = get_template("demod_am_ruido", (10, 3), "Tiempo [ms]", "Amplitud", label_fontsize=10)
+        fig_am1.line("s", t_ms[:500], s_am_noisy[:500], label=f"AM con ruido (SNR={snr_db}dB)",
+                       color="#2ca02c", linewidth=1, alpha=0.7)
+        fig_am1.title("Señal AM con Ruido", fontsize=11, fontweight="bold")
+        fig_am1.autoscale()
+        fig_am1.legend(loc="upper right", fontsize=8)
+        show_figure(fig_am1)
 
         # Señal demodulada
-        fig_am2, ax_am2 = plt.subplots(figsize=(10, 3))
-        ax_am2.plot(t_ms, m_norm, color="#1f77b4", linewidth=2, alpha=0.7, label="Original m(t)")
-        ax_am2.plot(t_ms, m_am_recovered, color="#2ca02c", linewidth=1.5, alpha=0.9,
-                   label="Recuperada AM")
-        ax_am2.set_xlabel("Tiempo [ms]", fontsize=10, fontweight="bold")
-        ax_am2.set_ylabel("Amplitud", fontsize=10, fontweight="bold")
-        ax_am2.set_title("Comparación: Original vs Demodulada AM", fontsize=11, fontweight="bold")
-        ax_am2.grid(True, alpha=0.3, linestyle="--")
-        ax_am2.legend(loc="upper right", fontsize=8)
-        st.pyplot(fig_am2)
-        plt.close()
+        fig_am2 = get_template("demod_am_comparacion", (10, 3), "Tiempo [ms]", "Amplitud",
+                                  label_fontsize=10)
+        fig_am2.line("original", t_ms, m_norm, label="Original m(t)",
+                       color="#1f77b4", linewidth=2, alpha=0.7)
+        fig_am2.line("recuperada", t_ms, m_am_recovered, label="Recuperada AM",
+                       color="#2ca02c", linewidth=1.5, alpha=0.9)
+        fig_am2.title("Comparación: Original vs Demodulada AM", fontsize=11, fontweight="bold")
+        fig_am2.autoscale()
+        fig_am2.legend(loc="upper right", fontsize=8)
+        show_figure(fig_am2)
 
     st.divider()
 
@@ -502,3 +536,68 @@ def render_demodulation_tab(t: np.ndarray, m_norm: np.ndarray, s: np.ndarray,
         **Observa que:** Al aumentar el SNR (más señal, menos ruido), la calidad mejora.
         Al disminuir el SNR (menos señal, más ruido), la calidad empeora.
         """)
+
+
+def render_sweep_tab(config: PipelineConfig):
+    """
+    Renderiza la pestaña de barrido de un parámetro de modulación.
+
+    Los espectros de todos los cuadros se calculan juntos en el pool (etapa
+    "sweep", en caché como las demás); el deslizador de la gráfica elige el
+    cuadro en el navegador y la reproducción solo reenvía cuadros ya
+    calculados.
+
+    Args:
+        config: Configuración del pipeline (valores fijos del barrido)
+    """
+    st.markdown("### 🎞️ Barrido de Parámetros")
+    st.info(
+        "Elige un parámetro y un rango: todos los espectros se calculan de una vez y el "
+        "deslizador **Cuadro** bajo la gráfica los recorre sin recalcular nada."
+    )
+
+    col_param, col_range, col_frames = st.columns([1, 2, 1])
+    with col_param:
+        label = st.radio("Parámetro:", options=list(SWEEP_OPTIONS), index=0, horizontal=True)
+    parameter, scale, unit, (low, high), initial, step = SWEEP_OPTIONS[label]
+    with col_range:
+        start, stop = st.slider(f"Rango de {label}", min_value=low, max_value=high,
+                                value=initial, step=step)
+    with col_frames:
+        frames = st.slider("Cuadros", min_value=10, max_value=80, value=40, step=5)
+
+    with memory_stage("barrido: cómputo"):
+        sweep = get_compute_pool().run("sweep", config, parameter, float(start * scale),
+                                       float(stop * scale), int(frames))
+
+    if len(sweep["values"]) == 0:
+        st.warning("⚠️ La ventana fc ± B no cabe bajo Fs/2: aumente Fs o reduzca fc para ver el barrido.")
+        return
+
+    if config.fc + float(np.max(sweep["B_carson"])) / 2 > config.Fs / 2:
+        st.warning("⚠️ Los cuadros con fc + B/2 > Fs/2 sufren aliasing: aumente Fs o reduzca el rango.")
+
+    name = label.split(" ")[0]
+    play = st.button("▶️ Reproducir", help="Recorre los cuadros ya calculados en el servidor")
+    placeholder = st.empty()
+    placeholder.vega_lite_chart(*sweep_chart(sweep, config.fc, name, scale, unit))
+
+    # Ancho de banda de todos los cuadros: Carson frente a la potencia real
+    values = sweep["values"] / scale
+    fig = get_template("barrido_ancho", (12, 3), f"{label}", "Ancho de banda [kHz]")
+    fig.line("carson", values, sweep["B_carson"] / 1000, label="Carson", color="green",
+             linestyle="--", linewidth=2)
+    fig.line("ocupado", values, sweep["B_occupied"] / 1000, label="Ocupado (99 %)",
+             color="#d62728", linewidth=2)
+    fig.title(f"Ancho de banda a lo largo del barrido de {name}", fontsize=12, fontweight="bold")
+    fig.legend(loc="upper left")
+    show_figure(fig)
+
+    if play:
+        # Las figuras pendientes de todas las pestañas se envían antes: si no,
+        # quedarían en blanco durante toda la reproducción
+        flush_figures()
+        for k in range(frames):
+            placeholder.vega_lite_chart(*sweep_chart(sweep, config.fc, name, scale, unit, frame=k))
+            time.sleep(SWEEP_FRAME_SECONDS)
+        placeholder.vega_lite_chart(*sweep_chart(sweep, config.fc, name, scale, unit))
@@ -0,0 +1,35 @@
+"""
+Precalentamiento del servidor de Streamlit al arrancar.
+"""
+import threading
+
+import streamlit as st
+
+from core.warmup import server_warmup_params, warm_up
+from .figures import warm_up_rendering
+
+# Informe del último precalentamiento: {"estado", "configuraciones", "render_s"}
+WARMUP_STATUS = {"estado": "pendiente", "configuraciones": [], "render_s": None}
+
+
+def _run():
+    WARMUP_STATUS["estado"] = "en curso"
+    try:
+        WARMUP_STATUS["render_s"] = warm_up_rendering()
+        WARMUP_STATUS["configuraciones"] = warm_up(server_warmup_params())
+        WARMUP_STATUS["estado"] = "completo"
+    except Exception as exc:  # El precalentamiento nunca debe tumbar la app
+        WARMUP_STATUS["estado"] = f"error: {exc}"
+
+
+@st.cache_resource(show_spinner=False)
+def start_server_warmup() -> threading.Thread:
+    """
+    Lanza el precalentamiento en segundo plano una sola vez por proceso.
+
+    Returns:
+        Hilo del precalentamiento
+    """
+    thread = threading.Thread(target=_run, name="demo-fm-warmup", daemon=True)
+    thread.start()
+    return thread
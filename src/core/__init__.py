@@ -1,23 +1,89 @@
 """
 Core functionality for FM modulation demo.
+
+Los submódulos se importan de forma diferida: ``from core import X`` solo
+carga el módulo que define X. Ningún módulo de core depende de matplotlib.
 """
-from .waveforms import generate_message, WAVEFORM_GENERATORS
-from .spectrum import compute_spectrum
-from .demodulation import demodulate_fm, demodulate_am
-from .fm_calculator import FMParameters, calculate_fm_signal, calculate_carrier, calculate_am_signal
-from .validations import validate_nyquist, validate_samples_per_period, ValidationResult
+import importlib
+
+# Nombre exportado -> submódulo que lo define
+_EXPORTS = {
+    "generate_message": "waveforms",
+    "WAVEFORM_GENERATORS": "waveforms",
+    "estimate_harmonics": "waveforms",
+    "harmonic_power_fractions": "waveforms",
+    "register_expression": "waveforms",
+    "compile_expression": "expressions",
+    "compute_spectrum": "spectrum",
+    "decimate_trace": "traces",
+    "ADCConfig": "adc",
+    "quantize": "adc",
+    "demodulate_fm": "demodulation",
+    "demodulate_am": "demodulation",
+    "demodulate_fm_iq": "demodulation",
+    "compose_fdm": "fdm",
+    "channelize": "fdm",
+    "simulate_fdm": "fdm",
+    "PolyphaseInterpolator": "resample",
+    "PolyphaseDecimator": "resample",
+    "FMBlockModulator": "streaming",
+    "FMBlockDemodulator": "streaming",
+    "PCMSource": "audio",
+    "open_wav": "audio",
+    "write_wav": "audio",
+    "process_audio": "audio",
+    "StereoComposer": "stereo",
+    "StereoDecoder": "stereo",
+    "process_stereo": "stereo",
+    "modulate_fsk": "fsk",
+    "detect_fsk": "fsk",
+    "simulate_ber": "fsk",
+    "BlockRing": "realtime",
+    "run_realtime": "realtime",
+    "PipelineServer": "server",
+    "FMParameters": "fm_calculator",
+    "FMParameterArray": "fm_calculator",
+    "carson_table": "fm_calculator",
+    "calculate_fm_signal": "fm_calculator",
+    "integrate_phase": "fm_calculator",
+    "calculate_carrier": "fm_calculator",
+    "calculate_am_signal": "fm_calculator",
+    "validate_nyquist": "validations",
+    "validate_samples_per_period": "validations",
+    "suggest_sampling_rate": "validations",
+    "ValidationResult": "validations",
+    "SamplingSuggestion": "validations",
+    "occupied_bandwidth": "bandwidth",
+    "occupied_bandwidth_table": "bandwidth",
+    "next_fast_len": "fft_plan",
+    "plan_fft_length": "fft_plan",
+    "FFTPlan": "fft_plan",
+    "PipelineConfig": "pipeline",
+    "config_from_params": "pipeline",
+    "compute_signals": "pipeline",
+    "compute_demodulation": "pipeline",
+    "compute_sweep": "pipeline",
+    "sweep_spectra": "sweep",
+    "ComputePool": "workers",
+    "get_compute_pool": "workers",
+    "ResultCache": "result_cache",
+    "Workspace": "workspace",
+    "borrow_workspace": "workspace",
+    "MemoryProfiler": "memory_profile",
+    "StageMemory": "memory_profile",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    globals()[name] = value  # Las siguientes búsquedas no pasan por aquí
+    return value
+
 
-__all__ = [
-    "generate_message",
-    "WAVEFORM_GENERATORS",
-    "compute_spectrum",
-    "demodulate_fm",
-    "demodulate_am",
-    "FMParameters",
-    "calculate_fm_signal",
-    "calculate_carrier",
-    "calculate_am_signal",
-    "validate_nyquist",
-    "validate_samples_per_period",
-    "ValidationResult",
-]
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
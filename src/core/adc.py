@@ -0,0 +1,90 @@
+"""
+Modelo de conversor analógico-digital (A/D).
+
+Un receptor real entrega muestras enteras de 8 a 16 bits, no float64. El
+modelo cuantiza con paso uniforme (LSB = fondo de escala / 2^(bits−1)) y,
+fuera del rango, satura o desborda como un entero en complemento a dos.
+Los códigos se guardan en int8 o int16 (8 o 4 veces menos memoria que
+float64); las funciones de core que los reciben los convierten sobre la
+marcha con el factor de escala.
+"""
+from dataclasses import dataclass
+
+import numpy as np
+
+
+@dataclass(frozen=True)
+class ADCConfig:
+    """Parámetros del conversor A/D (inmutable: sirve de clave de caché)."""
+    bits: int = 8  # Resolución (2-16 bits)
+    full_scale: float = 2.0  # Amplitud máxima representable (V)
+    clip: bool = True  # True: satura fuera de rango; False: desborda (complemento a dos)
+
+    @property
+    def dtype(self) -> np.dtype:
+        """Entero más pequeño que contiene los códigos."""
+        return np.dtype(np.int8 if self.bits <= 8 else np.int16)
+
+    @property
+    def lsb(self) -> float:
+        """Paso de cuantización (V por código)."""
+        return self.full_scale / 2 ** (self.bits - 1)
+
+    @property
+    def ideal_sqnr_db(self) -> float:
+        """SQNR de un seno a plena escala: 6,02·bits + 1,76 dB."""
+        return 6.02 * self.bits + 1.76
+
+
+def quantize(x: np.ndarray, adc: ADCConfig, workspace=None) -> np.ndarray:
+    """
+    Cuantiza una señal en códigos enteros.
+
+    Args:
+        x: Señal analógica (V)
+        adc: Parámetros del conversor
+        workspace: Workspace opcional para el intermedio en coma flotante
+
+    Returns:
+        Códigos en adc.dtype; multiplicar por adc.lsb para volver a voltios
+    """
+    scaled = workspace.buffer("adc") if workspace is not None and len(x) == workspace.n else None
+    scaled = np.divide(x, adc.lsb, out=scaled)
+    np.rint(scaled, out=scaled)
+    top = 2 ** (adc.bits - 1)
+    if adc.clip:
+        np.clip(scaled, -top, top - 1, out=scaled)
+    else:
+        # Desborde: el código se envuelve dentro de [-top, top)
+        scaled += top
+        np.mod(scaled, 2 * top, out=scaled)
+        scaled -= top
+    return scaled.astype(adc.dtype)
+
+
+def clipped_fraction(x: np.ndarray, adc: ADCConfig) -> float:
+    """Fracción de muestras de x fuera del rango del conversor."""
+    top = 2 ** (adc.bits - 1)
+    limit_low, limit_high = -top * adc.lsb, (top - 1) * adc.lsb
+    return float(np.count_nonzero((x < limit_low) | (x > limit_high))) / len(x)
+
+
+def as_float(x: np.ndarray, workspace=None, name: str = "codigos") -> np.ndarray:
+    """
+    Vista en coma flotante de una señal: los enteros se convierten, el resto pasa tal cual.
+
+    Args:
+        x: Señal (float o códigos enteros)
+        workspace: Workspace opcional para la conversión
+        name: Nombre del búfer en el workspace
+
+    Returns:
+        x si ya es de coma flotante; si no, una copia float64 (en el workspace si se da)
+    """
+    if not np.issubdtype(x.dtype, np.integer):
+        return x
+    if workspace is None:
+        return x.astype(np.float64)
+    converted = workspace.buffer(name, np.float64, len(x))
+    np.copyto(converted, x)
+    return converted
@@ -0,0 +1,350 @@
+"""
+Archivos de audio como fuente del mensaje.
+
+Un archivo WAV o PCM crudo se proyecta en memoria (np.memmap) y se lee por
+bloques: cada bloque se interpola hasta la tasa del modulador, se modula,
+opcionalmente se le suma ruido y se demodula con los bloques con estado de
+core.streaming. Nunca hay más de un bloque de radiofrecuencia en memoria,
+así que un archivo de varios minutos se procesa con memoria constante. El
+mensaje recuperado se escribe de vuelta a WAV (PCM de 16 bits) a medida
+que se produce.
+
+Uso desde la línea de comandos (desde src/):
+    python -m core.audio entrada.wav [salida.wav] [--fc 0.25] [--deviation 75] [--snr 30]
+"""
+import argparse
+import itertools
+import math
+import struct
+import time
+import wave
+from dataclasses import dataclass
+from typing import Iterable, Iterator, Optional
+
+import numpy as np
+
+from .resample import PolyphaseInterpolator
+from .streaming import FMBlockDemodulator, FMBlockModulator
+
+# Muestras de audio por bloque (unos 90 ms a 44,1 kHz)
+CHUNK_FRAMES = 4096
+# Margen de muestreo sobre la frecuencia máxima de la señal FM (Fs ≥ 2,5·fmax)
+SAMPLING_MARGIN = 2.5
+# Tasa intermedia del demodulador respecto del ancho de banda de Carson
+BASEBAND_MARGIN = 1.25
+
+_WAVE_FORMAT_PCM = 1
+_WAVE_FORMAT_FLOAT = 3
+_WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+
+# (formato, bits por muestra) -> (dtype en el archivo, desplazamiento, escala a ±1)
+_SAMPLE_FORMATS = {
+    (_WAVE_FORMAT_PCM, 8): ("u1", 128.0, 128.0),
+    (_WAVE_FORMAT_PCM, 16): ("<i2", 0.0, 32768.0),
+    (_WAVE_FORMAT_PCM, 32): ("<i4", 0.0, 2147483648.0),
+    (_WAVE_FORMAT_FLOAT, 32): ("<f4", 0.0, 1.0),
+    (_WAVE_FORMAT_FLOAT, 64): ("<f8", 0.0, 1.0),
+}
+_DTYPE_SCALING = {np.dtype(d): (offset, scale) for d, offset, scale in _SAMPLE_FORMATS.values()}
+
+
+class PCMSource:
+    """
+    Muestras PCM de un archivo, leídas por bloques a través de un memmap.
+
+    Los bloques se entregan en float64 mono (promedio de los canales) en el
+    rango ±1. Solo se copian a memoria las muestras del bloque actual.
+    """
+
+    def __init__(self, path: str, rate: float, dtype: str = "<i2", channels: int = 1,
+                 offset: int = 0, frames: Optional[int] = None, chunk_frames: int = CHUNK_FRAMES):
+        """
+        Args:
+            path: Ruta del archivo
+            rate: Frecuencia de muestreo (Hz)
+            dtype: Tipo de las muestras en el archivo ("<i2", "u1", "<f4"...)
+            channels: Canales intercalados
+            offset: Byte donde empiezan las muestras
+            frames: Número de tramas (por defecto, hasta el final del archivo)
+            chunk_frames: Tramas por bloque
+        """
+        dtype = np.dtype(dtype)
+        scaling = _DTYPE_SCALING.get(dtype)
+        if scaling is None:
+            raise ValueError(f"Tipo de muestra no soportado: {dtype}")
+        self.path = path
+        self.rate = float(rate)
+        self.channels = channels
+        self.chunk_frames = chunk_frames
+        self._offset, self._scale = scaling
+        shape = (frames, channels) if frames is not None else None
+        data = np.memmap(path, dtype=dtype, mode="r", offset=offset, shape=shape)
+        self._data = data.reshape(-1, channels) if shape is None else data
+
+    @property
+    def frames(self) -> int:
+        """Número de tramas (muestras por canal)."""
+        return len(self._data)
+
+    @property
+    def duration(self) -> float:
+        """Duración (s)."""
+        return self.frames / self.rate
+
+    def chunks(self, mono: bool = True) -> Iterator[np.ndarray]:
+        """
+        Recorre el archivo por bloques.
+
+        Args:
+            mono: True, promedia los canales; False, los conserva
+
+        Yields:
+            Bloques float64 de hasta chunk_frames muestras: 1-D si mono, si no
+            (tramas, canales)
+        """
+        for start in range(0, self.frames, self.chunk_frames):
+            block = np.asarray(self._data[start:start + self.chunk_frames], dtype=float)
+            if mono:
+                block = block.mean(axis=1) if self.channels > 1 else block[:, 0]
+            if self._offset:
+                block -= self._offset
+            block /= self._scale
+            yield block
+
+
+def open_wav(path: str, chunk_frames: int = CHUNK_FRAMES) -> PCMSource:
+    """
+    Abre un WAV sin cargarlo: lee la cabecera RIFF y proyecta el bloque de datos.
+
+    Admite PCM entero de 8, 16 y 32 bits y coma flotante de 32 y 64 bits
+    (también en WAVE_FORMAT_EXTENSIBLE).
+
+    Args:
+        path: Ruta del archivo WAV
+        chunk_frames: Tramas por bloque
+
+    Returns:
+        PCMSource
+
+    Raises:
+        ValueError: si el archivo no es un WAV soportado
+    """
+    with open(path, "rb") as f:
+        riff, _, wave_id = struct.unpack("<4sI4s", f.read(12))
+        if riff != b"RIFF" or wave_id != b"WAVE":
+            raise ValueError(f"{path} no es un archivo WAV")
+        fmt = None
+        while True:
+            header = f.read(8)
+            if len(header) < 8:
+                raise ValueError(f"{path} no tiene bloque de datos")
+            chunk_id, size = struct.unpack("<4sI", header)
+            if chunk_id == b"fmt ":
+                body = f.read(size + size % 2)
+                tag, channels, rate, _, _, bits = struct.unpack("<HHIIHH", body[:16])
+                if tag == _WAVE_FORMAT_EXTENSIBLE:
+                    tag = struct.unpack("<H", body[24:26])[0]  # Subformato
+                fmt = (tag, channels, rate, bits)
+            elif chunk_id == b"data":
+                if fmt is None:
+                    raise ValueError(f"{path}: el bloque de datos precede al de formato")
+                data_offset, data_size = f.tell(), size
+                break
+            else:
+                f.seek(size + size % 2, 1)
+
+    tag, channels, rate, bits = fmt
+    spec = _SAMPLE_FORMATS.get((tag, bits))
+    if spec is None:
+        raise ValueError(f"Formato WAV no soportado: formato {tag}, {bits} bits")
+    frames = data_size // (channels * bits // 8)
+    return PCMSource(path, rate, spec[0], channels, data_offset, frames, chunk_frames)
+
+
+def write_wav(path: str, rate: float, blocks: Iterable[np.ndarray], channels: int = 1) -> int:
+    """
+    Escribe bloques a un WAV de 16 bits a medida que llegan.
+
+    Args:
+        path: Ruta de salida
+        rate: Frecuencia de muestreo (Hz)
+        blocks: Bloques float en ±1 (lo que excede se recorta); con varios
+            canales, de forma (tramas, canales)
+        channels: Canales del archivo
+
+    Returns:
+        Número de tramas escritas
+    """
+    written = 0
+    with wave.open(path, "wb") as f:
+        f.setnchannels(channels)
+        f.setsampwidth(2)
+        f.setframerate(int(round(rate)))
+        for block in blocks:
+            pcm = np.clip(block * 32767.0, -32768, 32767).astype("<i2")
+            f.writeframes(pcm.tobytes())
+            written += len(pcm)
+    return written
+
+
+@dataclass
+class AudioChainPlan:
+    """Tasas de la cadena audio → FM → audio."""
+    rate: float  # Tasa del audio (Hz)
+    up: int  # Interpolación hasta la tasa del modulador
+    decimation: int  # Diezmado hasta la banda base del discriminador
+    output_decimation: int  # Diezmado desde la banda base hasta la tasa del audio
+
+    @property
+    def Fs(self) -> float:
+        """Tasa del modulador (Hz)."""
+        return self.rate * self.up
+
+    @property
+    def baseband_rate(self) -> float:
+        """Tasa del discriminador (Hz)."""
+        return self.Fs / self.decimation
+
+
+def plan_audio_chain(rate: float, fc: float, deviation: float,
+                     bandwidth: Optional[float] = None) -> AudioChainPlan:
+    """
+    Elige los factores enteros de la cadena para un audio, una portadora y una desviación.
+
+    Fs = rate·up debe cubrir la señal FM hasta fc + B_carson/2 con margen;
+    la banda base intermedia es el divisor de up más grande que aún abarca
+    el ancho de Carson, y el resto del diezmado se hace tras el discriminador.
+
+    Args:
+        rate: Frecuencia de muestreo del audio (Hz)
+        fc: Frecuencia portadora (Hz)
+        deviation: Desviación de frecuencia máxima (Hz)
+        bandwidth: Frecuencia máxima del mensaje (Hz); por defecto, rate/2
+
+    Returns:
+        AudioChainPlan
+
+    Raises:
+        ValueError: si la portadora no deja espacio a la banda de Carson
+    """
+    carson = 2 * (deviation + (rate / 2 if bandwidth is None else bandwidth))
+    if fc <= carson / 2:
+        raise ValueError(f"La portadora ({fc / 1000:.0f} kHz) debe superar la mitad del ancho "
+                         f"de Carson ({carson / 2000:.0f} kHz)")
+    up = math.ceil(SAMPLING_MARGIN * (fc + carson / 2) / rate)
+    decimation = max(d for d in range(1, up + 1)
+                     if up % d == 0 and rate * up / d >= BASEBAND_MARGIN * carson)
+    return AudioChainPlan(rate, up, decimation, up // decimation)
+
+
+def process_audio(source: PCMSource, fc: float, deviation: float, snr_db: Optional[float] = None,
+                  seed: int = 42) -> Iterator[np.ndarray]:
+    """
+    Modula y demodula el audio bloque a bloque.
+
+    El retardo de los filtros se compensa: la salida tiene tantas muestras
+    como la entrada y queda alineada con ella.
+
+    Args:
+        source: Fuente del mensaje
+        fc: Frecuencia portadora (Hz)
+        deviation: Desviación para un mensaje a plena escala (Hz); kf = deviation
+        snr_db: Relación señal-ruido del canal (dB); None, sin ruido
+        seed: Semilla del ruido
+
+    Yields:
+        Bloques del mensaje recuperado a la tasa del audio
+    """
+    plan = plan_audio_chain(source.rate, fc, deviation)
+    return fm_loopback(source.chunks(), source.frames, plan, fc, deviation, snr_db, seed)
+
+
+def fm_loopback(blocks: Iterable[np.ndarray], frames: int, plan: AudioChainPlan, fc: float,
+                deviation: float, snr_db: Optional[float] = None, seed: int = 42) -> Iterator[np.ndarray]:
+    """
+    Interpola, modula, agrega ruido y demodula un mensaje que llega por bloques.
+
+    Args:
+        blocks: Bloques del mensaje a la tasa plan.rate
+        frames: Muestras totales del mensaje
+        plan: Tasas de la cadena (ver plan_audio_chain)
+        fc: Frecuencia portadora (Hz)
+        deviation: Desviación para un mensaje a plena escala (Hz); kf = deviation
+        snr_db: Relación señal-ruido del canal (dB); None, sin ruido
+        seed: Semilla del ruido
+
+    Yields:
+        Bloques del mensaje recuperado a la tasa plan.rate, alineados con la
+        entrada (frames muestras en total)
+    """
+    interpolator = PolyphaseInterpolator(plan.up)
+    modulator = FMBlockModulator(fc, deviation, plan.Fs)
+    demodulator = FMBlockDemodulator(fc, deviation, plan.Fs, plan.decimation, plan.output_decimation)
+    rng = np.random.RandomState(seed)
+    # Potencia de un coseno de amplitud unitaria: 1/2
+    noise_std = np.sqrt(0.5 / 10 ** (snr_db / 10)) if snr_db is not None else 0.0
+
+    # La salida n corresponde al instante (n·up + up − 1 − retardo) de la tasa Fs.
+    # El retardo de los filtros es entero; una línea de retardo de `pad`
+    # muestras de RF lo completa hasta alinear la salida con una muestra de audio
+    delay = int(interpolator.delay + demodulator.delay)
+    pad = -(delay - (plan.up - 1)) % plan.up
+    skip = (delay + pad - (plan.up - 1)) // plan.up
+    remaining = frames
+    flush = np.zeros(skip + 1)  # Vacía los filtros al final
+
+    for chunk in itertools.chain(blocks, [flush]):
+        s = modulator.process(interpolator.process(chunk))
+        if pad:
+            s, pad = np.concatenate([np.zeros(pad), s]), 0
+        if noise_std:
+            s += rng.normal(0, noise_std, len(s))
+        out = demodulator.process(s)
+        if skip:
+            dropped = min(skip, len(out))
+            out, skip = out[dropped:], skip - dropped
+        out = out[:remaining]
+        remaining -= len(out)
+        if len(out):
+            yield out
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Modula y demodula un archivo de audio por bloques.")
+    parser.add_argument("entrada", help="Archivo WAV (o PCM crudo con --pcm-rate)")
+    parser.add_argument("salida", nargs="?", help="WAV de salida (por defecto no se escribe)")
+    parser.add_argument("--fc", type=float, default=0.25, help="Portadora (MHz)")
+    parser.add_argument("--deviation", type=float, default=75.0, help="Desviación a plena escala (kHz)")
+    parser.add_argument("--snr", type=float, default=None, help="SNR del canal (dB)")
+    parser.add_argument("--chunk", type=int, default=CHUNK_FRAMES, help="Muestras de audio por bloque")
+    parser.add_argument("--pcm-rate", type=float, default=None, help="Tasa del PCM crudo (Hz)")
+    parser.add_argument("--pcm-dtype", default="<i2", help="Tipo del PCM crudo (p. ej. <i2, u1, <f4)")
+    parser.add_argument("--pcm-channels", type=int, default=1, help="Canales del PCM crudo")
+    args = parser.parse_args(argv)
+
+    if args.pcm_rate is not None:
+        source = PCMSource(args.entrada, args.pcm_rate, args.pcm_dtype, args.pcm_channels,
+                           chunk_frames=args.chunk)
+    else:
+        source = open_wav(args.entrada, args.chunk)
+    fc, deviation = args.fc * 1e6, args.deviation * 1e3
+    plan = plan_audio_chain(source.rate, fc, deviation)
+    print(f"{source.frames:,} muestras ({source.duration:.1f} s) a {source.rate / 1000:.1f} kHz → "
+          f"Fs = {plan.Fs / 1e6:.3f} MHz (×{plan.up}), discriminador a "
+          f"{plan.baseband_rate / 1000:.1f} kHz")
+
+    start = time.perf_counter()
+    blocks = process_audio(source, fc, deviation, args.snr)
+    if args.salida:
+        written = write_wav(args.salida, source.rate, blocks)
+    else:
+        written = sum(len(block) for block in blocks)
+    seconds = time.perf_counter() - start
+
+    rf_rate = source.frames * plan.up / seconds / 1e6 if seconds > 0 else float("inf")
+    print(f"  {written:,} muestras recuperadas en {seconds:.2f} s "
+          f"(×{source.duration / seconds:.1f} tiempo real, {rf_rate:.1f} MS/s de RF)")
+
+
+if __name__ == "__main__":
+    main()
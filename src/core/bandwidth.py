@@ -0,0 +1,114 @@
+"""
+Ancho de banda ocupado medido a partir del espectro.
+
+La regla de Carson es una estimación; aquí se mide el ancho de banda que
+contiene una fracción dada de la potencia (p. ej. 99 %), a partir de la
+potencia acumulada de una sola FFT. Todas las funciones aceptan lotes: la
+última dimensión es el tiempo.
+"""
+from functools import lru_cache
+from typing import Sequence
+
+import numpy as np
+
+from .fft_plan import rfft
+from .waveforms import HARMONIC_PERIOD_SAMPLES, get_generator
+
+# Fracción de la potencia que define el ancho de banda ocupado
+OCCUPIED_POWER_FRACTION = 0.99
+
+
+def occupied_span(power: np.ndarray, fraction: float) -> np.ndarray:
+    """
+    Índices extremos que dejan (1 - fraction)/2 de la potencia a cada lado.
+
+    Args:
+        power: Potencia por bin, ordenada por frecuencia en la última dimensión
+        fraction: Fracción de la potencia contenida
+
+    Returns:
+        Número de bins entre el borde inferior y el superior (forma del lote)
+    """
+    cumulative = np.cumsum(power, axis=-1)
+    total = cumulative[..., -1:]
+    tail = (1.0 - fraction) / 2 * total
+    # Primer bin donde la acumulada supera la cola inferior / alcanza 1 - cola
+    low = np.sum(cumulative <= tail, axis=-1)
+    high = np.sum(cumulative < total - tail, axis=-1)
+    return high - low
+
+
+def occupied_bandwidth(x: np.ndarray, Fs: float, fraction: float = OCCUPIED_POWER_FRACTION,
+                       workspace=None) -> np.ndarray:
+    """
+    Ancho de banda que contiene fraction de la potencia de una señal real.
+
+    Args:
+        x: Señal o lote de señales (tiempo en la última dimensión)
+        Fs: Frecuencia de muestreo (Hz)
+        fraction: Fracción de la potencia (0-1)
+        workspace: Workspace opcional para el espectro (solo señales 1-D)
+
+    Returns:
+        Ancho de banda en Hz (escalar para una señal, arreglo para un lote)
+    """
+    n = x.shape[-1]
+    spectrum = None
+    if workspace is not None and x.ndim == 1:
+        spectrum = workspace.buffer("rfft", np.complex128, n // 2 + 1)
+    spectrum = rfft(x, out=spectrum)
+    power = spectrum.real ** 2 + spectrum.imag ** 2
+    return occupied_span(power, fraction) * (Fs / n)
+
+
+def occupied_bandwidth_table(waveforms: Sequence[str], betas: Sequence[float],
+                             fraction: float = OCCUPIED_POWER_FRACTION) -> np.ndarray:
+    """
+    Ancho de banda ocupado de FM, en múltiplos de fm, para cada forma de onda y β.
+
+    Con un mensaje periódico de media nula la envolvente compleja
+    exp(j·2π·β·fm·∫m) también es periódica en 1/fm: su espectro son rayas en
+    k·fm y basta un período para medirlo, sin portadora ni dependencia de
+    Fs, fc o la duración. Todas las combinaciones se calculan en una sola
+    FFT por lotes de forma (formas de onda, β, muestras). Los generadores con
+    atributo harmonic_periods (mensajes aleatorios como GFSK) se evalúan en
+    esa cantidad de períodos, en un lote aparte.
+
+    Args:
+        waveforms: Nombres en WAVEFORM_GENERATORS
+        betas: Índices de modulación
+        fraction: Fracción de la potencia (0-1)
+
+    Returns:
+        Arreglo (len(waveforms), len(betas)); multiplicar por fm para obtener Hz
+    """
+    return _occupied_table(tuple(waveforms), tuple(float(b) for b in betas), fraction).copy()
+
+
+@lru_cache(maxsize=32)
+def _occupied_table(waveforms: tuple, betas: tuple, fraction: float) -> np.ndarray:
+    generators = [get_generator(w) for w in waveforms]
+    periods = [getattr(g, "harmonic_periods", 1) for g in generators]
+    table = np.empty((len(waveforms), len(betas)))
+    # Un lote por número de períodos evaluados (mensajes aleatorios como GFSK)
+    for count in sorted(set(periods)):
+        rows = [i for i, p in enumerate(periods) if p == count]
+        table[rows] = _occupied_rows([generators[i] for i in rows], betas, fraction, count)
+    return table
+
+
+def _occupied_rows(generators: list, betas: tuple, fraction: float, periods: int) -> np.ndarray:
+    n = HARMONIC_PERIOD_SAMPLES
+    t = np.arange(n * periods) / n  # `periods` períodos con fm = 1
+    messages = np.stack([generator(t, 1.0) for generator in generators])
+    messages -= messages.mean(axis=-1, keepdims=True)  # Fase periódica
+
+    # φ = 2π·β·∫m dt con dt = 1/n: forma (formas de onda, β, n·periods)
+    integral = np.cumsum(messages, axis=-1) / n
+    phase = (2 * np.pi * np.asarray(betas))[np.newaxis, :, np.newaxis] * integral[:, np.newaxis, :]
+    envelope = np.exp(1j * phase)
+
+    # Rayas separadas fm/periods, ordenadas por frecuencia
+    spectrum = np.fft.fftshift(np.fft.fft(envelope, axis=-1), axes=-1)
+    power = spectrum.real ** 2 + spectrum.imag ** 2
+    return occupied_span(power, fraction) / periods
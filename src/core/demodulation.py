@@ -1,62 +1,120 @@
 """
 Funciones de demodulación para FM y AM.
+
+Aceptan señales en coma flotante o códigos enteros de un A/D (core.adc):
+la salida se normaliza, así que el factor de escala de los códigos no
+interviene y basta convertirlos a float sobre la marcha.
 """
 import numpy as np
 
+from .adc import as_float
+from .fft_plan import fft, ifft, analytic_multiplier
+
 
-def demodulate_fm(s_fm: np.ndarray, fc: float, Fs: float) -> np.ndarray:
+def _analytic_signal(x: np.ndarray, workspace=None) -> np.ndarray:
+    """
+    Señal analítica x + j·H{x} calculada en un solo arreglo complejo.
+
+    Args:
+        x: Señal real (float o códigos enteros)
+        workspace: Workspace opcional para el arreglo complejo
+
+    Returns:
+        Señal analítica (con workspace, se sobrescribe en la siguiente llamada)
+    """
+    x = as_float(x, workspace)
+    analytic = workspace.buffer("analitica", np.complex128, len(x)) if workspace is not None else None
+    analytic = fft(x, out=analytic)
+    analytic *= analytic_multiplier(len(x))
+    analytic = ifft(analytic, out=analytic)
+    analytic.real = x  # La parte real de la señal analítica es la señal misma
+    return analytic
+
+
+def _normalize(x: np.ndarray) -> np.ndarray:
+    """Divide x en su lugar por su máximo valor absoluto (si no es cero)."""
+    peak = max(np.max(x), -np.min(x))
+    if peak > 0:
+        x /= peak
+    return x
+
+
+def demodulate_fm(s_fm: np.ndarray, fc: float, Fs: float,
+                  out: np.ndarray = None, workspace=None) -> np.ndarray:
     """
     Demodula una señal FM usando diferenciación de fase.
 
     Args:
-        s_fm: Señal FM
+        s_fm: Señal FM (float o códigos enteros)
         fc: Frecuencia portadora (Hz)
         Fs: Frecuencia de muestreo (Hz)
+        out: Arreglo destino opcional
+        workspace: Workspace opcional para los intermedios
 
     Returns:
         Señal mensaje recuperada (normalizada)
     """
     # Calcular la fase instantánea usando la transformada de Hilbert
-    analytic_signal = s_fm + 1j * np.imag(np.fft.ifft(np.fft.fft(s_fm) *
-                                          (2 * (np.fft.fftfreq(len(s_fm)) > 0))))
-    inst_phase = np.unwrap(np.angle(analytic_signal))
+    analytic_signal = _analytic_signal(s_fm, workspace)
+    phase = workspace.buffer("fase") if workspace is not None else None
+    # np.angle(z) = arctan2(Im z, Re z), aquí sin asignar un arreglo nuevo
+    inst_phase = np.unwrap(np.arctan2(analytic_signal.imag, analytic_signal.real, out=phase))
 
-    # Derivada de la fase → frecuencia instantánea
-    inst_freq = np.diff(inst_phase) * Fs / (2 * np.pi)
-    inst_freq = np.concatenate(([inst_freq[0]], inst_freq))  # Mantener longitud
+    # Derivada de la fase → frecuencia instantánea (mantener longitud)
+    m_recovered = np.empty_like(inst_phase) if out is None else out
+    np.subtract(inst_phase[1:], inst_phase[:-1], out=m_recovered[1:])
+    m_recovered[1:] *= Fs
+    m_recovered[1:] /= 2 * np.pi
+    m_recovered[0] = m_recovered[1]
 
     # Remover la portadora
-    m_recovered = inst_freq - fc
-
-    # Normalizar
-    if np.max(np.abs(m_recovered)) > 0:
-        m_recovered = m_recovered / np.max(np.abs(m_recovered))
+    m_recovered -= fc
 
-    return m_recovered
+    return _normalize(m_recovered)
 
 
-def demodulate_am(s_am: np.ndarray, fc: float, Fs: float) -> np.ndarray:
+def demodulate_am(s_am: np.ndarray, fc: float, Fs: float,
+                  out: np.ndarray = None, workspace=None) -> np.ndarray:
     """
     Demodula una señal AM usando detección de envolvente.
 
     Args:
-        s_am: Señal AM
+        s_am: Señal AM (float o códigos enteros)
         fc: Frecuencia portadora (Hz)
         Fs: Frecuencia de muestreo (Hz)
+        out: Arreglo destino opcional
+        workspace: Workspace opcional para los intermedios
 
     Returns:
         Señal mensaje recuperada (normalizada)
     """
     # Detección de envolvente usando transformada de Hilbert
-    analytic_signal = s_am + 1j * np.imag(np.fft.ifft(np.fft.fft(s_am) *
-                                          (2 * (np.fft.fftfreq(len(s_am)) > 0))))
-    envelope = np.abs(analytic_signal)
+    envelope = np.abs(_analytic_signal(s_am, workspace), out=out)
 
     # Remover componente DC
-    m_recovered = envelope - np.mean(envelope)
+    envelope -= np.mean(envelope)
+
+    return _normalize(envelope)
+
+
+def demodulate_fm_iq(iq: np.ndarray, Fs: float) -> np.ndarray:
+    """
+    Demodula FM en banda base compleja (p. ej. canales de un canalizador).
+
+    Discriminador de fase: la frecuencia instantánea es el ángulo de
+    z[n]·conj(z[n−1]), sin desenrollar la fase. Acepta lotes (la última
+    dimensión es el tiempo). El resultado no se normaliza: con kf conocido,
+    m(t) = Δf(t) / kf.
 
-    # Normalizar
-    if np.max(np.abs(m_recovered)) > 0:
-        m_recovered = m_recovered / np.max(np.abs(m_recovered))
+    Args:
+        iq: Señal compleja en banda base, o arreglo de señales
+        Fs: Frecuencia de muestreo de la banda base (Hz)
 
-    return m_recovered
+    Returns:
+        Desviación de frecuencia instantánea (Hz), misma forma que iq
+    """
+    deviation = np.empty(iq.shape)
+    deviation[..., 1:] = np.angle(iq[..., 1:] * np.conj(iq[..., :-1]))
+    deviation[..., 1:] *= Fs / (2 * np.pi)
+    deviation[..., 0] = deviation[..., 1]
+    return deviation
@@ -0,0 +1,178 @@
+"""
+Mensajes definidos por una expresión en t y fm.
+
+La expresión se analiza con ast y solo se aceptan números, los nombres t,
+fm, pi, e y tau, operadores aritméticos y de comparación y una lista
+cerrada de funciones de NumPy; cualquier otra construcción (atributos,
+índices, llamadas arbitrarias...) se rechaza antes de compilar. El código
+compilado se evalúa una sola vez por llamada sobre el arreglo t completo,
+así que corre a velocidad de NumPy.
+
+    sin(2*pi*fm*t) + sin(6*pi*fm*t)/3            suma de armónicos
+    sin(2*pi*fm*t*(1 + 200*t))                   chirp
+    where(sin(2*pi*fm*t) > 0, 1, -0.5)           pulso asimétrico
+"""
+import ast
+from functools import lru_cache
+from typing import Callable
+
+import numpy as np
+
+# Límites de la expresión (texto y nodos del árbol)
+MAX_EXPRESSION_LENGTH = 300
+MAX_EXPRESSION_NODES = 200
+
+# Funciones permitidas (vectorizadas)
+ALLOWED_FUNCTIONS = {
+    name: getattr(np, name) for name in (
+        "sin", "cos", "tan", "arcsin", "arccos", "arctan", "sinh", "cosh", "tanh",
+        "exp", "log", "log10", "sqrt", "abs", "sign", "floor", "ceil", "mod",
+        "minimum", "maximum", "clip", "where",
+    )
+}
+ALLOWED_CONSTANTS = {"pi": np.pi, "e": np.e, "tau": 2 * np.pi}
+VARIABLES = ("t", "fm")
+
+_OPERATORS = (ast.Add, ast.Sub, ast.Mult, ast.Div, ast.Pow, ast.Mod, ast.FloorDiv,
+              ast.USub, ast.UAdd, ast.Lt, ast.LtE, ast.Gt, ast.GtE)
+_NODES = (ast.Expression, ast.BinOp, ast.UnaryOp, ast.Compare, ast.Call, ast.Name,
+          ast.Constant, ast.Load) + _OPERATORS
+
+# Sondeo de validación: dos períodos con fm = 1 y fm = 3
+_PROBE_SAMPLES = 2048
+_PROBE_FM = (1.0, 3.0)
+
+
+class _FloatConstants(ast.NodeTransformer):
+    """Convierte las constantes enteras en float: 9**9**9 no se evalúa como entero de Python."""
+
+    def visit_Constant(self, node):
+        return ast.copy_location(ast.Constant(float(node.value)), node)
+
+
+def _validate(tree: ast.Expression):
+    """
+    Rechaza cualquier nodo fuera de la gramática permitida.
+
+    Raises:
+        ValueError: con un mensaje para el usuario
+    """
+    nodes = list(ast.walk(tree))
+    if len(nodes) > MAX_EXPRESSION_NODES:
+        raise ValueError(f"La expresión es demasiado larga (máximo {MAX_EXPRESSION_NODES} nodos)")
+    for node in nodes:
+        if not isinstance(node, _NODES):
+            raise ValueError(f"Construcción no permitida: {type(node).__name__}")
+        if isinstance(node, ast.Constant) and (
+                isinstance(node.value, bool) or not isinstance(node.value, (int, float))):
+            raise ValueError(f"Constante no permitida: {node.value!r}")
+        if isinstance(node, ast.Name) and node.id not in VARIABLES and node.id not in ALLOWED_CONSTANTS \
+                and node.id not in ALLOWED_FUNCTIONS:
+            raise ValueError(f"Nombre desconocido: {node.id}")
+        if isinstance(node, ast.Call):
+            if not isinstance(node.func, ast.Name) or node.func.id not in ALLOWED_FUNCTIONS:
+                raise ValueError("Solo se pueden llamar las funciones permitidas")
+            if node.keywords:
+                raise ValueError("Las funciones no admiten argumentos con nombre")
+    # Una función solo puede aparecer como la función de una llamada
+    called = {id(node.func) for node in nodes if isinstance(node, ast.Call)}
+    for node in nodes:
+        if isinstance(node, ast.Name) and node.id in ALLOWED_FUNCTIONS and id(node) not in called:
+            raise ValueError(f"{node.id} es una función: use {node.id}(...)")
+
+
+@lru_cache(maxsize=64)
+def canonical_expression(text: str) -> str:
+    """
+    Forma canónica de una expresión: validada y sin espacios.
+
+    En esta gramática los espacios nunca cambian el significado, así que
+    "sin(2 * pi*fm*t)" y "sin(2*pi*fm*t)" comparten nombre y caché. Cacheada
+    por texto: las reejecuciones con la misma expresión no vuelven a
+    analizarla (los errores no se cachean).
+
+    Args:
+        text: Expresión escrita por el usuario
+
+    Returns:
+        Texto canónico
+
+    Raises:
+        ValueError: si la expresión no es válida
+    """
+    _parse(text)
+    return "".join(text.split())
+
+
+def _parse(text: str) -> ast.Expression:
+    text = text.strip()
+    if not text:
+        raise ValueError("La expresión está vacía")
+    if len(text) > MAX_EXPRESSION_LENGTH:
+        raise ValueError(f"La expresión es demasiado larga (máximo {MAX_EXPRESSION_LENGTH} caracteres)")
+    try:
+        tree = ast.parse(text, mode="eval")
+    except SyntaxError as exc:
+        raise ValueError(f"Sintaxis inválida: {exc.msg}") from None
+    _validate(tree)
+    return tree
+
+
+@lru_cache(maxsize=64)
+def compile_expression(text: str) -> Callable[[np.ndarray, float], np.ndarray]:
+    """
+    Compila una expresión en un generador vectorizado m(t, fm), normalizado a ±1.
+
+    Se cachea por texto: una reejecución con la misma expresión no vuelve a
+    analizarla ni a compilarla. Cada evaluación se normaliza con el máximo
+    absoluto de las muestras que produce, así que Δf = kf·Am vale para
+    cualquier fm y cualquier duración.
+
+    Args:
+        text: Expresión en t y fm
+
+    Returns:
+        Función generator(t, fm) con el atributo periodic (True si la
+        expresión se repite cada 1/fm en el sondeo; generate_message lo
+        confirma con el fm real antes de replicar un período)
+
+    Raises:
+        ValueError: si la expresión no es válida o no da valores finitos
+    """
+    tree = ast.fix_missing_locations(_FloatConstants().visit(_parse(text)))
+    code = compile(tree, "<mensaje>", "eval")
+    namespace = {"__builtins__": {}, **ALLOWED_FUNCTIONS, **ALLOWED_CONSTANTS}
+
+    def evaluate(t: np.ndarray, fm: float) -> np.ndarray:
+        with np.errstate(all="ignore"):
+            value = eval(code, namespace, {"t": t, "fm": fm})  # noqa: S307 - árbol validado
+        out = np.empty(np.shape(t))
+        out[...] = value  # Las expresiones constantes se difunden a la forma de t
+        return out
+
+    # Sondeo: valores finitos, amplitud no nula y periodicidad en 1/fm
+    peak = 0.0
+    periodic = True  # Condición necesaria: con otro fm puede no repetirse (p. ej. sin(2*pi*3000*t))
+    for fm in _PROBE_FM:
+        t = np.arange(2 * _PROBE_SAMPLES) / (_PROBE_SAMPLES * fm)
+        try:
+            probe = evaluate(t, fm)
+        except (ArithmeticError, TypeError, ValueError) as exc:
+            raise ValueError(f"No se puede evaluar la expresión: {exc}") from None
+        if not np.all(np.isfinite(probe)):
+            raise ValueError("La expresión produce valores no finitos (inf o nan)")
+        peak = max(peak, float(np.max(np.abs(probe))))
+        periodic = periodic and np.allclose(probe[:_PROBE_SAMPLES], probe[_PROBE_SAMPLES:], atol=1e-9)
+    if peak == 0:
+        raise ValueError("La expresión es idénticamente nula")
+
+    def generator(t: np.ndarray, fm: float) -> np.ndarray:
+        out = evaluate(t, fm)
+        scale = np.max(np.abs(out), initial=0.0)
+        if scale > 0:
+            out /= scale
+        return out
+
+    generator.periodic = periodic
+    generator.expression = text
+    return generator
@@ -0,0 +1,306 @@
+"""
+Planificación de longitudes para la FFT.
+"""
+import inspect
+import os
+from dataclasses import dataclass
+from functools import lru_cache
+
+import numpy as np
+
+try:  # Backend opcional multihilo
+    import scipy.fft as _scipy_fft
+except ImportError:  # pragma: no cover - depende del entorno
+    _scipy_fft = None
+
+FFT_BACKEND = "scipy" if _scipy_fft is not None else "numpy"
+# Hilos por transformada con SciPy; el pool de cómputo lo reparte entre sus procesos
+FFT_WORKERS = max(1, int(os.environ.get("DEMO_FM_FFT_WORKERS", 0)) or os.cpu_count() or 1)
+
+
+def set_fft_workers(workers: int):
+    """
+    Fija los hilos por transformada del backend SciPy en este proceso.
+
+    Los procesos del pool de cómputo lo llaman al iniciar para no multiplicar
+    hilos: N procesos × N hilos por FFT saturan la máquina.
+
+    Args:
+        workers: Hilos por transformada (al menos 1)
+    """
+    global FFT_WORKERS
+    FFT_WORKERS = max(1, int(workers))
+
+# NumPy ≥ 2.0 acepta out= en numpy.fft: las transformadas escriben en búferes reutilizables
+_NUMPY_FFT_OUT = "out" in inspect.signature(np.fft.fft).parameters
+
+
+@dataclass
+class FFTPlan:
+    """Longitud elegida para la FFT y su costo estimado."""
+    n_requested: int
+    n: int
+    mode: str  # "exacto", "relleno", "recorte"
+    cost_requested: float
+    cost: float
+    backend: str
+
+    @property
+    def speedup(self) -> float:
+        """Aceleración estimada respecto a la longitud solicitada."""
+        return self.cost_requested / self.cost if self.cost > 0 else 1.0
+
+
+def next_fast_len(n: int) -> int:
+    """
+    Devuelve el menor entero ≥ n cuyos únicos factores primos son 2, 3 y 5.
+
+    Las FFT de longitud 5-smooth son las más rápidas en NumPy/pocketfft;
+    una longitud con un factor primo grande puede ser varias veces más lenta.
+
+    Args:
+        n: Longitud mínima requerida
+
+    Returns:
+        Longitud 5-smooth más cercana por arriba
+    """
+    if n <= 1:
+        return 1
+
+    best = 2 ** (n - 1).bit_length()  # Potencia de 2 siempre es candidata
+    p5 = 1
+    while p5 < best:
+        p35 = p5
+        while p35 < best:
+            # Completar con la menor potencia de 2 que alcance n
+            quotient = -(-n // p35)  # ceil(n / p35)
+            candidate = p35 * 2 ** (quotient - 1).bit_length()
+            if candidate < best:
+                best = candidate
+            p35 *= 3
+        p5 *= 5
+
+    return best
+
+
+def prev_fast_len(n: int) -> int:
+    """
+    Devuelve el mayor entero ≤ n cuyos únicos factores primos son 2, 3 y 5.
+
+    Args:
+        n: Longitud máxima permitida
+
+    Returns:
+        Longitud 5-smooth más cercana por abajo
+    """
+    if n <= 1:
+        return 1
+
+    best = 1
+    p5 = 1
+    while p5 <= n:
+        p35 = p5
+        while p35 <= n:
+            # Completar con la mayor potencia de 2 que no supere n
+            candidate = p35 * 2 ** ((n // p35).bit_length() - 1)
+            if candidate > best:
+                best = candidate
+            p35 *= 3
+        p5 *= 5
+
+    return best
+
+
+# Penalización de pocketfft para factores primos sin código especializado (> 5)
+_LARGE_FACTOR_PENALTY = 1.1
+# Sobrecosto que pocketfft atribuye a Bluestein al decidir el algoritmo
+_BLUESTEIN_FUDGE = 1.5
+
+
+def _factor_cost(n: int) -> float:
+    """Costo de las pasadas por factor de pocketfft (su cost_guess): n·Σ factores."""
+    total = 0.0
+    m = n
+    while m % 2 == 0:
+        total += 2
+        m //= 2
+    x = 3
+    while x * x <= m:
+        while m % x == 0:
+            total += x if x <= 5 else _LARGE_FACTOR_PENALTY * x
+            m //= x
+        x += 2
+    if m > 1:
+        total += m if m <= 5 else _LARGE_FACTOR_PENALTY * m
+    return total * n
+
+
+def _good_size(n: int) -> int:
+    """Menor entero ≥ n con factores 2, 3, 5, 7 y 11 (good_size de pocketfft)."""
+    while True:
+        m = n
+        for p in (2, 3, 5, 7, 11):
+            while m % p == 0:
+                m //= p
+        if m == 1:
+            return n
+        n += 1
+
+
+def _largest_prime_factor(n: int) -> int:
+    largest, p = 1, 2
+    while p * p <= n:
+        while n % p == 0:
+            largest, n = p, n // p
+        p += 1
+    return max(largest, n)
+
+
+def estimate_fft_cost(n: int) -> float:
+    """
+    Estima el costo relativo de una FFT de longitud n como lo hace pocketfft.
+
+    pocketfft (el backend de NumPy y de SciPy) transforma directamente con
+    pasadas por factor primo: 2, 3, 4, 5, 7 y 11 tienen código propio y los
+    demás primos usan una pasada genérica de costo proporcional al factor.
+    Solo recurre a Bluestein (dos FFT de longitud good_size(2n − 1)) cuando
+    su costo estimado, con el mismo sobrecosto que usa pocketfft, es menor.
+
+    Args:
+        n: Longitud de la FFT
+
+    Returns:
+        Costo estimado (adimensional, unidades del cost_guess de pocketfft)
+    """
+    if n <= 1:
+        return 1.0
+    direct = _factor_cost(n)
+    if n < 50 or _largest_prime_factor(n) ** 2 <= n:
+        return direct
+    bluestein = _BLUESTEIN_FUDGE * 2 * _factor_cost(_good_size(2 * n - 1))
+    return min(direct, bluestein)
+
+
+def plan_fft_length(n: int, mode: str = "cercano") -> FFTPlan:
+    """
+    Elige una longitud rápida para la FFT rellenando o recortando.
+
+    Args:
+        n: Longitud solicitada (p. ej. int(Fs·dur))
+        mode: "relleno" (≥ n), "recorte" (≤ n) o "cercano" (el más próximo)
+
+    Returns:
+        FFTPlan con la longitud elegida y los costos estimados
+    """
+    n = max(1, int(n))
+    up = next_fast_len(n)
+    down = prev_fast_len(n)
+
+    if mode == "relleno":
+        chosen = up
+    elif mode == "recorte":
+        chosen = down
+    else:
+        chosen = up if (up - n) <= (n - down) else down
+
+    if chosen == n:
+        label = "exacto"
+    elif chosen > n:
+        label = "relleno"
+    else:
+        label = "recorte"
+
+    return FFTPlan(
+        n_requested=n,
+        n=chosen,
+        mode=label,
+        cost_requested=estimate_fft_cost(n),
+        cost=estimate_fft_cost(chosen),
+        backend=FFT_BACKEND,
+    )
+
+
+def _readonly(array: np.ndarray) -> np.ndarray:
+    """Marca un arreglo cacheado como solo lectura."""
+    array.flags.writeable = False
+    return array
+
+
+@lru_cache(maxsize=16)
+def spectrum_frequencies(n: int, Fs: float) -> np.ndarray:
+    """
+    Frecuencias no negativas de una FFT de longitud n (cacheadas por n y Fs).
+
+    Coinciden con fftfreq(n, 1/Fs)[fftfreq >= 0], es decir, los primeros
+    ceil(n/2) bins de rfft.
+
+    Args:
+        n: Longitud de la FFT
+        Fs: Frecuencia de muestreo (Hz)
+
+    Returns:
+        Vector de frecuencias (Hz), solo lectura
+    """
+    return _readonly(np.fft.rfftfreq(n, 1 / Fs)[:(n + 1) // 2])
+
+
+@lru_cache(maxsize=16)
+def analytic_multiplier(n: int) -> np.ndarray:
+    """
+    Máscara 2·(fftfreq(n) > 0) usada para construir la señal analítica.
+
+    Args:
+        n: Longitud de la FFT
+
+    Returns:
+        Vector con 2 en frecuencias positivas y 0 en el resto, solo lectura
+    """
+    return _readonly(2.0 * (np.fft.fftfreq(n) > 0))
+
+
+def _into(result: np.ndarray, out) -> np.ndarray:
+    """Copia result en out si el backend no escribió directamente allí."""
+    if out is None or result is out:
+        return result
+    out[...] = result
+    return out
+
+
+def fft(x: np.ndarray, axis: int = -1, out: np.ndarray = None) -> np.ndarray:
+    """
+    FFT con el backend disponible (multihilo si SciPy está instalado).
+
+    out: destino opcional (complejo); con NumPy ≥ 2 se escribe sin copia intermedia.
+    """
+    if _scipy_fft is not None:
+        return _into(_scipy_fft.fft(x, axis=axis, workers=FFT_WORKERS), out)
+    if _NUMPY_FFT_OUT:
+        return np.fft.fft(x, axis=axis, out=out)
+    return _into(np.fft.fft(x, axis=axis), out)
+
+
+def ifft(x: np.ndarray, axis: int = -1, out: np.ndarray = None) -> np.ndarray:
+    """
+    IFFT con el backend disponible (multihilo si SciPy está instalado).
+
+    out: destino opcional (complejo); puede ser el mismo x para transformar en su lugar.
+    """
+    if _scipy_fft is not None:
+        result = _scipy_fft.ifft(x, axis=axis, workers=FFT_WORKERS, overwrite_x=out is x)
+        return _into(result, out)
+    if _NUMPY_FFT_OUT:
+        return np.fft.ifft(x, axis=axis, out=out)
+    return _into(np.fft.ifft(x, axis=axis), out)
+
+
+def rfft(x: np.ndarray, axis: int = -1, out: np.ndarray = None) -> np.ndarray:
+    """
+    FFT real con el backend disponible (multihilo si SciPy está instalado).
+
+    out: destino opcional (complejo, n//2 + 1 elementos a lo largo de axis).
+    """
+    if _scipy_fft is not None:
+        return _into(_scipy_fft.rfft(x, axis=axis, workers=FFT_WORKERS), out)
+    if _NUMPY_FFT_OUT:
+        return np.fft.rfft(x, axis=axis, out=out)
+    return _into(np.fft.rfft(x, axis=axis), out)
@@ -1,32 +1,46 @@
 """
 Cálculos para modulación FM.
 """
+from dataclasses import dataclass
+
 import numpy as np
 
 
+@dataclass(frozen=True)
 class FMParameters:
-    """Parámetros de modulación FM."""
-    
-    def __init__(self, fc: float, fm: float, Am: float, kf: float, H: int):
-        """
-        Args:
-            fc: Frecuencia portadora (Hz)
-            fm: Frecuencia del mensaje (Hz)
-            Am: Amplitud del mensaje (V)
-            kf: Sensibilidad de frecuencia (Hz/V)
-            H: Número de armónicos considerados
-        """
-        self.fc = fc
-        self.fm = fm
-        self.Am = Am
-        self.kf = kf
-        self.H = H
-        
-        # Cálculos derivados
-        self.delta_f = kf * Am  # Desviación de frecuencia (Hz)
-        self.beta = self.delta_f / fm if fm > 0 else np.inf  # Índice de modulación
-        self.fm_max = H * fm  # Frecuencia máxima considerando armónicos
-        self.B_carson = 2.0 * (self.delta_f + self.fm_max)  # Ancho de banda de Carson (Hz)
+    """
+    Parámetros de modulación FM.
+
+    Inmutable y hashable (sirve como clave de caché); las magnitudes
+    derivadas se calculan al consultarlas.
+    """
+    __slots__ = ("fc", "fm", "Am", "kf", "H")
+
+    fc: float  # Frecuencia portadora (Hz)
+    fm: float  # Frecuencia del mensaje (Hz)
+    Am: float  # Amplitud del mensaje (V)
+    kf: float  # Sensibilidad de frecuencia (Hz/V)
+    H: int  # Número de armónicos considerados
+
+    @property
+    def delta_f(self) -> float:
+        """Desviación de frecuencia (Hz)."""
+        return self.kf * self.Am
+
+    @property
+    def beta(self) -> float:
+        """Índice de modulación."""
+        return self.delta_f / self.fm if self.fm > 0 else np.inf
+
+    @property
+    def fm_max(self) -> float:
+        """Frecuencia máxima considerando armónicos (Hz)."""
+        return self.H * self.fm
+
+    @property
+    def B_carson(self) -> float:
+        """Ancho de banda de Carson (Hz)."""
+        return 2.0 * (self.delta_f + self.fm_max)
     
     @property
     def delta_f_khz(self) -> float:
@@ -49,7 +63,125 @@ class FMParameters:
         return self.fm / 1000
 
 
-def calculate_fm_signal(t: np.ndarray, fc: float, kf: float, m: np.ndarray, dt: float) -> tuple:
+class FMParameterArray:
+    """
+    Muchas configuraciones FM a la vez, respaldadas por arreglos NumPy.
+
+    Los argumentos se difunden (broadcasting) entre sí, así que una rejilla
+    de H × β se describe con arreglos de formas (nH, 1) y (1, nβ). Las
+    magnitudes derivadas tienen los mismos nombres que en FMParameters y se
+    calculan en una sola operación vectorizada.
+    """
+    __slots__ = ("fc", "fm", "Am", "kf", "H")
+
+    def __init__(self, fc, fm, Am, kf, H):
+        """
+        Args:
+            fc: Frecuencias portadoras (Hz)
+            fm: Frecuencias del mensaje (Hz)
+            Am: Amplitudes del mensaje (V)
+            kf: Sensibilidades de frecuencia (Hz/V)
+            H: Números de armónicos considerados
+        """
+        fc, fm, Am, kf, H = np.broadcast_arrays(
+            np.asarray(fc, dtype=float), np.asarray(fm, dtype=float),
+            np.asarray(Am, dtype=float), np.asarray(kf, dtype=float), np.asarray(H, dtype=int),
+        )
+        self.fc, self.fm, self.Am, self.kf, self.H = fc, fm, Am, kf, H
+
+    @classmethod
+    def from_beta(cls, fc, fm, beta, H, Am=1.0) -> "FMParameterArray":
+        """
+        Construye las configuraciones a partir de β en lugar de kf (kf = β·fm/Am).
+
+        Args:
+            fc: Frecuencias portadoras (Hz)
+            fm: Frecuencias del mensaje (Hz)
+            beta: Índices de modulación
+            H: Números de armónicos considerados
+            Am: Amplitudes del mensaje (V)
+        """
+        Am = np.asarray(Am, dtype=float)
+        kf = np.divide(np.multiply(beta, fm), Am, out=np.zeros(np.broadcast(beta, fm, Am).shape),
+                       where=Am > 0)
+        return cls(fc, fm, Am, kf, H)
+
+    @property
+    def shape(self) -> tuple:
+        return self.fc.shape
+
+    def __len__(self) -> int:
+        return len(self.fc)
+
+    def __getitem__(self, index) -> FMParameters:
+        """Configuración individual en la posición index."""
+        return FMParameters(float(self.fc[index]), float(self.fm[index]), float(self.Am[index]),
+                            float(self.kf[index]), int(self.H[index]))
+
+    @property
+    def delta_f(self) -> np.ndarray:
+        """Desviaciones de frecuencia (Hz)."""
+        return self.kf * self.Am
+
+    @property
+    def beta(self) -> np.ndarray:
+        """Índices de modulación (inf donde fm = 0)."""
+        return np.divide(self.delta_f, self.fm, out=np.full(self.shape, np.inf), where=self.fm > 0)
+
+    @property
+    def fm_max(self) -> np.ndarray:
+        """Frecuencias máximas considerando armónicos (Hz)."""
+        return self.H * self.fm
+
+    @property
+    def B_carson(self) -> np.ndarray:
+        """Anchos de banda de Carson (Hz)."""
+        return 2.0 * (self.delta_f + self.fm_max)
+
+
+def carson_table(fm: float, betas, harmonics) -> np.ndarray:
+    """
+    Ancho de banda de Carson para cada combinación de H y β.
+
+    Args:
+        fm: Frecuencia del mensaje (Hz)
+        betas: Índices de modulación (columnas)
+        harmonics: Números de armónicos H (filas)
+
+    Returns:
+        Arreglo (len(harmonics), len(betas)) con B_carson en Hz
+    """
+    grid = FMParameterArray.from_beta(
+        0.0, fm, np.asarray(betas, dtype=float)[np.newaxis, :],
+        np.asarray(harmonics)[:, np.newaxis],
+    )
+    return grid.B_carson
+
+
+def integrate_phase(m: np.ndarray, kf: float, dt: float, out: np.ndarray = None) -> np.ndarray:
+    """
+    Fase de modulación 2πkf·∫m(τ)dτ, sin el término de la portadora.
+
+    Suma acumulada a lo largo del último eje (acepta lotes). Es la parte
+    común de calculate_fm_signal y de los moduladores en banda base.
+
+    Args:
+        m: Señal moduladora, o lote de mensajes (una fila por señal)
+        kf: Sensibilidad de frecuencia (Hz/V)
+        dt: Paso de tiempo (1/Fs)
+        out: Arreglo destino opcional (misma forma que m)
+
+    Returns:
+        Fase (rad)
+    """
+    phi = np.cumsum(m, axis=-1, out=out)
+    phi *= 2 * np.pi * kf
+    phi *= dt
+    return phi
+
+
+def calculate_fm_signal(t: np.ndarray, fc: float, kf: float, m: np.ndarray, dt: float,
+                        out: tuple = None, phase0: float = 0.0) -> tuple:
     """
     Calcula la señal FM y la frecuencia instantánea.
     
@@ -57,8 +189,12 @@ def calculate_fm_signal(t: np.ndarray, fc: float, kf: float, m: np.ndarray, dt:
         t: Vector de tiempo
         fc: Frecuencia portadora (Hz)
         kf: Sensibilidad de frecuencia (Hz/V)
-        m: Señal moduladora
+        m: Señal moduladora, o lote de mensajes (una fila por señal; fc puede
+            ser entonces una columna con una portadora por fila)
         dt: Paso de tiempo (1/Fs)
+        out: Tupla opcional (s, fi, phi) de arreglos destino; las entradas
+            None se asignan. Evita los temporales de longitud N.
+        phase0: Fase inicial (rad); permite continuar la fase entre bloques
     
     Returns:
         tuple: (s, fi, phi)
@@ -66,31 +202,45 @@ def calculate_fm_signal(t: np.ndarray, fc: float, kf: float, m: np.ndarray, dt:
             - fi: Frecuencia instantánea
             - phi: Fase instantánea
     """
-    # Fase FM: φ(t) = 2πfc·t + 2πkf·∫m(τ)dτ
-    phi = 2 * np.pi * fc * t + 2 * np.pi * kf * np.cumsum(m) * dt
-    s = np.cos(phi)
+    s, fi, phi = out if out is not None else (None, None, None)
+    shape = np.broadcast(t, m, fc).shape
+    s = np.empty(shape) if s is None else s
+    fi = np.empty(shape) if fi is None else fi
+    phi = np.empty(shape) if phi is None else phi
+
+    # Fase FM: φ(t) = 2πfc·t + 2πkf·∫m(τ)dτ (s sirve de auxiliar antes del coseno)
+    integrate_phase(m, kf, dt, out=phi)
+    np.multiply(t, 2 * np.pi * fc, out=s)
+    phi += s
+    if phase0:
+        phi += phase0
+    np.cos(phi, out=s)
     
     # Frecuencia instantánea: fi(t) = fc + kf·m(t)
-    fi = fc + kf * m
+    np.multiply(m, kf, out=fi)
+    fi += fc
     
     return s, fi, phi
 
 
-def calculate_carrier(t: np.ndarray, fc: float) -> np.ndarray:
+def calculate_carrier(t: np.ndarray, fc: float, out: np.ndarray = None) -> np.ndarray:
     """
     Genera la señal portadora.
     
     Args:
         t: Vector de tiempo
         fc: Frecuencia portadora (Hz)
+        out: Arreglo destino opcional
     
     Returns:
         Señal portadora c(t) = cos(2π·fc·t)
     """
-    return np.cos(2 * np.pi * fc * t)
+    out = np.multiply(t, 2 * np.pi * fc, out=out)
+    return np.cos(out, out=out)
 
 
-def calculate_am_signal(t: np.ndarray, fc: float, m_norm: np.ndarray, modulation_index: float = 0.8) -> np.ndarray:
+def calculate_am_signal(t: np.ndarray, fc: float, m_norm: np.ndarray, modulation_index: float = 0.8,
+                        out: np.ndarray = None, carrier: np.ndarray = None) -> np.ndarray:
     """
     Genera una señal AM para comparación.
     
@@ -99,8 +249,14 @@ def calculate_am_signal(t: np.ndarray, fc: float, m_norm: np.ndarray, modulation
         fc: Frecuencia portadora (Hz)
         m_norm: Señal moduladora normalizada (±1)
         modulation_index: Índice de modulación AM (default 0.8)
+        out: Arreglo destino opcional
+        carrier: Búfer auxiliar opcional para la portadora
     
     Returns:
         Señal AM s(t) = (1 + μ·m(t))·cos(2π·fc·t)
     """
-    return (1 + modulation_index * m_norm) * np.cos(2 * np.pi * fc * t)
+    carrier = calculate_carrier(t, fc, out=carrier)
+    out = np.multiply(m_norm, modulation_index, out=out)
+    out += 1
+    out *= carrier
+    return out
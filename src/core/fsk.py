@@ -0,0 +1,393 @@
+"""
+Modulación digital FSK/GFSK en banda base y tasa de error de bit.
+
+Cada símbolo a_k ∈ {±1, ±3, …} desvía la frecuencia a_k·h·Rb/2 (h: índice
+de modulación, Rb: tasa de símbolos; h = 0,5 es MSK). En GFSK el pulso
+rectangular de un símbolo pasa antes por un filtro gaussiano de ancho de
+banda BT·Rb y se extiende sobre unos pocos símbolos: la frecuencia dentro
+del símbolo k depende solo de sus vecinos. Por eso se precalcula, como en
+la ROM de un modulador GMSK, una tabla con la trayectoria de un símbolo
+para cada combinación de vecinos (M^L filas × muestras por símbolo), y la
+trayectoria completa es una indexación de la tabla con el número de patrón
+de cada símbolo, sin bucles por bit. La fase sale de integrate_phase, la
+misma integración que usa calculate_fm_signal.
+
+El receptor es el discriminador de core.demodulation con un filtro de
+predetección (media móvil) delante e integración por símbolo y decisión
+detrás. simulate_ber procesa todos los Eb/N0 a la vez como filas de un
+lote, por bloques de memoria acotada.
+
+El tiempo está normalizado a la tasa de símbolos (Rb = 1, Fs = muestras
+por símbolo).
+
+Uso desde la línea de comandos (desde src/):
+    python -m core.fsk [--bits 2e6] [--ebn0 0:14:2] [--bt 0.5] [--h 0.5] [--levels 2]
+"""
+import argparse
+import math
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Optional
+
+import numpy as np
+
+from .demodulation import demodulate_fm_iq
+from .fm_calculator import integrate_phase
+
+# Niveles (símbolos distintos) admitidos
+FSK_LEVELS = (2, 4)
+# Producto ancho de banda-tiempo del filtro gaussiano (Bluetooth: 0,5; GSM: 0,3)
+DEFAULT_BT = 0.5
+# Índice de modulación h = 2·Δf/Rb
+DEFAULT_MODULATION_INDEX = 0.5
+DEFAULT_SAMPLES_PER_SYMBOL = 8
+# Con menos muestras por símbolo el tramo central de 2/M del detector queda vacío
+MIN_SAMPLES_PER_SYMBOL = 4
+# El pulso gaussiano se trunca donde cae por debajo de esta fracción de su pico
+PULSE_TAIL = 1e-3
+MAX_PULSE_SPAN = 7
+# Ventana del filtro de predetección en binario (símbolos; se divide por M − 1)
+PREDETECTION_SYMBOLS = 0.75
+# Memoria máxima de un bloque de la simulación de BER
+BER_CHUNK_BYTES = 64 * 1024 * 1024
+# Muestras por símbolo de la tabla del mensaje GFSK de la app
+MESSAGE_TABLE_SAMPLES = 64
+# Símbolos evaluados para estimar sus armónicos (core.waveforms)
+MESSAGE_HARMONIC_SYMBOLS = 64
+
+_erf = np.vectorize(math.erf, otypes=[float])
+
+
+def _gaussian_pulse(t: np.ndarray, bt: float) -> np.ndarray:
+    """Pulso rectangular de un símbolo filtrado con la gaussiana de ancho BT (t en símbolos)."""
+    k = np.pi * bt * np.sqrt(2 / np.log(2))
+    return 0.5 * (_erf(k * (t + 0.5)) - _erf(k * (t - 0.5)))
+
+
+def pulse_span(bt: Optional[float]) -> int:
+    """
+    Símbolos (impar) que abarca el pulso de frecuencia.
+
+    Args:
+        bt: Producto BT del filtro gaussiano; None para FSK sin filtrar
+
+    Returns:
+        1 para FSK; para GFSK, el menor impar con colas bajo PULSE_TAIL
+    """
+    if bt is None:
+        return 1
+    peak = _gaussian_pulse(np.zeros(1), bt)[0]
+    for span in range(1, MAX_PULSE_SPAN, 2):
+        if _gaussian_pulse(np.array([span / 2]), bt)[0] < PULSE_TAIL * peak:
+            return span
+    return MAX_PULSE_SPAN
+
+
+@lru_cache(maxsize=16)
+def frequency_pulse(bt: Optional[float], sps: int) -> np.ndarray:
+    """
+    Pulso de frecuencia muestreado, con área de un símbolo.
+
+    Args:
+        bt: Producto BT del filtro gaussiano; None para FSK sin filtrar
+        sps: Muestras por símbolo
+
+    Returns:
+        Arreglo de solo lectura de pulse_span(bt)·sps muestras que suman sps
+    """
+    span = pulse_span(bt)
+    if bt is None:
+        pulse = np.ones(sps)
+    else:
+        t = (np.arange(span * sps) + 0.5) / sps - span / 2  # Centros de muestra, en símbolos
+        pulse = _gaussian_pulse(t, bt)
+        pulse *= sps / pulse.sum()  # Fase exacta de π·h·a por símbolo
+    pulse.flags.writeable = False
+    return pulse
+
+
+@lru_cache(maxsize=16)
+def pulse_table(levels: int, bt: Optional[float], sps: int) -> np.ndarray:
+    """
+    Trayectoria de frecuencia de un símbolo para cada patrón de vecinos.
+
+    La fila p corresponde a los L = pulse_span(bt) símbolos centrados en el
+    actual, con p escrito en base M (el dígito más significativo es el
+    símbolo más antiguo). El símbolo con desfase o respecto del actual
+    aporta el tramo (L//2 − o) de su pulso.
+
+    Args:
+        levels: Número de niveles M
+        bt: Producto BT del filtro gaussiano; None para FSK sin filtrar
+        sps: Muestras por símbolo
+
+    Returns:
+        Arreglo de solo lectura (M^L, sps) en unidades de nivel
+    """
+    pulse = frequency_pulse(bt, sps)
+    span = len(pulse) // sps
+    amplitudes = 2 * np.arange(levels) - (levels - 1)
+    digits = np.indices((levels,) * span).reshape(span, -1).T
+    table = amplitudes[digits] @ pulse.reshape(span, sps)[::-1]
+    table.flags.writeable = False
+    return table
+
+
+def frequency_trajectory(symbols: np.ndarray, levels: int = 2, bt: Optional[float] = DEFAULT_BT,
+                         sps: int = DEFAULT_SAMPLES_PER_SYMBOL) -> np.ndarray:
+    """
+    Frecuencia instantánea normalizada de una secuencia de símbolos.
+
+    Args:
+        symbols: Índices de símbolo 0..M−1 (la última dimensión es el tiempo;
+            acepta lotes). Los extremos se extienden repitiendo el primero y
+            el último símbolo.
+        levels: Número de niveles M
+        bt: Producto BT del filtro gaussiano; None para FSK sin filtrar
+        sps: Muestras por símbolo
+
+    Returns:
+        Trayectoria en unidades de nivel, sps muestras por símbolo
+    """
+    symbols = np.asarray(symbols)
+    table = pulse_table(levels, bt, sps)
+    span = pulse_span(bt)
+    n = symbols.shape[-1]
+    padded = np.pad(symbols, [(0, 0)] * (symbols.ndim - 1) + [(span // 2, span // 2)], mode="edge")
+
+    # Número de patrón por Horner: el bucle recorre la ventana (≤ 7), no los bits
+    pattern = np.zeros(symbols.shape, dtype=np.intp)
+    for j in range(span):
+        pattern *= levels
+        pattern += padded[..., j:j + n]
+    return table[pattern].reshape(symbols.shape[:-1] + (n * sps,))
+
+
+def modulate_fsk(symbols: np.ndarray, levels: int = 2, h: float = DEFAULT_MODULATION_INDEX,
+                 bt: Optional[float] = DEFAULT_BT, sps: int = DEFAULT_SAMPLES_PER_SYMBOL) -> np.ndarray:
+    """
+    Señal FSK/GFSK compleja en banda base.
+
+    Args:
+        symbols: Índices de símbolo 0..M−1 (acepta lotes)
+        levels: Número de niveles M
+        h: Índice de modulación
+        bt: Producto BT del filtro gaussiano; None para FSK sin filtrar
+        sps: Muestras por símbolo
+
+    Returns:
+        exp(jφ) con amplitud 1, sps muestras por símbolo
+    """
+    trajectory = frequency_trajectory(symbols, levels, bt, sps)
+    # Con Rb = 1: desviación h/2 por unidad de nivel y dt = 1/sps
+    phase = integrate_phase(trajectory, h / 2, 1 / sps, out=trajectory)
+    return np.exp(1j * phase)
+
+
+def detect_fsk(iq: np.ndarray, levels: int = 2, h: float = DEFAULT_MODULATION_INDEX,
+               sps: int = DEFAULT_SAMPLES_PER_SYMBOL) -> np.ndarray:
+    """
+    Detector por discriminador: predetección, frecuencia instantánea y decisión.
+
+    La media móvil (una suma acumulada, sin convolución) limita el ruido
+    que ve el discriminador; se acorta en proporción a la desviación máxima,
+    que crece con M. La frecuencia se integra con np.add.reduceat sobre la
+    fracción central 2/M de cada símbolo (el símbolo completo en binario;
+    con 4 niveles el ojo solo está abierto cerca del centro), compensando el
+    retardo del filtro, y se decide el nivel más cercano. Con 4 niveles y
+    BT < 0,5 la interferencia entre símbolos cierra el ojo.
+
+    Args:
+        iq: Señal compleja en banda base (la última dimensión es el tiempo;
+            acepta lotes, p. ej. una fila por Eb/N0)
+        levels: Número de niveles M
+        h: Índice de modulación
+        sps: Muestras por símbolo
+
+    Returns:
+        Índices de símbolo detectados 0..M−1
+    """
+    n = iq.shape[-1] // sps
+    width = max(1, round(PREDETECTION_SYMBOLS * sps / (levels - 1)))
+    filtered = np.cumsum(iq, axis=-1)
+    filtered[..., width:] -= filtered[..., :-width].copy()
+    deviation = demodulate_fm_iq(filtered, sps)
+
+    # Tramo [inicio, fin) de cada símbolo; media móvil más discriminador: retardo de width/2
+    length = max(1, round(2 * sps / levels))
+    starts = np.arange(n) * sps + width // 2 + (sps - length) // 2
+    stops = np.minimum(starts + length, deviation.shape[-1] - 1)
+    starts = np.minimum(starts, stops - 1)  # Al menos una muestra (último símbolo)
+    bounds = np.empty(2 * n, dtype=np.intp)
+    bounds[0::2], bounds[1::2] = starts, stops
+    estimate = np.add.reduceat(deviation, bounds, axis=-1)[..., 0::2]
+    estimate /= (stops - starts) * (h / 2)
+    estimate += levels - 1
+    estimate /= 2
+    np.rint(estimate, out=estimate)
+    return np.clip(estimate, 0, levels - 1).astype(np.intp)
+
+
+def _gray_tables(levels: int):
+    """Código Gray de cada índice de símbolo y bits en 1 de cada valor."""
+    index = np.arange(levels)
+    gray = index ^ (index >> 1)
+    ones = np.array([bin(value).count("1") for value in index])
+    return gray, ones
+
+
+@dataclass
+class BERCurve:
+    """Tasa de error de bit medida para cada Eb/N0."""
+    ebn0_db: np.ndarray
+    errors: np.ndarray  # Bits errados por punto
+    bits: int  # Bits simulados por punto
+    seconds: float
+
+    @property
+    def ber(self) -> np.ndarray:
+        """Tasa de error de bit por punto."""
+        return self.errors / self.bits
+
+
+def simulate_ber(ebn0_db, bits: int = 1_000_000, levels: int = 2, h: float = DEFAULT_MODULATION_INDEX,
+                 bt: Optional[float] = DEFAULT_BT, sps: int = DEFAULT_SAMPLES_PER_SYMBOL,
+                 seed: Optional[int] = None, chunk_bytes: int = BER_CHUNK_BYTES) -> BERCurve:
+    """
+    BER frente a Eb/N0 con canal AWGN, todos los puntos en un solo lote.
+
+    Cada bloque de símbolos se modula una vez y se genera una sola
+    realización de ruido (complex64), escalada para cada Eb/N0 (números
+    aleatorios comunes: cada punto sigue siendo insesgado, la curva sale
+    monótona y el ruido cuesta lo mismo para cualquier número de puntos).
+    El detector procesa el lote completo, una fila por punto. Los bits se
+    asignan a los símbolos en código Gray y los errores se cuentan por bit.
+
+    Args:
+        ebn0_db: Eb/N0 de cada punto (dB)
+        bits: Bits a simular por punto (se redondea a símbolos enteros)
+        levels: Número de niveles M (2 o 4)
+        h: Índice de modulación
+        bt: Producto BT del filtro gaussiano; None para FSK sin filtrar
+        sps: Muestras por símbolo
+        seed: Semilla del generador
+        chunk_bytes: Memoria máxima por bloque
+
+    Returns:
+        BERCurve con los errores por punto
+
+    Raises:
+        ValueError: si el número de niveles no está en FSK_LEVELS o hay menos
+            de MIN_SAMPLES_PER_SYMBOL muestras por símbolo
+    """
+    if levels not in FSK_LEVELS:
+        raise ValueError(f"Niveles no soportados: {levels} (use {FSK_LEVELS})")
+    if sps < MIN_SAMPLES_PER_SYMBOL:
+        raise ValueError(f"Se necesitan al menos {MIN_SAMPLES_PER_SYMBOL} muestras por símbolo (sps = {sps})")
+    ebn0_db = np.atleast_1d(np.asarray(ebn0_db, dtype=float))
+    bits_per_symbol = levels.bit_length() - 1
+    total = -(-bits // bits_per_symbol)
+    gray, ones = _gray_tables(levels)
+
+    # Amplitud 1: Es = sps por símbolo (suma de |x|²) y σ² por muestra compleja = Es/(Es/N0)
+    sigma = np.sqrt(sps / (bits_per_symbol * 10 ** (ebn0_db / 10)) / 2).astype(np.float32)[:, None]
+    # Ruido, señal filtrada y frecuencia por muestra y por punto (~40 bytes)
+    chunk = max(1, chunk_bytes // (len(ebn0_db) * sps * 40))
+    rng = np.random.default_rng(seed)
+    errors = np.zeros(len(ebn0_db), dtype=np.int64)
+
+    start_time = time.perf_counter()
+    for start in range(0, total, chunk):
+        count = min(chunk, total - start)
+        sent = rng.integers(0, levels, count)
+        clean = modulate_fsk(sent, levels, h, bt, sps).astype(np.complex64)
+        noise = rng.standard_normal(2 * count * sps, dtype=np.float32).view(np.complex64)
+        received = sigma * noise
+        received += clean
+        detected = detect_fsk(received, levels, h, sps)
+        errors += ones[gray[sent] ^ gray[detected]].sum(axis=-1)
+    return BERCurve(ebn0_db, errors, total * bits_per_symbol, time.perf_counter() - start_time)
+
+
+def _message_symbols(k: np.ndarray) -> np.ndarray:
+    """Bit pseudoaleatorio fijo de cada índice de símbolo (mezcla tipo splitmix64, sin estado)."""
+    x = k.astype(np.uint64) * np.uint64(0x9E3779B97F4A7C15)
+    x ^= x >> np.uint64(31)
+    x *= np.uint64(0xBF58476D1CE4E5B9)
+    x ^= x >> np.uint64(29)
+    return (x >> np.uint64(63)).astype(np.intp)
+
+
+def gfsk_message(t: np.ndarray, fm: float) -> np.ndarray:
+    """
+    Mensaje GFSK normalizado a ±1: bits pseudoaleatorios fijos a fm bits/s.
+
+    Los bits dependen solo del índice de símbolo floor(t·fm), así que
+    cualquier tramo de t (bloques, otro proceso) da el mismo mensaje. Cada
+    muestra se lee de pulse_table con MESSAGE_TABLE_SAMPLES puntos por
+    símbolo. Con el pipeline FM, β = Δf/fm equivale a h = 2β.
+    """
+    position = np.multiply(t, fm)
+    k = np.floor(position)
+    column = ((position - k) * MESSAGE_TABLE_SAMPLES).astype(np.intp)
+    np.clip(column, 0, MESSAGE_TABLE_SAMPLES - 1, out=column)
+
+    k = k.astype(np.int64)
+    span = pulse_span(DEFAULT_BT)
+    pattern = np.zeros(k.shape, dtype=np.intp)
+    for offset in range(-(span // 2), span // 2 + 1):
+        pattern *= 2
+        pattern += _message_symbols(k + offset)
+    return pulse_table(2, DEFAULT_BT, MESSAGE_TABLE_SAMPLES)[pattern, column]
+
+
+# No es periódico en 1/fm: generate_message lo evalúa completo y los
+# armónicos se estiman sobre muchos símbolos
+gfsk_message.periodic = False
+gfsk_message.harmonic_periods = MESSAGE_HARMONIC_SYMBOLS
+
+
+def _coherent_bound(ebn0_db: np.ndarray) -> np.ndarray:
+    """BER de MSK/BPSK coherente, Q(√(2·Eb/N0)): cota inferior de referencia."""
+    return np.array([0.5 * math.erfc(math.sqrt(10 ** (value / 10))) for value in ebn0_db])
+
+
+def _parse_range(text: str) -> np.ndarray:
+    """"inicio:fin:paso" (fin incluido) o una lista separada por comas."""
+    if ":" in text:
+        start, stop, step = (float(part) for part in text.split(":"))
+        return np.arange(start, stop + step / 2, step)
+    return np.array([float(part) for part in text.split(",")])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Curva de BER de FSK/GFSK con canal AWGN.")
+    parser.add_argument("--bits", type=float, default=2e6, help="Bits por punto")
+    parser.add_argument("--ebn0", default="0:14:2", help="Eb/N0 en dB: inicio:fin:paso o lista")
+    parser.add_argument("--levels", type=int, choices=FSK_LEVELS, default=2, help="Niveles M")
+    parser.add_argument("--h", type=float, default=DEFAULT_MODULATION_INDEX, help="Índice de modulación")
+    parser.add_argument("--bt", type=float, default=DEFAULT_BT, help="BT del filtro gaussiano (0: FSK)")
+    parser.add_argument("--sps", type=int, default=DEFAULT_SAMPLES_PER_SYMBOL, help=f"Muestras por símbolo (mínimo {MIN_SAMPLES_PER_SYMBOL})")
+    parser.add_argument("--seed", type=int, default=None, help="Semilla")
+    args = parser.parse_args(argv)
+    if args.sps < MIN_SAMPLES_PER_SYMBOL:
+        parser.error(f"--sps debe ser al menos {MIN_SAMPLES_PER_SYMBOL}")
+
+    bt = args.bt if args.bt > 0 else None
+    curve = simulate_ber(_parse_range(args.ebn0), int(args.bits), args.levels, args.h, bt, args.sps, args.seed)
+    label = f"GFSK BT = {bt:g}" if bt is not None else "FSK"
+    print(f"{args.levels}-{label}, h = {args.h:g}, {args.sps} muestras/símbolo, "
+          f"{curve.bits:,} bits por punto")
+    bound = _coherent_bound(curve.ebn0_db)
+    for ebn0, errors, ber, reference in zip(curve.ebn0_db, curve.errors, curve.ber, bound):
+        line = f"  Eb/N0 {ebn0:5.1f} dB: {errors:>9,} errores, BER {ber:.3e}"
+        if args.levels == 2:
+            line += f" (coherente {reference:.1e})"
+        print(line)
+    rate = curve.bits * len(curve.ebn0_db) / curve.seconds if curve.seconds > 0 else float("inf")
+    print(f"{curve.seconds:.2f} s, {rate / 1e6:.1f} Mbit/s simulados")
+
+
+if __name__ == "__main__":
+    main()
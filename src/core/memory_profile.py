@@ -0,0 +1,207 @@
+"""
+Medición de memoria por etapa con tracemalloc.
+
+Para cada etapa registra el pico de memoria asignada y lo que queda retenido
+al terminar. Además señala los arreglos NumPy temporales más grandes: al
+retornar cada función observada se inspeccionan sus variables locales, que
+en ese instante siguen vivas (t, m, phi, s, fi...).
+
+El modo de memoria se activa con DEMO_FM_MEMORY=1. tracemalloc mide todo el
+proceso, así que los números solo son fiables con una sesión a la vez.
+
+Uso desde la línea de comandos (desde src/):
+    python -m core.memory_profile [--fs 20] [--dur 20] [--waveform Cuadrada] [--json]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Iterable, List, Optional
+
+import numpy as np
+
+from .workspace import current_workspace
+
+CORE_DIR = str(Path(__file__).resolve().parent)
+
+
+def memory_mode_enabled() -> bool:
+    """True si el modo de memoria está activo (DEMO_FM_MEMORY=1)."""
+    return os.environ.get("DEMO_FM_MEMORY", "0") == "1"
+
+
+@dataclass
+class ArrayRecord:
+    """Arreglo local observado al retornar una función."""
+    function: str
+    name: str
+    shape: tuple
+    dtype: str
+    nbytes: int
+
+
+@dataclass
+class StageMemory:
+    """Memoria de una etapa (bytes relativos al inicio de la etapa)."""
+    name: str
+    depth: int
+    peak_bytes: int
+    retained_bytes: int
+    seconds: float
+    largest_arrays: List[ArrayRecord]
+
+
+class MemoryProfiler:
+    """Registra pico, memoria retenida y temporales más grandes por etapa."""
+
+    def __init__(self, watched_dirs: Optional[Iterable[str]] = None, top: int = 5):
+        """
+        Args:
+            watched_dirs: Directorios cuyas funciones se inspeccionan al retornar
+                (por defecto, core)
+            top: Número de temporales a conservar por etapa
+        """
+        self.watched = tuple(str(d) for d in (watched_dirs or (CORE_DIR,)))
+        self.top = top
+        self.stages: List[StageMemory] = []
+        self._stack = []
+        self._previous_profile = None
+
+    def _fold_peak(self):
+        """Acumula el pico actual en todas las etapas abiertas."""
+        _, peak = tracemalloc.get_traced_memory()
+        for frame in self._stack:
+            frame["peak"] = max(frame["peak"], peak)
+
+    def _on_event(self, frame, event, arg):
+        if event != "return" or not frame.f_code.co_filename.startswith(self.watched):
+            return
+        function = frame.f_code.co_name
+        workspace = current_workspace()
+        for name, value in frame.f_locals.items():
+            # Solo arreglos con memoria propia (las vistas no asignan) y que no
+            # sean búferes del workspace, que persisten entre ejecuciones
+            if (isinstance(value, np.ndarray) and value.base is None
+                    and not (workspace is not None and workspace.owns(value))):
+                record = ArrayRecord(function, name, value.shape, value.dtype.str, value.nbytes)
+                for open_stage in self._stack:
+                    key = (function, name)
+                    known = open_stage["arrays"].get(key)
+                    if known is None or known.nbytes < record.nbytes:
+                        open_stage["arrays"][key] = record
+
+    @contextmanager
+    def stage(self, name: str):
+        """
+        Mide el bloque como una etapa. Las etapas pueden anidarse.
+
+        Args:
+            name: Nombre de la etapa en el reporte
+        """
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+        self._fold_peak()
+        if hasattr(tracemalloc, "reset_peak"):  # Python 3.9+; antes, el pico es acumulado
+            tracemalloc.reset_peak()
+        current, _ = tracemalloc.get_traced_memory()
+        frame = {"start": current, "peak": current, "arrays": {}}
+        self._stack.append(frame)
+        if len(self._stack) == 1:
+            self._previous_profile = sys.getprofile()
+            sys.setprofile(self._on_event)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - start
+            self._fold_peak()
+            current, _ = tracemalloc.get_traced_memory()
+            self._stack.pop()
+            if not self._stack:
+                sys.setprofile(self._previous_profile)
+            largest = sorted(frame["arrays"].values(), key=lambda r: r.nbytes, reverse=True)
+            self.stages.append(StageMemory(
+                name=name,
+                depth=len(self._stack),
+                peak_bytes=frame["peak"] - frame["start"],
+                retained_bytes=current - frame["start"],
+                seconds=seconds,
+                largest_arrays=largest[:self.top],
+            ))
+
+    def largest_arrays(self, top: Optional[int] = None) -> List[ArrayRecord]:
+        """Temporales más grandes de todas las etapas, sin repetir."""
+        unique = {}
+        for stage in self.stages:
+            for record in stage.largest_arrays:
+                unique[(record.function, record.name, record.nbytes)] = record
+        ranked = sorted(unique.values(), key=lambda r: r.nbytes, reverse=True)
+        return ranked[:top or self.top]
+
+    def to_dict(self) -> dict:
+        """Reporte serializable a JSON."""
+        return {
+            "stages": [asdict(stage) for stage in self.stages],
+            "largest_arrays": [asdict(record) for record in self.largest_arrays()],
+        }
+
+    def write_json(self, path):
+        """Guarda el reporte en un archivo JSON."""
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, indent=2, ensure_ascii=False)
+
+
+def format_report(profiler: MemoryProfiler) -> str:
+    """Resumen legible del reporte de memoria."""
+    lines = [f"{'etapa':<40} {'pico [MB]':>10} {'retenido [MB]':>14} {'tiempo [ms]':>12}"]
+    for stage in profiler.stages:
+        label = "  " * stage.depth + stage.name
+        lines.append(f"{label:<40} {stage.peak_bytes / 2**20:>10.2f} "
+                     f"{stage.retained_bytes / 2**20:>14.2f} {stage.seconds * 1000:>12.1f}")
+    lines.append("")
+    lines.append("Temporales más grandes:")
+    for record in profiler.largest_arrays():
+        label = f"{record.function}.{record.name}"
+        lines.append(f"  {label:<38} {record.nbytes / 2**20:>8.2f} MB "
+                     f"{record.dtype} {record.shape}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    from .pipeline import compute_demodulation, compute_signals, config_from_params
+    from .warmup import DEFAULT_PARAMS, DEFAULT_SNR_DB
+
+    parser = argparse.ArgumentParser(description="Memoria por etapa del pipeline de la demo FM.")
+    parser.add_argument("--fs", type=float, help="Fs manual en MHz (por defecto, Fs automática)")
+    parser.add_argument("--dur", type=float, default=DEFAULT_PARAMS["dur"] * 1000,
+                        help="Duración de la señal (ms)")
+    parser.add_argument("--waveform", default=DEFAULT_PARAMS["waveform"], help="Forma de onda")
+    parser.add_argument("--snr", type=float, default=DEFAULT_SNR_DB, help="SNR (dB)")
+    parser.add_argument("--json", action="store_true", help="Imprimir el reporte en JSON")
+    args = parser.parse_args(argv)
+
+    params = dict(DEFAULT_PARAMS, waveform=args.waveform, dur=args.dur / 1000)
+    if args.fs is not None:
+        params.update(auto_fs=False, Fs=args.fs * 1e6)
+    config, _, _ = config_from_params(params)
+
+    profiler = MemoryProfiler()
+    with profiler.stage("señales"):
+        compute_signals(config)
+    with profiler.stage("demodulación"):
+        compute_demodulation(config, args.snr)
+
+    if args.json:
+        print(json.dumps(profiler.to_dict(), indent=2, ensure_ascii=False))
+    else:
+        print(f"N = {config.N:,} muestras, Fs = {config.Fs / 1e6:.3f} MHz")
+        print(format_report(profiler))
+
+
+if __name__ == "__main__":
+    main()
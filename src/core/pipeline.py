@@ -0,0 +1,282 @@
+"""
+Pipeline completo de cómputo: modulación, espectro, demodulación y MSE.
+
+Las etapas son funciones puras de una configuración inmutable, de modo que
+pueden ejecutarse en otro proceso, deduplicarse o cachearse por su clave.
+"""
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+import numpy as np
+
+from .adc import ADCConfig, clipped_fraction, quantize
+from .waveforms import estimate_harmonics, generate_message
+from .fm_calculator import (
+    FMParameterArray, FMParameters, calculate_fm_signal, calculate_carrier, calculate_am_signal,
+)
+from .spectrum import compute_spectrum
+from .bandwidth import occupied_bandwidth
+from .demodulation import demodulate_fm, demodulate_am
+from .sweep import SWEEP_PARAMETERS, sweep_spectra
+from .validations import SamplingSuggestion, suggest_sampling_rate
+from .fft_plan import FFTPlan, plan_fft_length
+from .workspace import Workspace, borrow_workspace, time_vector
+
+
+@dataclass(frozen=True)
+class PipelineConfig:
+    """Parámetros que determinan por completo las señales calculadas."""
+    waveform: str
+    Fs: float
+    N: int
+    fc: float
+    fm: float
+    Am: float
+    kf: float
+    H: int
+    show_carrier: bool = True
+
+    @property
+    def dur(self) -> float:
+        """Duración de la señal (s)."""
+        return self.N / self.Fs
+
+    @property
+    def params(self) -> FMParameters:
+        """Parámetros FM derivados."""
+        return FMParameters(self.fc, self.fm, self.Am, self.kf, self.H)
+
+
+def config_from_params(params: dict) -> Tuple[PipelineConfig, FFTPlan, Optional[SamplingSuggestion]]:
+    """
+    Construye la configuración del pipeline a partir de los parámetros del sidebar.
+
+    Aplica la Fs automática y la estimación de H (si están activas) y ajusta
+    N a una longitud eficiente para la FFT.
+
+    Args:
+        params: dict devuelto por render_sidebar()
+
+    Returns:
+        tuple: (config, fft_plan, sampling)
+            - config: PipelineConfig resultante
+            - fft_plan: Plan de longitud de la FFT
+            - sampling: Sugerencia de Fs usada, o None si Fs es manual
+    """
+    Fs = params["Fs"]
+    sampling = None
+    if params.get("auto_fs"):
+        sampling = suggest_sampling_rate(params["fc"], params["kf"] * params["Am"],
+                                         params["fm"], params["dur"])
+        Fs = sampling.Fs
+        N = sampling.N
+    else:
+        N = int(Fs * params["dur"])
+
+    # Longitud eficiente para la FFT (relleno o recorte de unas pocas muestras)
+    fft_plan = plan_fft_length(N)
+
+    config = PipelineConfig(
+        waveform=params["waveform"],
+        Fs=Fs,
+        N=fft_plan.n,
+        fc=params["fc"],
+        fm=params["fm"],
+        Am=params["Am"],
+        kf=params["kf"],
+        H=estimate_harmonics(params["waveform"]) if params.get("auto_h") else params["H"],
+        show_carrier=params["show_carrier"],
+    )
+    return config, fft_plan, sampling
+
+
+def compute_signals(config: PipelineConfig) -> dict:
+    """
+    Genera mensaje, señal FM, portadora y espectros.
+
+    Args:
+        config: Configuración del pipeline
+
+    Returns:
+        dict con t, m, m_norm, s, fi, c (si show_carrier), freqs_m, mag_m_db,
+        freqs_s, mag_s_db y B_occupied (ancho de banda ocupado medido, Hz)
+    """
+    with borrow_workspace(config.N) as workspace:
+        return _compute_signals(config, workspace)
+
+
+def _compute_signals(config: PipelineConfig, workspace: Workspace) -> dict:
+    # Solo los intermedios van al workspace: los resultados se comparten y cachean
+    params = config.params
+    t = time_vector(config.N, config.Fs)
+    dt = 1.0 / config.Fs
+
+    m = generate_message(t, config.fm, config.waveform, config.Am)
+    m_norm = m / config.Am if config.Am > 0 else m  # Normalizada para demodulación
+
+    s, fi, _ = calculate_fm_signal(t, config.fc, config.kf, m, dt,
+                                   out=(None, None, workspace.buffer("phi")))
+
+    # Rangos apropiados: ~20 armónicos para m(t), fc ± 2·B para s(t)
+    freqs_m, _, mag_m_db = compute_spectrum(m, config.Fs, max_freq=params.fm * 20,
+                                            workspace=workspace)
+    freqs_s, _, mag_s_db = compute_spectrum(s, config.Fs, max_freq=params.fc + params.B_carson * 2,
+                                            workspace=workspace)
+
+    result = {
+        "t": t,
+        "m": m,
+        "m_norm": m_norm,
+        "s": s,
+        "fi": fi,
+        "freqs_m": freqs_m,
+        "mag_m_db": mag_m_db,
+        "freqs_s": freqs_s,
+        "mag_s_db": mag_s_db,
+        "B_occupied": float(occupied_bandwidth(s, config.Fs, workspace=workspace)),
+    }
+    if config.show_carrier:
+        result["c"] = calculate_carrier(t, config.fc)
+    return result
+
+
+def compute_demodulation(config: PipelineConfig, snr_db: float, adc: Optional[ADCConfig] = None) -> dict:
+    """
+    Agrega ruido AWGN a FM y AM, opcionalmente las digitaliza, demodula ambas y mide el MSE.
+
+    Args:
+        config: Configuración del pipeline
+        snr_db: Relación señal-ruido (dB)
+        adc: Conversor A/D tras el ruido; None, sin cuantizar
+
+    Returns:
+        dict con m_fm_recovered, m_am_recovered, mse_fm y mse_am, y además:
+            - sin A/D: s_fm_noisy y s_am_noisy (float64)
+            - con A/D: s_fm_adc y s_am_adc (códigos enteros), adc_lsb,
+              sqnr_fm_db, sqnr_am_db, clipped_fm, clipped_am y el espectro
+              de la FM cuantizada (freqs_adc, mag_fm_adc_db)
+    """
+    with borrow_workspace(config.N) as workspace:
+        return _compute_demodulation(config, snr_db, workspace, adc)
+
+
+def _compute_demodulation(config: PipelineConfig, snr_db: float, workspace: Workspace,
+                          adc: Optional[ADCConfig] = None) -> dict:
+    # Todo lo que no se devuelve vive en el workspace
+    t = time_vector(config.N, config.Fs)
+    m = generate_message(t, config.fm, config.waveform, config.Am, out=workspace.buffer("m"))
+    m_norm = np.divide(m, config.Am, out=workspace.buffer("m_norm")) if config.Am > 0 else m
+    s, _, _ = calculate_fm_signal(
+        t, config.fc, config.kf, m, 1.0 / config.Fs,
+        out=(workspace.buffer("s"), workspace.buffer("fi"), workspace.buffer("phi")),
+    )
+
+    # Generar señal AM para comparación
+    s_am = calculate_am_signal(t, config.fc, m_norm, out=workspace.buffer("s_am"),
+                               carrier=workspace.buffer("portadora"))
+
+    # Agregar ruido AWGN a ambas señales
+    squared = workspace.buffer("cuadrado")
+    noise_power_fm = np.mean(np.square(s, out=squared)) / (10 ** (snr_db / 10))
+    noise_power_am = np.mean(np.square(s_am, out=squared)) / (10 ** (snr_db / 10))
+
+    # Generador local con semilla fija: reproducible y sin estado global
+    rng = np.random.RandomState(42)
+    s_fm_noisy = rng.normal(0, np.sqrt(noise_power_fm), len(s))
+    s_fm_noisy += s
+    s_am_noisy = rng.normal(0, np.sqrt(noise_power_am), len(s_am))
+    s_am_noisy += s_am
+
+    result = {}
+    if adc is None:
+        result["s_fm_noisy"] = s_fm_noisy
+        result["s_am_noisy"] = s_am_noisy
+    else:
+        # A/D tras el ruido: solo los códigos enteros salen de la etapa
+        received = {}
+        for key, noisy in (("fm", s_fm_noisy), ("am", s_am_noisy)):
+            codes = quantize(noisy, adc, workspace)
+            error = np.multiply(codes, adc.lsb, out=squared)
+            error -= noisy
+            noise = np.mean(np.square(error, out=error))
+            power = np.mean(np.square(noisy, out=squared))
+            result[f"s_{key}_adc"] = received[key] = codes
+            result[f"sqnr_{key}_db"] = float(10 * np.log10(power / noise)) if noise > 0 else float("inf")
+            result[f"clipped_{key}"] = clipped_fraction(noisy, adc)
+        result["adc_lsb"] = adc.lsb
+        params = config.params
+        result["freqs_adc"], _, result["mag_fm_adc_db"] = compute_spectrum(
+            received["fm"], config.Fs, max_freq=params.fc + params.B_carson * 2,
+            workspace=workspace, scale=adc.lsb,
+        )
+        s_fm_noisy, s_am_noisy = received["fm"], received["am"]
+
+    # Demodular ambas señales (los códigos enteros se convierten sobre la marcha)
+    m_fm_recovered = demodulate_fm(s_fm_noisy, config.fc, config.Fs, workspace=workspace)
+    m_am_recovered = demodulate_am(s_am_noisy, config.fc, config.Fs, workspace=workspace)
+
+    def mse(recovered):
+        error = np.subtract(m_norm, recovered, out=squared)
+        return float(np.mean(np.square(error, out=error)))
+
+    result.update({
+        "m_fm_recovered": m_fm_recovered,
+        "m_am_recovered": m_am_recovered,
+        "mse_fm": mse(m_fm_recovered),
+        "mse_am": mse(m_am_recovered),
+    })
+    return result
+
+
+def compute_sweep(config: PipelineConfig, parameter: str, start: float, stop: float, frames: int) -> dict:
+    """
+    Espectros de la señal FM a lo largo de un barrido de β, kf o Am, en un solo lote.
+
+    El resto de la configuración queda fija. Todos los cuadros comparten la
+    ventana de frecuencias fc ± B_carson máximo.
+
+    Args:
+        config: Configuración del pipeline (valores fijos)
+        parameter: Parámetro barrido ("beta", "kf" o "Am")
+        start: Primer valor
+        stop: Último valor
+        frames: Número de cuadros (valores equiespaciados)
+
+    Returns:
+        dict con values, beta, B_carson y B_occupied por cuadro, freqs y
+        mag_db (cuadros × puntos, float32); sin cuadros si la ventana queda
+        vacía o invertida (fc ≥ Fs/2)
+
+    Raises:
+        ValueError: si el parámetro no es barrible
+    """
+    if parameter not in SWEEP_PARAMETERS:
+        raise ValueError(f"Parámetro de barrido desconocido: {parameter}")
+    values = np.linspace(start, stop, frames)
+    if parameter == "beta":
+        sweep = FMParameterArray.from_beta(config.fc, config.fm, values, config.H, config.Am)
+    else:
+        fixed = {"fc": config.fc, "fm": config.fm, "Am": config.Am, "kf": config.kf, "H": config.H}
+        fixed[parameter] = values
+        sweep = FMParameterArray(**fixed)
+
+    t = time_vector(config.N, config.Fs)
+    m = generate_message(t, config.fm, config.waveform)  # Normalizado: Δf_k escala la integral
+    B_max = float(np.max(sweep.B_carson))
+    band = (max(0.0, config.fc - B_max), min(config.fc + B_max, config.Fs / 2))
+    result = sweep_spectra(t, m, config.fc, sweep.delta_f, config.Fs, band=band)
+    if band[0] >= band[1] or len(result["mag_db"]) == 0:
+        # Ventana vacía: la pestaña avisa en lugar de dibujar
+        empty = np.empty(0)
+        result.update({"values": empty, "beta": empty, "B_carson": empty, "B_occupied": empty})
+        return result
+    result.update({"values": values, "beta": sweep.beta, "B_carson": sweep.B_carson})
+    return result
+
+
+# Etapas que pueden enviarse al pool de cómputo por nombre
+STAGES = {
+    "signals": compute_signals,
+    "demodulation": compute_demodulation,
+    "sweep": compute_sweep,
+}
@@ -0,0 +1,354 @@
+"""
+Modo continuo: la cadena FM como un flujo productor → modulador → demodulador.
+
+Tres hilos conectados por anillos acotados de bloques preasignados:
+
+    productor (mensaje) ─► anillo ─► modulador + ruido ─► anillo ─► demodulador ─► sumidero
+
+Cada etapa escribe directamente en la ranura del anillo siguiente, así que
+en estado estacionario no se crean arreglos de longitud de bloque nuevos
+salvo en los filtros del demodulador. El sumidero (archivo o nulo) ocupa el
+lugar del hardware.
+
+Con --paced el productor se comporta como un conversor A/D: entrega un
+bloque cada block/Fs segundos y, si el anillo está lleno, lo descarta
+(desborde). Sin --paced entrega tan rápido como la cadena consume y la
+medida es el máximo sostenido.
+
+Uso desde la línea de comandos (desde src/):
+    python -m core.realtime [--fs 2.4] [--fc 0.5] [--dur 5] [--paced] [--sink salida.f32]
+"""
+import argparse
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+import numpy as np
+
+from .audio import BASEBAND_MARGIN
+from .streaming import FMBlockDemodulator, FMBlockModulator
+from .waveforms import BUILTIN_WAVEFORMS, estimate_harmonics, generate_message
+
+# Muestras por bloque y ranuras por anillo
+BLOCK_SAMPLES = 16_384
+RING_SLOTS = 8
+
+
+class BlockRing:
+    """
+    Anillo acotado de bloques preasignados entre un escritor y un lector.
+
+    El escritor pide una ranura libre, la llena en su lugar y la confirma; el
+    lector toma la ranura más antigua, la usa y la libera. Solo se bloquea el
+    acceso a los índices: los datos se copian fuera del candado.
+    """
+
+    def __init__(self, slots: int, block: int, dtype=np.float64):
+        """
+        Args:
+            slots: Número de ranuras
+            block: Muestras por ranura
+            dtype: Tipo de dato
+        """
+        self.buffers = np.zeros((slots, block), dtype=dtype)
+        self.timestamps = np.zeros(slots)  # Instante de captura de cada bloque
+        self._head = 0  # Próxima ranura a escribir
+        self._tail = 0  # Próxima ranura a leer
+        self._count = 0
+        self._closed = False
+        self._started = False
+        self._cond = threading.Condition()
+        self.underruns = 0  # Veces que el lector encontró el anillo vacío
+        self.overruns = 0  # Veces que el escritor lo encontró lleno
+        self._occupancy_sum = 0
+        self._occupancy_samples = 0
+        self.max_occupancy = 0
+
+    @property
+    def slots(self) -> int:
+        return len(self.buffers)
+
+    def acquire_write(self, wait: bool = True) -> Optional[np.ndarray]:
+        """
+        Ranura libre para escribir.
+
+        Args:
+            wait: Esperar si el anillo está lleno; si es False, devolver None
+
+        Returns:
+            Vista de la ranura, o None si está lleno y no se espera
+        """
+        with self._cond:
+            if self._count == self.slots:
+                self.overruns += 1
+                if not wait:
+                    return None
+                self._cond.wait_for(lambda: self._count < self.slots)
+            return self.buffers[self._head]
+
+    def commit_write(self, timestamp: float):
+        """Publica la ranura escrita con su instante de captura."""
+        with self._cond:
+            self.timestamps[self._head] = timestamp
+            self._head = (self._head + 1) % self.slots
+            self._count += 1
+            self._started = True
+            self._occupancy_sum += self._count
+            self._occupancy_samples += 1
+            self.max_occupancy = max(self.max_occupancy, self._count)
+            self._cond.notify_all()
+
+    def acquire_read(self) -> Optional[tuple]:
+        """
+        Ranura más antigua, esperando si hace falta.
+
+        Returns:
+            (bloque, instante de captura), o None si el anillo se cerró y está vacío
+        """
+        with self._cond:
+            if self._count == 0 and self._started and not self._closed:
+                self.underruns += 1
+            self._cond.wait_for(lambda: self._count > 0 or self._closed)
+            if self._count == 0:
+                return None
+            return self.buffers[self._tail], self.timestamps[self._tail]
+
+    def release_read(self):
+        """Devuelve la ranura leída al escritor."""
+        with self._cond:
+            self._tail = (self._tail + 1) % self.slots
+            self._count -= 1
+            self._cond.notify_all()
+
+    def close(self):
+        """Fin del flujo: el lector termina cuando vacía el anillo."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    @property
+    def mean_occupancy(self) -> float:
+        """Ocupación media al publicar, en ranuras."""
+        return self._occupancy_sum / self._occupancy_samples if self._occupancy_samples else 0.0
+
+
+class NullSink:
+    """Sumidero que descarta las muestras."""
+
+    def write(self, x: np.ndarray):
+        pass
+
+    def close(self):
+        pass
+
+
+class FileSink:
+    """Sumidero que escribe float32 little-endian crudo (leer con np.fromfile(ruta, "<f4"))."""
+
+    def __init__(self, path: str):
+        self._file = open(path, "wb")
+
+    def write(self, x: np.ndarray):
+        self._file.write(x.astype("<f4").tobytes())
+
+    def close(self):
+        self._file.close()
+
+
+@dataclass
+class RingReport:
+    """Estado de un anillo al final de la corrida."""
+    name: str
+    slots: int
+    mean_occupancy: float
+    max_occupancy: int
+    underruns: int
+    overruns: int
+
+
+@dataclass
+class RealtimeReport:
+    """Resultado de una corrida continua."""
+    Fs: float
+    block: int
+    paced: bool
+    samples: int  # Muestras de RF que atravesaron la cadena
+    dropped_blocks: int  # Bloques descartados por el productor (solo con paced)
+    seconds: float
+    latencies_ms: np.ndarray = field(repr=False)  # Captura → sumidero, por bloque
+    rings: List[RingReport] = field(default_factory=list)
+    stage_busy_s: dict = field(default_factory=dict)
+
+    @property
+    def samples_per_s(self) -> float:
+        return self.samples / self.seconds if self.seconds > 0 else float("inf")
+
+    @property
+    def realtime_factor(self) -> float:
+        """Tasa sostenida sobre Fs (≥ 1: la cadena da abasto)."""
+        return self.samples_per_s / self.Fs
+
+
+def run_realtime(Fs: float = 2.4e6, fc: float = 500e3, fm: float = 1_000.0, beta: float = 5.0,
+                 waveform: str = "Senoidal", duration: float = 5.0, snr_db: Optional[float] = 30.0,
+                 block: int = BLOCK_SAMPLES, slots: int = RING_SLOTS, paced: bool = False,
+                 sink=None, seed: int = 42) -> RealtimeReport:
+    """
+    Hace correr la cadena continua durante `duration` segundos de señal.
+
+    Args:
+        Fs: Frecuencia de muestreo (Hz)
+        fc: Frecuencia portadora (Hz)
+        fm: Frecuencia del mensaje (Hz)
+        beta: Índice de modulación (Am = 1, kf = β·fm)
+        waveform: Forma de onda del mensaje
+        duration: Segundos de señal a producir
+        snr_db: Relación señal-ruido (dB); None, sin ruido
+        block: Muestras por bloque
+        slots: Ranuras por anillo
+        paced: Productor al ritmo de Fs, descartando bloques si la cadena se atrasa
+        sink: Objeto con write(x) y close(); por defecto NullSink
+        seed: Semilla del ruido
+
+    Returns:
+        RealtimeReport
+    """
+    sink = NullSink() if sink is None else sink
+    kf = beta * fm
+    carson = 2 * (kf + estimate_harmonics(waveform) * fm)
+    # Diezmado antes del discriminador: la banda base debe abarcar el ancho de Carson
+    decimation = max((d for d in range(1, 65) if block % d == 0 and Fs / d >= BASEBAND_MARGIN * carson),
+                     default=1)
+    total_blocks = int(np.ceil(duration * Fs / block))
+
+    messages = BlockRing(slots, block)
+    modulated = BlockRing(slots, block)
+    busy = {"productor": 0.0, "modulador": 0.0, "demodulador": 0.0}
+    latencies = np.zeros(total_blocks)
+    state = {"dropped": 0, "delivered": 0}
+
+    def producer(start: float):
+        ramp = np.arange(block) / Fs
+        t = np.empty(block)
+        period = block / Fs
+        for k in range(total_blocks):
+            capture = start + (k + 1) * period  # Última muestra del bloque
+            if paced:
+                delay = capture - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+            else:
+                capture = None
+            slot = messages.acquire_write(wait=not paced)
+            if slot is None:
+                state["dropped"] += 1
+                continue
+            began = time.perf_counter()
+            np.add(ramp, k * period, out=t)
+            generate_message(t, fm, waveform, out=slot)
+            busy["productor"] += time.perf_counter() - began
+            messages.commit_write(capture if capture is not None else time.perf_counter())
+        messages.close()
+
+    def modulator_stage():
+        modulator = FMBlockModulator(fc, kf, Fs)
+        rng = np.random.default_rng(seed)
+        noise = np.empty(block)
+        noise_std = np.sqrt(0.5 / 10 ** (snr_db / 10)) if snr_db is not None else 0.0
+        while True:
+            item = messages.acquire_read()
+            if item is None:
+                break
+            m, capture = item
+            out = modulated.acquire_write()
+            began = time.perf_counter()
+            modulator.process(m, out=out)
+            messages.release_read()
+            if noise_std:
+                rng.standard_normal(out=noise)
+                noise *= noise_std
+                out += noise
+            busy["modulador"] += time.perf_counter() - began
+            modulated.commit_write(capture)
+        modulated.close()
+
+    def demodulator_stage():
+        demodulator = FMBlockDemodulator(fc, kf, Fs, decimation)
+        while True:
+            item = modulated.acquire_read()
+            if item is None:
+                break
+            s, capture = item
+            began = time.perf_counter()
+            recovered = demodulator.process(s)
+            modulated.release_read()
+            sink.write(recovered)
+            done = time.perf_counter()
+            busy["demodulador"] += done - began
+            latencies[state["delivered"]] = done - capture
+            state["delivered"] += 1
+
+    start = time.perf_counter()
+    threads = [threading.Thread(target=producer, args=(start,), name="fm-productor"),
+               threading.Thread(target=modulator_stage, name="fm-modulador"),
+               threading.Thread(target=demodulator_stage, name="fm-demodulador")]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    seconds = time.perf_counter() - start
+    sink.close()
+
+    rings = [RingReport(name, ring.slots, ring.mean_occupancy, ring.max_occupancy,
+                        ring.underruns, ring.overruns)
+             for name, ring in (("mensaje", messages), ("modulada", modulated))]
+    return RealtimeReport(Fs, block, paced, state["delivered"] * block, state["dropped"], seconds,
+                          latencies[:state["delivered"]] * 1000, rings, busy)
+
+
+def format_report(report: RealtimeReport) -> str:
+    """Resumen legible de una corrida continua."""
+    mode = "al ritmo de Fs" if report.paced else "a máxima velocidad"
+    lines = [
+        f"Fs = {report.Fs / 1e6:.3f} MHz, bloques de {report.block:,} muestras, {mode}",
+        f"  sostenido: {report.samples_per_s / 1e6:.2f} MS/s (×{report.realtime_factor:.2f} tiempo real), "
+        f"{report.samples:,} muestras en {report.seconds:.2f} s",
+    ]
+    if report.paced:
+        lines.append(f"  bloques descartados por desborde: {report.dropped_blocks}")
+    if len(report.latencies_ms):
+        p50, p95, p99 = np.percentile(report.latencies_ms, [50, 95, 99])
+        lines.append(f"  latencia captura → sumidero: p50 {p50:.1f} ms, p95 {p95:.1f} ms, "
+                     f"p99 {p99:.1f} ms, máx. {report.latencies_ms.max():.1f} ms")
+    for ring in report.rings:
+        lines.append(f"  anillo {ring.name:<9} ocupación media {ring.mean_occupancy:.1f}/{ring.slots}, "
+                     f"máx. {ring.max_occupancy}, vacío {ring.underruns}×, lleno {ring.overruns}×")
+    busy = ", ".join(f"{name} {seconds / report.seconds:.0%}" for name, seconds in report.stage_busy_s.items())
+    lines.append(f"  ocupación de las etapas: {busy}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Cadena FM continua con anillos de bloques.")
+    parser.add_argument("--fs", type=float, default=2.4, help="Frecuencia de muestreo (MHz)")
+    parser.add_argument("--fc", type=float, default=0.5, help="Portadora (MHz)")
+    parser.add_argument("--fm", type=float, default=1.0, help="Frecuencia del mensaje (kHz)")
+    parser.add_argument("--beta", type=float, default=5.0, help="Índice de modulación")
+    parser.add_argument("--waveform", default="Senoidal", choices=BUILTIN_WAVEFORMS)
+    parser.add_argument("--dur", type=float, default=5.0, help="Segundos de señal")
+    parser.add_argument("--snr", type=float, default=30.0, help="SNR (dB)")
+    parser.add_argument("--block", type=int, default=BLOCK_SAMPLES, help="Muestras por bloque")
+    parser.add_argument("--slots", type=int, default=RING_SLOTS, help="Ranuras por anillo")
+    parser.add_argument("--paced", action="store_true", help="Productor al ritmo de Fs (como un A/D)")
+    parser.add_argument("--sink", default=None, help="Archivo float32 de salida (por defecto, nulo)")
+    args = parser.parse_args(argv)
+
+    report = run_realtime(args.fs * 1e6, args.fc * 1e6, args.fm * 1e3, args.beta, args.waveform,
+                          args.dur, args.snr, args.block, args.slots, args.paced,
+                          FileSink(args.sink) if args.sink else None)
+    print(format_report(report))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Remuestreo por bloques con filtros polifásicos.
+
+Interpolan o diezman por un factor entero conservando el estado del filtro
+entre bloques, de modo que una señal larga se procesa por trozos con el
+mismo resultado que de una sola vez y con memoria constante. El filtro es el
+prototipo del canalizador FDM (corte en Fs/(2·factor)), salvo que el
+diezmador reciba uno propio.
+"""
+from typing import Optional
+
+import numpy as np
+
+from .fdm import PROTOTYPE_TAPS_PER_BRANCH, prototype_filter
+
+
+class PolyphaseInterpolator:
+    """Eleva la tasa por un factor entero: y tiene factor muestras por muestra de x."""
+
+    def __init__(self, factor: int, taps_per_branch: int = PROTOTYPE_TAPS_PER_BRANCH):
+        """
+        Args:
+            factor: Factor de interpolación L
+            taps_per_branch: Coeficientes por fase del filtro
+        """
+        self.factor = factor
+        # branches[p, k] = L·h[pL + k]: la fase k produce la salida nL + k
+        h = prototype_filter(factor, taps_per_branch) * factor
+        self.branches = h.reshape(taps_per_branch, factor)
+        self._history = np.zeros(taps_per_branch - 1)
+
+    @property
+    def delay(self) -> float:
+        """Retardo de grupo en muestras de salida."""
+        return (self.branches.size - 1) / 2
+
+    def process(self, x: np.ndarray) -> np.ndarray:
+        """
+        Interpola un bloque.
+
+        Args:
+            x: Bloque de entrada (real o complejo)
+
+        Returns:
+            len(x)·factor muestras
+        """
+        P = len(self.branches)
+        extended = np.concatenate([self._history, x])
+        y = np.zeros((len(x), self.factor), dtype=np.result_type(x, self.branches))
+        for p in range(P):
+            # y[n, k] += h[pL + k]·x[n − p]
+            y += extended[P - 1 - p:P - 1 - p + len(x), np.newaxis] * self.branches[p]
+        self._history = extended[len(extended) - (P - 1):]
+        return y.ravel()
+
+
+class PolyphaseDecimator:
+    """Reduce la tasa por un factor entero tras un filtro antialiasing."""
+
+    def __init__(self, factor: int, taps_per_branch: int = PROTOTYPE_TAPS_PER_BRANCH,
+                 h: Optional[np.ndarray] = None):
+        """
+        Args:
+            factor: Factor de diezmado M
+            taps_per_branch: Coeficientes por rama del filtro
+            h: Filtro propio (longitud múltiplo de M); por defecto, el prototipo
+               con corte en Fs/(2M) y taps_per_branch coeficientes por rama
+        """
+        self.factor = factor
+        if h is None:
+            h = prototype_filter(factor, taps_per_branch)
+        self.branches = h.reshape(-1, factor)  # branches[p, r] = h[pM + r]
+        self._history = np.zeros((len(self.branches) - 1) * factor)
+        self._pending = self._history[:0]
+
+    @property
+    def delay(self) -> float:
+        """Retardo de grupo en muestras de entrada."""
+        return (self.branches.size - 1) / 2
+
+    def process(self, x: np.ndarray) -> np.ndarray:
+        """
+        Filtra y diezma un bloque; las muestras sobrantes esperan al siguiente.
+
+        Args:
+            x: Bloque de entrada (real o complejo)
+
+        Returns:
+            (muestras acumuladas) // factor muestras: y[n] = Σ_l h[l]·x[nM + M−1 − l]
+        """
+        M = self.factor
+        P = len(self.branches)
+        data = np.concatenate([self._pending, x])
+        blocks = len(data) // M
+        self._pending = data[blocks * M:]
+
+        # Fila j, columna r = e[jM + M−1 − r], con e = historia + bloque:
+        # el término p de la salida n es la fila n + P−1 − p
+        extended = np.concatenate([self._history, data[:blocks * M]])
+        rows = extended.reshape(-1, M)[:, ::-1]
+        y = np.zeros(blocks, dtype=np.result_type(extended, self.branches))
+        for p in range(P):
+            y += rows[P - 1 - p:P - 1 - p + blocks] @ self.branches[p]
+        self._history = extended[len(extended) - len(self._history):]
+        return y
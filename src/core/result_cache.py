@@ -0,0 +1,213 @@
+"""
+Caché persistente en disco de los resultados del pipeline.
+
+Cada entrada es un directorio con un .npy por arreglo y un meta.json con
+los escalares. La clave es un hash estable de la etapa, sus argumentos y la
+versión del código de core, así que un cambio en el código invalida la
+caché. Las lecturas usan memoria mapeada; las escrituras son atómicas
+(directorio temporal + rename), de modo que varios procesos del servidor
+pueden compartir el mismo directorio.
+"""
+import dataclasses
+import hashlib
+import json
+import os
+import shutil
+import uuid
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+try:  # Bloqueo entre procesos para la evicción (solo POSIX)
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+_META = "meta.json"
+_LOCK = ".lock"
+_TMP_PREFIX = ".tmp-"
+
+
+@lru_cache(maxsize=1)
+def code_version() -> str:
+    """Hash del código fuente de core: cambia al modificar cualquier módulo."""
+    digest = hashlib.sha256()
+    for path in sorted(Path(__file__).parent.glob("*.py")):
+        digest.update(path.name.encode())
+        digest.update(path.read_bytes())
+    return digest.hexdigest()[:16]
+
+
+def _canonical(value):
+    """Convierte argumentos de etapa en una estructura JSON estable."""
+    if dataclasses.is_dataclass(value):
+        return {type(value).__name__: _canonical(dataclasses.asdict(value))}
+    if isinstance(value, dict):
+        return {str(k): _canonical(v) for k, v in sorted(value.items())}
+    if isinstance(value, (list, tuple)):
+        return [_canonical(v) for v in value]
+    if isinstance(value, float):
+        # 20 y 20.0 dan el mismo resultado: el slider entrega enteros, la API y
+        # el precalentamiento flotantes, y deben compartir las entradas
+        if value.is_integer():
+            return int(value)
+        return repr(value)  # Representación exacta e independiente de la plataforma
+    if isinstance(value, np.generic):
+        return _canonical(value.item())
+    return value
+
+
+def cache_key(stage: str, args: tuple) -> str:
+    """
+    Clave estable de una etapa y sus argumentos.
+
+    Args:
+        stage: Nombre de la etapa del pipeline
+        args: Argumentos de la etapa
+
+    Returns:
+        Hash hexadecimal
+    """
+    payload = json.dumps(
+        {"stage": stage, "args": _canonical(args), "code": code_version()},
+        sort_keys=True, ensure_ascii=True,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class ResultCache:
+    """Caché LRU en disco con tamaño máximo."""
+
+    def __init__(self, directory, max_bytes: int = 1 << 30):
+        """
+        Args:
+            directory: Directorio de la caché (se crea si no existe)
+            max_bytes: Tamaño máximo total; al superarlo se eliminan las entradas menos usadas
+        """
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, stage: str, args: tuple) -> Optional[dict]:
+        """
+        Lee una entrada con memoria mapeada.
+
+        Args:
+            stage: Nombre de la etapa
+            args: Argumentos de la etapa
+
+        Returns:
+            dict con arreglos de solo lectura y escalares, o None si no existe
+        """
+        entry = self.directory / cache_key(stage, args)
+        try:
+            with open(entry / _META, encoding="utf-8") as f:
+                meta = json.load(f)
+            result = {name: np.load(entry / f"{name}.npy", mmap_mode="r") for name in meta["arrays"]}
+            os.utime(entry / _META)  # Marca de uso para la evicción LRU
+        except (OSError, ValueError, KeyError):
+            # Ausente, o eliminada por otro proceso mientras se leía
+            self.misses += 1
+            return None
+
+        result.update(meta["scalars"])
+        self.hits += 1
+        return result
+
+    def put(self, stage: str, args: tuple, result: dict):
+        """
+        Guarda una entrada de forma atómica y aplica el límite de tamaño.
+
+        Args:
+            stage: Nombre de la etapa
+            args: Argumentos de la etapa
+            result: dict con arreglos NumPy y escalares
+        """
+        entry = self.directory / cache_key(stage, args)
+        if entry.exists():
+            return
+
+        tmp = self.directory / f"{_TMP_PREFIX}{uuid.uuid4().hex}"
+        tmp.mkdir()
+        try:
+            arrays = []
+            scalars = {}
+            for name, value in result.items():
+                if isinstance(value, np.ndarray):
+                    np.save(tmp / f"{name}.npy", value)
+                    arrays.append(name)
+                else:
+                    scalars[name] = value.item() if isinstance(value, np.generic) else value
+            with open(tmp / _META, "w", encoding="utf-8") as f:
+                json.dump({"stage": stage, "arrays": arrays, "scalars": scalars}, f)
+            os.rename(tmp, entry)
+        except OSError:
+            # Otro proceso escribió la misma entrada primero
+            shutil.rmtree(tmp, ignore_errors=True)
+            return
+
+        self._evict()
+
+    def _evict(self):
+        """Elimina las entradas menos usadas hasta respetar max_bytes."""
+        with open(self.directory / _LOCK, "a") as lock:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                entries = []
+                total = 0
+                for entry in os.scandir(self.directory):
+                    if not entry.is_dir() or entry.name.startswith(_TMP_PREFIX):
+                        continue
+                    try:
+                        size = sum(f.stat().st_size for f in os.scandir(entry.path))
+                        used = os.stat(os.path.join(entry.path, _META)).st_mtime
+                    except OSError:
+                        continue
+                    entries.append((used, size, entry.path))
+                    total += size
+
+                for used, size, path in sorted(entries):
+                    if total <= self.max_bytes:
+                        break
+                    # Renombrar primero: los lectores nunca ven una entrada a medias
+                    trash = self.directory / f"{_TMP_PREFIX}{uuid.uuid4().hex}"
+                    try:
+                        os.rename(path, trash)
+                    except OSError:
+                        continue
+                    shutil.rmtree(trash, ignore_errors=True)
+                    total -= size
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def size_bytes(self) -> int:
+        """Tamaño total actual de la caché en disco."""
+        return sum(
+            f.stat().st_size
+            for entry in os.scandir(self.directory)
+            if entry.is_dir() and not entry.name.startswith(_TMP_PREFIX)
+            for f in os.scandir(entry.path)
+        )
+
+
+def default_cache() -> Optional[ResultCache]:
+    """
+    Caché por defecto según el entorno.
+
+    DEMO_FM_CACHE=0 la desactiva; DEMO_FM_CACHE_DIR fija el directorio
+    (por defecto ~/.cache/demo-fm) y DEMO_FM_CACHE_MAX_MB el tamaño máximo.
+    """
+    if os.environ.get("DEMO_FM_CACHE", "1") == "0":
+        return None
+    directory = os.environ.get("DEMO_FM_CACHE_DIR", Path.home() / ".cache" / "demo-fm")
+    max_mb = int(os.environ.get("DEMO_FM_CACHE_MAX_MB", "1024"))
+    try:
+        return ResultCache(directory, max_bytes=max_mb * 1024 * 1024)
+    except OSError:
+        return None  # Directorio no escribible: funcionar sin caché
@@ -0,0 +1,397 @@
+"""
+API HTTP local sobre el pipeline de core, sin pasar por Streamlit.
+
+Servidor asyncio mínimo (HTTP/1.1, solo GET, con keep-alive) que resuelve
+las etapas en el pool de cómputo compartido: las peticiones idénticas en
+curso se deduplican, los resultados salen de la caché en disco cuando
+existen y el bucle de eventos nunca calcula, así atiende peticiones
+concurrentes mientras los procesos del pool trabajan.
+
+Los parámetros de consulta son las claves de render_sidebar() en unidades
+SI (las omitidas toman el valor por defecto del sidebar; los valores fuera
+de los rangos de sus deslizadores se rechazan con 400):
+
+    GET /v1/signals?waveform=Cuadrada&kf=20000          metadatos en JSON
+    GET /v1/signals?arrays=freqs_s,mag_s_db&fc=2e6      arreglos en binario
+    GET /v1/demodulation?snr=10&arrays=m_fm_recovered   (incluye mse_fm y mse_am)
+    GET /v1/demodulation?adc_bits=8&adc_full_scale=2    con A/D: códigos int8/int16
+    GET /v1/signals?expression=sin(2*pi*fm*t)**3        m(t) definido por expresión
+    GET /v1/metrics                                     latencia por ruta
+    GET /health
+
+Con arrays= el cuerpo son los arreglos pedidos, concatenados, en binario
+little-endian. La cabecera X-Arrays describe cada uno (JSON con name,
+dtype, shape, offset y nbytes); con un solo arreglo también se envían
+X-Array-Dtype y X-Array-Shape. Los escalares van en X-Scalars. Desde
+Python: np.frombuffer(body, dtype, count, offset).reshape(shape).
+
+Uso desde la línea de comandos (desde src/):
+    python -m core.server [--host 127.0.0.1] [--port 8765]
+"""
+import argparse
+import asyncio
+import json
+import time
+from collections import deque
+from dataclasses import asdict
+from typing import Dict, Optional, Tuple
+from urllib.parse import parse_qsl, urlsplit
+
+import numpy as np
+
+from .adc import ADCConfig
+from .pipeline import config_from_params
+from .warmup import DEFAULT_PARAMS, DEFAULT_SNR_DB
+from .waveforms import WAVEFORM_GENERATORS, is_expression, register_expression
+from .workers import ComputePool, get_compute_pool
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+# Latencias recientes que se conservan por ruta para los percentiles
+LATENCY_WINDOW = 1000
+# Límites de la petición (línea inicial y cabeceras)
+MAX_LINE_BYTES = 8192
+MAX_HEADERS = 100
+
+_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+            500: "Internal Server Error"}
+_ROUTES = ("/health", "/v1/metrics", "/v1/signals", "/v1/demodulation")
+_BOOL_PARAMS = {"auto_fs", "auto_h", "show_carrier"}
+_INT_PARAMS = {"H"}
+_ADC_PARAMS = {"adc_bits", "adc_full_scale", "adc_clip"}
+# Rangos de los deslizadores de la app en unidades SI (kf cubre los dos modos
+# del sidebar: directo hasta 1000 kHz/V y por β, de 0,1·fm/Am a 20·fm/Am)
+PARAM_LIMITS = {
+    "Fs": (1e6, 20e6),
+    "dur": (1e-3, 20e-3),
+    "fc": (0.1e6, 5e6),
+    "fm": (100.0, 10e3),
+    "Am": (0.05, 5.0),
+    "kf": (2.0, 4e6),
+    "H": (1, 15),
+    "snr": (0.0, 100.0),
+    "adc_bits": (2, 16),
+    "adc_full_scale": (0.25, 4.0),
+}
+
+
+class RequestError(Exception):
+    """Error atribuible a la petición; se responde con su código HTTP."""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+def parse_params(query: Dict[str, str]) -> Tuple[dict, float, Optional[ADCConfig]]:
+    """
+    Convierte los parámetros de consulta al dict de render_sidebar().
+
+    Args:
+        query: Parámetros de la URL (cadenas)
+
+    Returns:
+        (params, snr_db, adc); adc es None salvo que se pida adc_bits
+
+    Raises:
+        RequestError: con una clave desconocida, un valor inválido o fuera
+            del rango del sidebar, o una forma de onda inexistente
+    """
+    params = dict(DEFAULT_PARAMS)
+    snr_db = float(DEFAULT_SNR_DB)
+    adc = {}
+    for key, value in query.items():
+        if key == "arrays":
+            continue
+        try:
+            if key in PARAM_LIMITS:
+                _check_range(key, float(value))
+            if key == "snr":
+                snr_db = float(value)
+            elif key == "expression":
+                try:
+                    params["waveform"] = register_expression(value)
+                except ValueError as exc:
+                    raise RequestError(400, f"Expresión inválida: {exc}") from None
+            elif key in _ADC_PARAMS:
+                adc[key[len("adc_"):]] = (int(value) if key == "adc_bits" else
+                                          _parse_bool(value) if key == "adc_clip" else float(value))
+            elif key not in params:
+                raise RequestError(400, f"Parámetro desconocido: {key}")
+            elif key in _BOOL_PARAMS:
+                params[key] = _parse_bool(value)
+            elif key in _INT_PARAMS:
+                params[key] = int(value)
+            elif key == "waveform":
+                if value not in WAVEFORM_GENERATORS or is_expression(value):
+                    raise RequestError(400, f"Forma de onda desconocida: {value!r} "
+                                            "(use expression= para m(t))")
+                params[key] = value
+            else:
+                params[key] = float(value)
+        except ValueError:
+            raise RequestError(400, f"Valor inválido para {key}: {value!r}") from None
+    if adc and "bits" not in adc:
+        raise RequestError(400, "Los parámetros adc_* requieren adc_bits")
+    return params, snr_db, ADCConfig(**adc) if adc else None
+
+
+def _check_range(key: str, value: float):
+    # NaN e infinito también quedan fuera: las comparaciones fallan
+    low, high = PARAM_LIMITS[key]
+    if not low <= value <= high:
+        raise RequestError(400, f"{key} debe estar entre {low:g} y {high:g}")
+
+
+def _parse_bool(value: str) -> bool:
+    return value.lower() in ("1", "true", "yes", "on")
+
+
+def _parse_content_length(value: str) -> int:
+    # -1 si la cabecera no es un entero no negativo; 0 si falta
+    if not value:
+        return 0
+    try:
+        length = int(value)
+    except ValueError:
+        return -1
+    return length if length >= 0 else -1
+
+
+def encode_arrays(result: dict, names) -> Tuple[bytes, dict]:
+    """
+    Serializa arreglos de un resultado en binario little-endian.
+
+    Args:
+        result: dict de una etapa del pipeline
+        names: Nombres de los arreglos pedidos
+
+    Returns:
+        (cuerpo, cabeceras)
+
+    Raises:
+        RequestError: si algún nombre no es un arreglo del resultado
+    """
+    layout = []
+    chunks = []
+    offset = 0
+    for name in names:
+        array = result.get(name)
+        if not isinstance(array, np.ndarray):
+            available = ", ".join(k for k, v in result.items() if isinstance(v, np.ndarray))
+            raise RequestError(404, f"Arreglo desconocido: {name} (disponibles: {available})")
+        array = np.ascontiguousarray(array, dtype=array.dtype.newbyteorder("<"))
+        layout.append({"name": name, "dtype": array.dtype.str, "shape": list(array.shape),
+                       "offset": offset, "nbytes": array.nbytes})
+        chunks.append(memoryview(array).cast("B"))
+        offset += array.nbytes
+
+    headers = {"Content-Type": "application/octet-stream", "X-Arrays": json.dumps(layout)}
+    if len(layout) == 1:
+        headers["X-Array-Dtype"] = layout[0]["dtype"]
+        headers["X-Array-Shape"] = ",".join(str(n) for n in layout[0]["shape"])
+    return b"".join(chunks), headers
+
+
+def describe_result(result: dict) -> dict:
+    """Metadatos JSON de un resultado: forma y tipo de cada arreglo y los escalares."""
+    return {
+        "arrays": {k: {"dtype": v.dtype.newbyteorder("<").str, "shape": list(v.shape)}
+                   for k, v in result.items() if isinstance(v, np.ndarray)},
+        "scalars": _scalars(result),
+    }
+
+
+def _scalars(result: dict) -> dict:
+    return {k: v for k, v in result.items() if not isinstance(v, np.ndarray)}
+
+
+class LatencyStats:
+    """Latencias recientes y contadores por ruta."""
+
+    def __init__(self, window: int = LATENCY_WINDOW):
+        self._window = window
+        self._latencies = {}
+        self._counts = {}
+        self._errors = {}
+
+    def record(self, route: str, seconds: float, ok: bool):
+        self._latencies.setdefault(route, deque(maxlen=self._window)).append(seconds)
+        self._counts[route] = self._counts.get(route, 0) + 1
+        if not ok:
+            self._errors[route] = self._errors.get(route, 0) + 1
+
+    def to_dict(self) -> dict:
+        """Por ruta: peticiones, errores y percentiles de latencia (ms) de la ventana."""
+        routes = {}
+        for route, latencies in self._latencies.items():
+            values = np.asarray(latencies) * 1000
+            p50, p95, p99 = np.percentile(values, [50, 95, 99])
+            routes[route] = {
+                "requests": self._counts[route],
+                "errors": self._errors.get(route, 0),
+                "p50_ms": round(float(p50), 3),
+                "p95_ms": round(float(p95), 3),
+                "p99_ms": round(float(p99), 3),
+                "mean_ms": round(float(values.mean()), 3),
+                "max_ms": round(float(values.max()), 3),
+            }
+        return routes
+
+
+class PipelineServer:
+    """Aplicación HTTP: enruta las peticiones y delega el cómputo en el pool."""
+
+    def __init__(self, pool: Optional[ComputePool] = None):
+        """
+        Args:
+            pool: Pool de cómputo (por defecto, el compartido del proceso)
+        """
+        self.pool = get_compute_pool() if pool is None else pool
+        self.stats = LatencyStats()
+        self._started = time.time()
+
+    async def _run_stage(self, stage: str, *args) -> dict:
+        # ComputePool.run bloquea: se espera en un hilo para no detener el bucle
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.pool.run, stage, *args)
+
+    async def handle(self, method: str, target: str) -> Tuple[int, bytes, dict]:
+        """
+        Atiende una petición.
+
+        Args:
+            method: Método HTTP
+            target: Ruta con la consulta
+
+        Returns:
+            (código, cuerpo, cabeceras)
+        """
+        url = urlsplit(target)
+        query = dict(parse_qsl(url.query, keep_blank_values=True))
+        if method != "GET":
+            raise RequestError(405, f"Método no permitido: {method}")
+
+        if url.path == "/health":
+            return self._json({"status": "ok", "uptime_s": round(time.time() - self._started, 1)})
+        if url.path == "/v1/metrics":
+            cache = self.pool.cache
+            return self._json({
+                "routes": self.stats.to_dict(),
+                "pool": {"workers": self.pool.workers, "deduplicated": self.pool.deduplicated},
+                "cache": {"hits": cache.hits, "misses": cache.misses} if cache is not None else None,
+            })
+        if url.path not in _ROUTES:
+            raise RequestError(404, f"Ruta desconocida: {url.path}")
+
+        params, snr_db, adc = parse_params(query)
+        try:
+            config, _, _ = config_from_params(params)
+        except (ValueError, ZeroDivisionError) as exc:
+            raise RequestError(400, f"Parámetros inválidos: {exc}") from None
+        if url.path == "/v1/signals":
+            result = await self._run_stage("signals", config)
+        else:
+            args = (config, snr_db) if adc is None else (config, snr_db, adc)
+            result = await self._run_stage("demodulation", *args)
+
+        names = [name for name in query.get("arrays", "").split(",") if name]
+        if not names:
+            return self._json({"config": asdict(config), "snr_db": snr_db,
+                               "adc": asdict(adc) if adc is not None else None, **describe_result(result)})
+        body, headers = encode_arrays(result, names)
+        headers["X-Scalars"] = json.dumps(_scalars(result))
+        return 200, body, headers
+
+    @staticmethod
+    def _json(payload: dict, status: int = 200) -> Tuple[int, bytes, dict]:
+        body = json.dumps(payload, ensure_ascii=False).encode()
+        return status, body, {"Content-Type": "application/json; charset=utf-8"}
+
+    async def serve_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Atiende las peticiones de una conexión hasta que el cliente la cierra."""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                if len(request_line) > MAX_LINE_BYTES:
+                    break
+                started = time.perf_counter()
+                try:
+                    method, target, version = request_line.decode("latin-1").split()
+                except ValueError:
+                    break
+                headers = {}
+                for _ in range(MAX_HEADERS):
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                # El cuerpo se ignora; con un Content-Length inválido no se sabe
+                # dónde empieza la petición siguiente: se responde 400 y se cierra
+                length = _parse_content_length(headers.get("content-length", ""))
+                if length > 0:
+                    await reader.readexactly(length)
+
+                route = urlsplit(target).path
+                route = route if route in _ROUTES else "otras"  # Acota las métricas
+                try:
+                    if length < 0:
+                        raise RequestError(400, f"Content-Length inválido: {headers['content-length']!r}")
+                    status, body, response_headers = await self.handle(method, target)
+                except RequestError as exc:
+                    status, body, response_headers = self._json({"error": str(exc)}, exc.status)
+                except Exception as exc:  # Un fallo del cómputo no debe tumbar el servidor
+                    status, body, response_headers = self._json({"error": repr(exc)}, 500)
+
+                elapsed = time.perf_counter() - started
+                self.stats.record(route, elapsed, status < 400)
+                keep_alive = (version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+                              and length >= 0)
+                response_headers["Content-Length"] = str(len(body))
+                response_headers["Server-Timing"] = f"total;dur={elapsed * 1000:.2f}"
+                response_headers["Connection"] = "keep-alive" if keep_alive else "close"
+                head = f"HTTP/1.1 {status} {_REASONS.get(status, '')}\r\n" + "".join(
+                    f"{name}: {value}\r\n" for name, value in response_headers.items()) + "\r\n"
+                writer.write(head.encode("latin-1"))
+                writer.write(body)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+
+async def serve(host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, pool: Optional[ComputePool] = None):
+    """
+    Sirve la API hasta que se cancele.
+
+    Args:
+        host: Dirección de escucha (por defecto solo local)
+        port: Puerto
+        pool: Pool de cómputo (por defecto, el compartido del proceso)
+    """
+    app = PipelineServer(pool)
+    server = await asyncio.start_server(app.serve_connection, host, port)
+    print(f"API del pipeline FM en http://{host}:{port} ({app.pool.workers} procesos de cómputo)")
+    async with server:
+        await server.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="API HTTP local sobre el pipeline de core.")
+    parser.add_argument("--host", default=DEFAULT_HOST, help="Dirección de escucha")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="Puerto")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
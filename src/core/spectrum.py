@@ -3,15 +3,25 @@ Análisis espectral de señales.
 """
 import numpy as np
 
+from .adc import as_float
+from .fft_plan import rfft, spectrum_frequencies
 
-def compute_spectrum(signal: np.ndarray, Fs: float, max_freq: float = None):
+
+def compute_spectrum(signal: np.ndarray, Fs: float, max_freq: float = None, workspace=None,
+                     scale: float = None):
     """
     Calcula el espectro de frecuencias (FFT) de una señal.
 
     Args:
-        signal: Señal de entrada
+        signal: Señal de entrada (float o códigos enteros de un A/D)
         Fs: Frecuencia de muestreo (Hz)
         max_freq: Frecuencia máxima a mostrar (Hz). Si es None, muestra todo.
+        workspace: Workspace opcional para la FFT completa (intermedia)
+        scale: Valor de un código entero (V); se aplica a la magnitud ya
+            recortada. Por defecto, 1 para float y 1/(máximo del dtype + 1)
+            para enteros (1/128 en int8, 1/32768 en int16: plena escala = 1
+            solo si el A/D usa todos los bits del dtype). Para un A/D más
+            estrecho que su dtype (p. ej. 12 bits en int16) pase ADCConfig.lsb
 
     Returns:
         tuple: (freqs, magnitude, magnitude_db)
@@ -20,23 +30,23 @@ def compute_spectrum(signal: np.ndarray, Fs: float, max_freq: float = None):
             - magnitude_db: Magnitud en dB
     """
     N = len(signal)
-    # FFT y frecuencias
-    fft_vals = np.fft.fft(signal)
-    fft_freq = np.fft.fftfreq(N, 1/Fs)
+    # Solo frecuencias positivas: para señales reales basta la FFT real
+    freqs = spectrum_frequencies(N, Fs)
+
+    # Limitar a max_freq si se especifica (freqs está ordenado)
+    if max_freq is not None:
+        freqs = freqs[:np.searchsorted(freqs, max_freq, side="right")]
 
-    # Solo frecuencias positivas
-    pos_mask = fft_freq >= 0
-    freqs = fft_freq[pos_mask]
-    magnitude = np.abs(fft_vals[pos_mask]) / N  # Normalizar
+    if scale is None and np.issubdtype(signal.dtype, np.integer):
+        scale = 1.0 / (np.iinfo(signal.dtype).max + 1)
+
+    spectrum = workspace.buffer("rfft", np.complex128, N // 2 + 1) if workspace is not None else None
+    fft_vals = rfft(as_float(signal, workspace), out=spectrum)[:len(freqs)]
+    magnitude = np.abs(fft_vals) / N  # Normalizar
+    if scale is not None:
+        magnitude *= scale  # La FFT es lineal: escalar solo los bins que se devuelven
 
     # Convertir a dB (evitar log(0))
     magnitude_db = 20 * np.log10(magnitude + 1e-12)
 
-    # Limitar a max_freq si se especifica
-    if max_freq is not None:
-        freq_mask = freqs <= max_freq
-        freqs = freqs[freq_mask]
-        magnitude = magnitude[freq_mask]
-        magnitude_db = magnitude_db[freq_mask]
-
     return freqs, magnitude, magnitude_db
@@ -0,0 +1,434 @@
+"""
+FM estéreo: múltiplex (MPX) con piloto de 19 kHz y subportadora L−R.
+
+La banda base estéreo de radiodifusión es
+
+    mpx(t) = 0,45·(L + R) + 0,1·sin(θ) + 0,45·(L − R)·sin(2θ),   θ = 2π·19 kHz·t
+
+(pico ≤ 1 con |L|, |R| ≤ 1): la suma ocupa 0-15 kHz, el piloto 19 kHz y la
+diferencia va en doble banda lateral con portadora suprimida alrededor de
+38 kHz, hasta 53 kHz. El MPX modula la portadora con calculate_fm_signal
+(a través de core.streaming) y, tras demodular, el decodificador recupera
+la fase del piloto, regenera la subportadora y separa los canales.
+
+Todo funciona por bloques con estado: compositor y decodificador comparten
+el oscilador del piloto (fase continua entre bloques), L y R se interpolan
+juntos como una señal compleja L + jR y la suma y la diferencia atraviesan
+el mismo filtro pasabajos diezmador como (L+R) + j(L−R), así que cada
+transformación se hace una sola vez para los dos canales.
+
+Uso desde la línea de comandos (desde src/):
+    python -m core.stereo [entrada.wav] [salida.wav] [--fc 0.25] [--snr 40] [--dur 10]
+"""
+import argparse
+import itertools
+import math
+import os
+import tempfile
+import time
+from dataclasses import dataclass
+from typing import Iterator, Optional
+
+import numpy as np
+
+from .audio import CHUNK_FRAMES, AudioChainPlan, PCMSource, fm_loopback, open_wav, plan_audio_chain, write_wav
+from .resample import PolyphaseDecimator, PolyphaseInterpolator
+from .streaming import TWO_PI
+from .workspace import Workspace, time_vector
+
+PILOT_FREQ = 19e3  # Piloto (Hz); la subportadora L−R está en 2·PILOT_FREQ
+AUDIO_BANDWIDTH = 15e3  # Ancho de banda de cada canal de audio (Hz)
+MPX_BANDWIDTH = 2 * PILOT_FREQ + AUDIO_BANDWIDTH  # Frecuencia máxima del MPX (Hz)
+AUDIO_LEVEL = 0.45  # Amplitud de L+R y de L−R en el MPX
+PILOT_LEVEL = 0.1  # Amplitud del piloto en el MPX
+# Piloto más débil que esto: sin enganche, salida monofónica (L = R = (L+R)/2)
+PILOT_LOCK_LEVEL = PILOT_LEVEL / 2
+# Ventana de la estimación de fase del piloto (s)
+PILOT_WINDOW = 2e-3
+# Tasa del MPX respecto de su frecuencia máxima
+MPX_SAMPLING_MARGIN = 2.5
+# Desviación de la radiodifusión FM (Hz)
+BROADCAST_DEVIATION = 75e3
+# Rechazo del filtro de audio (dB) con la ventana de Kaiser (β = 8)
+LOWPASS_ATTENUATION_DB = 80.0
+
+# Tonos de prueba de la línea de comandos: uno por canal (Hz)
+TEST_TONES = (1e3, 2.5e3)
+
+
+class _PilotOscillator:
+    """Fase θ del piloto de 19 kHz, continua entre bloques."""
+
+    def __init__(self, rate: float):
+        self.rate = rate
+        self._phase = 0.0  # Fase de la próxima muestra, reducida a [0, 2π)
+        self._workspace = None
+
+    def advance(self, n: int) -> np.ndarray:
+        """Fase de las próximas n muestras (búfer reutilizado en la llamada siguiente)."""
+        if self._workspace is None or self._workspace.n != n:
+            self._workspace = Workspace(n)
+        theta = self._workspace.buffer("fase_piloto")
+        np.multiply(time_vector(n, self.rate), TWO_PI * PILOT_FREQ, out=theta)
+        theta += self._phase
+        self._phase = (theta[-1] + TWO_PI * PILOT_FREQ / self.rate) % TWO_PI
+        return theta
+
+
+def _check_mpx_rate(rate: float):
+    if rate <= 2 * MPX_BANDWIDTH:
+        raise ValueError(f"La tasa del MPX ({rate / 1000:.1f} kHz) debe superar "
+                         f"{2 * MPX_BANDWIDTH / 1000:.0f} kHz")
+
+
+class StereoComposer:
+    """Compone el MPX estéreo bloque a bloque."""
+
+    def __init__(self, rate: float):
+        """
+        Args:
+            rate: Frecuencia de muestreo del MPX (Hz), mayor que 2·53 kHz
+
+        Raises:
+            ValueError: si la tasa no alcanza para la subportadora
+        """
+        _check_mpx_rate(rate)
+        self.rate = rate
+        self._oscillator = _PilotOscillator(rate)
+        self._workspace = None
+
+    def process(self, left: np.ndarray, right: np.ndarray, out: np.ndarray = None) -> np.ndarray:
+        """
+        Compone un bloque.
+
+        Args:
+            left: Canal izquierdo a la tasa del MPX (±1)
+            right: Canal derecho (misma longitud)
+            out: Arreglo destino opcional
+
+        Returns:
+            Bloque del MPX (pico ≤ 1)
+        """
+        n = len(left)
+        if self._workspace is None or self._workspace.n != n:
+            self._workspace = Workspace(n)
+        theta = self._oscillator.advance(n)
+        carrier = self._workspace.buffer("subportadora")
+        difference = np.subtract(left, right, out=self._workspace.buffer("diferencia"))
+
+        # L−R en doble banda lateral sobre sin(2θ)
+        np.multiply(theta, 2, out=carrier)
+        np.sin(carrier, out=carrier)
+        difference *= carrier
+
+        mpx = np.add(left, right, out=out)
+        mpx += difference
+        mpx *= AUDIO_LEVEL
+        np.sin(theta, out=carrier)
+        carrier *= PILOT_LEVEL
+        mpx += carrier
+        return mpx
+
+
+def stereo_lowpass(rate: float, decimation: int) -> np.ndarray:
+    """
+    Pasabajos de audio del decodificador: pasa 15 kHz y rechaza el piloto.
+
+    Sinc con ventana de Kaiser (β = 8, unos 80 dB) con corte a mitad de la
+    transición 15-19 kHz; la longitud, múltiplo del diezmado, sale de la
+    fórmula de Kaiser para esa transición.
+
+    Args:
+        rate: Frecuencia de muestreo del MPX (Hz)
+        decimation: Factor de diezmado posterior
+
+    Returns:
+        Coeficientes con ganancia unitaria en continua
+    """
+    cutoff = (AUDIO_BANDWIDTH + PILOT_FREQ) / 2
+    transition = TWO_PI * (PILOT_FREQ - AUDIO_BANDWIDTH) / rate
+    length = (LOWPASS_ATTENUATION_DB - 8) / (2.285 * transition) + 1
+    taps = decimation * math.ceil(length / decimation)
+    n = np.arange(taps) - (taps - 1) / 2
+    h = np.sinc(2 * cutoff / rate * n) * np.kaiser(taps, 8.0)
+    return h / h.sum()
+
+
+class StereoDecoder:
+    """
+    Decodificador estéreo por bloques: recuperación del piloto y demodulación de L−R.
+
+    La fase del piloto se estima por ventanas de PILOT_WINDOW correlacionando
+    el MPX con el oscilador nominal de 19 kHz (una suma por ventana con
+    np.add.reduceat); duplicarla da la subportadora coherente de 38 kHz.
+    Suma y diferencia demoduladas se filtran y diezman juntas como una
+    señal compleja con un solo PolyphaseDecimator.
+    """
+
+    def __init__(self, rate: float, decimation: Optional[int] = None):
+        """
+        Args:
+            rate: Frecuencia de muestreo del MPX (Hz)
+            decimation: Diezmado hasta la tasa del audio; por defecto, el mayor
+                que deja la tasa de salida por encima de 2·19 kHz
+
+        Raises:
+            ValueError: si la tasa no alcanza para la subportadora
+        """
+        _check_mpx_rate(rate)
+        if decimation is None:
+            decimation = max(1, int(rate // (2 * PILOT_FREQ)))
+        self.rate = rate
+        self._oscillator = _PilotOscillator(rate)
+        self._filter = PolyphaseDecimator(decimation, h=stereo_lowpass(rate, decimation))
+        self._window = max(1, int(round(PILOT_WINDOW * rate)))
+        self.pilot_level = 0.0  # Amplitud del piloto en la última ventana
+        self._workspace = None
+
+    @property
+    def output_rate(self) -> float:
+        """Frecuencia de muestreo del audio (Hz)."""
+        return self.rate / self._filter.factor
+
+    @property
+    def delay(self) -> float:
+        """Retardo de grupo en muestras del MPX."""
+        return self._filter.delay
+
+    def process(self, mpx: np.ndarray) -> np.ndarray:
+        """
+        Decodifica un bloque.
+
+        Args:
+            mpx: Bloque del MPX (p. ej. la salida del demodulador FM con kf = desviación)
+
+        Returns:
+            Audio (tramas, 2) con L y R a output_rate; la longitud depende de
+            las muestras acumuladas en el diezmador
+        """
+        n = len(mpx)
+        if self._workspace is None or self._workspace.n != n:
+            self._workspace = Workspace(n)
+        theta = self._oscillator.advance(n)
+        product = self._workspace.buffer("producto")
+        packed = self._workspace.buffer("suma_diferencia", np.complex128)
+
+        # Piloto: correlación por ventana con e^{−jθ}. Para 0,1·sin(θ + φ) da
+        # 0,05·e^{j(φ − π/2)}, así que φ = ángulo + π/2 y la amplitud es 2·|p|
+        starts = np.arange(0, n, self._window)
+        counts = np.diff(np.append(starts, n))
+        np.cos(theta, out=product)
+        product *= mpx
+        in_phase = np.add.reduceat(product, starts)
+        np.sin(theta, out=product)
+        product *= mpx
+        quadrature = np.add.reduceat(product, starts)
+        pilot = (in_phase - 1j * quadrature) / counts
+        level = 2 * np.abs(pilot)
+        self.pilot_level = float(level[-1])
+
+        # Subportadora coherente 2·sin(2θ + 2φ): el producto con el MPX deja
+        # 0,45·(L−R) en banda base
+        np.multiply(theta, 2, out=product)
+        product += np.repeat(2 * np.angle(pilot) + np.pi, counts)
+        np.sin(product, out=product)
+        product *= 2
+        product *= mpx
+        locked = level >= PILOT_LOCK_LEVEL
+        if not locked.all():
+            product *= np.repeat(locked, counts)
+
+        packed.real = mpx
+        packed.imag = product
+        filtered = self._filter.process(packed)
+
+        audio = np.empty((len(filtered), 2))
+        np.add(filtered.real, filtered.imag, out=audio[:, 0])
+        np.subtract(filtered.real, filtered.imag, out=audio[:, 1])
+        audio /= 2 * AUDIO_LEVEL
+        return audio
+
+
+@dataclass
+class StereoChainPlan:
+    """Tasas de la cadena audio estéreo → MPX → FM → MPX → audio estéreo."""
+    rate: float  # Tasa del audio (Hz)
+    mpx_up: int  # Interpolación del audio hasta la tasa del MPX (y diezmado de vuelta)
+    rf: AudioChainPlan  # Cadena FM del MPX (su rate es la tasa del MPX)
+
+    @property
+    def mpx_rate(self) -> float:
+        """Tasa del MPX (Hz)."""
+        return self.rate * self.mpx_up
+
+
+def plan_stereo_chain(rate: float, fc: float, deviation: float = BROADCAST_DEVIATION) -> StereoChainPlan:
+    """
+    Elige los factores enteros de la cadena estéreo.
+
+    Args:
+        rate: Frecuencia de muestreo del audio (Hz)
+        fc: Frecuencia portadora (Hz)
+        deviation: Desviación de frecuencia máxima (Hz)
+
+    Returns:
+        StereoChainPlan
+
+    Raises:
+        ValueError: si la portadora no deja espacio a la banda de Carson
+    """
+    mpx_up = max(2, math.ceil(MPX_SAMPLING_MARGIN * MPX_BANDWIDTH / rate))
+    rf = plan_audio_chain(rate * mpx_up, fc, deviation, bandwidth=MPX_BANDWIDTH)
+    return StereoChainPlan(rate, mpx_up, rf)
+
+
+def process_stereo(source: PCMSource, fc: Optional[float] = None, deviation: float = BROADCAST_DEVIATION,
+                   snr_db: Optional[float] = None, seed: int = 42) -> Iterator[np.ndarray]:
+    """
+    Compone el MPX, lo transmite en FM y lo decodifica, bloque a bloque.
+
+    La salida tiene tantas tramas como la entrada y queda alineada con ella
+    (a media muestra del MPX). Un archivo mono se transmite con L = R.
+
+    Args:
+        source: Fuente de audio (se usan sus dos primeros canales)
+        fc: Frecuencia portadora (Hz); None, el MPX pasa directo al decodificador
+        deviation: Desviación para un MPX de pico 1 (Hz); kf = deviation
+        snr_db: Relación señal-ruido del canal de RF (dB); None, sin ruido
+        seed: Semilla del ruido
+
+    Yields:
+        Bloques (tramas, 2) con L y R a la tasa del audio
+    """
+    if fc is None:
+        mpx_up = max(2, math.ceil(MPX_SAMPLING_MARGIN * MPX_BANDWIDTH / source.rate))
+        plan = None
+    else:
+        plan = plan_stereo_chain(source.rate, fc, deviation)
+        mpx_up = plan.mpx_up
+    return _stereo_blocks(source, mpx_up, plan, fc, deviation, snr_db, seed)
+
+
+def _stereo_blocks(source, mpx_up, plan, fc, deviation, snr_db, seed):
+    mpx_rate = source.rate * mpx_up
+    interpolator = PolyphaseInterpolator(mpx_up)
+    composer = StereoComposer(mpx_rate)
+    decoder = StereoDecoder(mpx_rate, mpx_up)
+
+    # Mismo criterio que core.audio: la salida n corresponde a la muestra
+    # (n·up + up − 1 − retardo) del MPX; `pad` ceros la llevan a n·up
+    delay = int(round(interpolator.delay + decoder.delay))
+    pad = -(delay - (mpx_up - 1)) % mpx_up
+    skip = (delay + pad - (mpx_up - 1)) // mpx_up
+    remaining = source.frames
+    flush = np.zeros((skip + 1, source.channels))  # Vacía los filtros al final
+
+    def mpx_blocks():
+        for chunk in itertools.chain(source.chunks(mono=False), [flush]):
+            # L y R se interpolan juntos como L + jR
+            right = chunk[:, 1] if chunk.shape[1] > 1 else chunk[:, 0]
+            upsampled = interpolator.process(chunk[:, 0] + 1j * right)
+            yield composer.process(upsampled.real, upsampled.imag)
+
+    mpx = mpx_blocks()
+    if plan is not None:
+        mpx = fm_loopback(mpx, (source.frames + len(flush)) * mpx_up, plan.rf, fc, deviation, snr_db, seed)
+    for block in mpx:
+        if pad:
+            block, pad = np.concatenate([np.zeros(pad), block]), 0
+        out = decoder.process(block)
+        if skip:
+            dropped = min(skip, len(out))
+            out, skip = out[dropped:], skip - dropped
+        out = out[:remaining]
+        remaining -= len(out)
+        if len(out):
+            yield out
+
+
+def _test_tone_wav(path: str, rate: float, duration: float):
+    """Escribe un WAV estéreo con un tono distinto en cada canal."""
+    frames = int(rate * duration)
+
+    def blocks():
+        for start in range(0, frames, CHUNK_FRAMES):
+            t = np.arange(start, min(start + CHUNK_FRAMES, frames)) / rate
+            yield 0.9 * np.sin(TWO_PI * np.outer(t, TEST_TONES))
+
+    write_wav(path, rate, blocks(), channels=2)
+
+
+def _run(source: PCMSource, fc, deviation, snr_db, output, tones: bool):
+    """Procesa la fuente; devuelve (segundos, tramas, separación por canal en dB o None)."""
+    # Proyección de cada canal sobre cada tono: [tono, canal]
+    projection = np.zeros((len(TEST_TONES), 2), dtype=complex)
+
+    def measured(blocks):
+        frames = 0
+        for block in blocks:
+            if tones:
+                n = np.arange(frames, frames + len(block))
+                projection[:] += np.exp(-1j * TWO_PI * np.outer(TEST_TONES, n) / source.rate) @ block
+            frames += len(block)
+            yield block
+
+    start = time.perf_counter()
+    blocks = measured(process_stereo(source, fc, deviation, snr_db))
+    if output:
+        frames = write_wav(output, source.rate, blocks, channels=2)
+    else:
+        frames = sum(len(block) for block in blocks)
+    seconds = time.perf_counter() - start
+
+    if not tones:
+        return seconds, frames, None
+    magnitude = np.abs(projection)
+    return seconds, frames, [20 * np.log10(magnitude[k, k] / magnitude[k, 1 - k]) for k in range(2)]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Transmite audio estéreo en FM (MPX con piloto) y lo decodifica.")
+    parser.add_argument("entrada", nargs="?", help="WAV estéreo (por defecto, un tono distinto por canal)")
+    parser.add_argument("salida", nargs="?", help="WAV estéreo de salida (por defecto no se escribe)")
+    parser.add_argument("--fc", type=float, default=0.25, help="Portadora (MHz)")
+    parser.add_argument("--deviation", type=float, default=BROADCAST_DEVIATION / 1e3,
+                        help="Desviación a plena escala (kHz)")
+    parser.add_argument("--snr", type=float, default=None, help="SNR del canal (dB)")
+    parser.add_argument("--dur", type=float, default=10.0, help="Duración de los tonos de prueba (s)")
+    parser.add_argument("--rate", type=float, default=44100.0, help="Tasa de los tonos de prueba (Hz)")
+    parser.add_argument("--chunk", type=int, default=CHUNK_FRAMES, help="Tramas de audio por bloque")
+    args = parser.parse_args(argv)
+
+    tones = args.entrada is None
+    if tones:
+        handle, path = tempfile.mkstemp(suffix=".wav")
+        os.close(handle)
+        _test_tone_wav(path, args.rate, args.dur)
+    else:
+        path = args.entrada
+    try:
+        source = open_wav(path, args.chunk)
+        fc, deviation = args.fc * 1e6, args.deviation * 1e3
+        plan = plan_stereo_chain(source.rate, fc, deviation)
+        print(f"{source.frames:,} tramas ({source.duration:.1f} s) a {source.rate / 1000:.1f} kHz → "
+              f"MPX a {plan.mpx_rate / 1000:.1f} kHz (×{plan.mpx_up}), "
+              f"Fs = {plan.rf.Fs / 1e6:.3f} MHz (×{plan.rf.up})")
+
+        for label, carrier, output in (("MPX directo", None, None), ("MPX en FM", fc, args.salida)):
+            seconds, frames, separation = _run(source, carrier, deviation, args.snr, output, tones)
+            rate = source.frames * plan.mpx_up / seconds / 1e6 if seconds > 0 else float("inf")
+            line = (f"  {label:<12} {frames:,} tramas en {seconds:.2f} s "
+                    f"(×{source.duration / seconds:.1f} tiempo real, {rate:.1f} MS/s de MPX")
+            if carrier is not None:
+                line += f", {rate * plan.rf.up:.1f} MS/s de RF"
+            line += ")"
+            if separation is not None:
+                line += f", separación L {separation[0]:.1f} dB, R {separation[1]:.1f} dB"
+            print(line)
+    finally:
+        if tones:
+            os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
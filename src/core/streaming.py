@@ -0,0 +1,142 @@
+"""
+Modulación y demodulación FM por bloques con estado.
+
+Procesan una señal arbitrariamente larga en trozos consecutivos: el
+modulador continúa la fase de un bloque al siguiente y el demodulador
+conserva la fase del oscilador local, la historia de sus filtros y la
+última muestra del discriminador. El resultado no depende de cómo se
+corte la señal y la memoria queda acotada por el tamaño del bloque.
+"""
+import numpy as np
+
+from .fm_calculator import calculate_fm_signal
+from .resample import PolyphaseDecimator
+from .workspace import Workspace, time_vector
+
+TWO_PI = 2 * np.pi
+
+
+class FMBlockModulator:
+    """Modulador FM que continúa la fase entre bloques."""
+
+    def __init__(self, fc: float, kf: float, Fs: float):
+        """
+        Args:
+            fc: Frecuencia portadora (Hz)
+            kf: Sensibilidad de frecuencia (Hz/V)
+            Fs: Frecuencia de muestreo (Hz)
+        """
+        self.fc = fc
+        self.kf = kf
+        self.Fs = Fs
+        self._phase = 0.0  # Fase de la próxima muestra, reducida a [0, 2π)
+        self._workspace = None
+
+    def process(self, m: np.ndarray, out: np.ndarray = None) -> np.ndarray:
+        """
+        Modula un bloque del mensaje.
+
+        Args:
+            m: Bloque del mensaje a la tasa Fs
+            out: Arreglo destino opcional
+
+        Returns:
+            Bloque de la señal FM (len(m) muestras)
+        """
+        n = len(m)
+        if self._workspace is None or self._workspace.n != n:
+            self._workspace = Workspace(n)
+        fi = self._workspace.buffer("fi")
+        phi = self._workspace.buffer("fase")
+        s, _, phi = calculate_fm_signal(time_vector(n, self.Fs), self.fc, self.kf, m, 1 / self.Fs,
+                                        out=(out, fi, phi), phase0=self._phase)
+        self._phase = (phi[-1] + TWO_PI * self.fc / self.Fs) % TWO_PI
+        return s
+
+
+class FMBlockDemodulator:
+    """
+    Demodulador FM por bloques: conversión a banda base, diezmado y discriminador.
+
+    La señal real se mezcla con el oscilador local e^{−j2πfc·t}, se filtra y
+    diezma por `decimation` (la tasa intermedia debe abarcar el ancho de
+    banda de Carson), pasa por el discriminador de fase y, opcionalmente, se
+    diezma otra vez por `output_decimation` hasta la tasa del mensaje.
+    """
+
+    def __init__(self, fc: float, kf: float, Fs: float, decimation: int, output_decimation: int = 1):
+        """
+        Args:
+            fc: Frecuencia portadora (Hz)
+            kf: Sensibilidad de frecuencia (Hz/V); la salida es Δf/kf
+            Fs: Frecuencia de muestreo de la entrada (Hz)
+            decimation: Diezmado antes del discriminador
+            output_decimation: Diezmado después del discriminador
+        """
+        self.fc = fc
+        self.kf = kf
+        self.Fs = Fs
+        self._baseband = PolyphaseDecimator(decimation)
+        self._output = PolyphaseDecimator(output_decimation) if output_decimation > 1 else None
+        self._phase = 0.0  # Fase del oscilador local en la próxima muestra
+        self._last = 1.0 + 0j  # Última muestra en banda base (para el discriminador)
+        self._workspace = None
+
+    @property
+    def output_rate(self) -> float:
+        """Frecuencia de muestreo de la salida (Hz)."""
+        rate = self.Fs / self._baseband.factor
+        return rate / self._output.factor if self._output is not None else rate
+
+    @property
+    def delay(self) -> float:
+        """Retardo de grupo total en muestras de entrada."""
+        D1 = self._baseband.factor
+        # El discriminador estima la frecuencia entre n−1 y n: media muestra intermedia
+        delay = self._baseband.delay + D1 / 2
+        if self._output is not None:
+            delay += self._output.delay * D1
+        return delay
+
+    def process(self, s: np.ndarray) -> np.ndarray:
+        """
+        Demodula un bloque.
+
+        Args:
+            s: Bloque de la señal FM real a la tasa Fs
+
+        Returns:
+            Mensaje recuperado (Δf/kf) a output_rate; la longitud depende de las
+            muestras acumuladas en los diezmadores
+        """
+        n = len(s)
+        if self._workspace is None or self._workspace.n != n:
+            self._workspace = Workspace(n)
+        phase = self._workspace.buffer("fase")
+        mixed = self._workspace.buffer("banda_base", np.complex128)
+
+        # Oscilador local con fase continua entre bloques
+        np.multiply(time_vector(n, self.Fs), TWO_PI * self.fc, out=phase)
+        phase += self._phase
+        self._phase = (phase[-1] + TWO_PI * self.fc / self.Fs) % TWO_PI
+        np.cos(phase, out=mixed.real)
+        np.sin(phase, out=mixed.imag)
+        mixed.imag *= -1
+        mixed.real *= s
+        mixed.imag *= s
+
+        baseband = self._baseband.process(mixed)
+        if len(baseband) == 0:
+            return np.zeros(0)
+
+        # Discriminador: ángulo de z[n]·conj(z[n−1]) con la muestra previa guardada
+        previous = np.empty_like(baseband)
+        previous[0] = self._last
+        previous[1:] = baseband[:-1]
+        self._last = baseband[-1]
+        np.conjugate(previous, out=previous)
+        previous *= baseband
+        message = np.angle(previous)
+        message *= self.Fs / self._baseband.factor / (TWO_PI * self.kf)
+
+        return self._output.process(message) if self._output is not None else message
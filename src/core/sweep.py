@@ -0,0 +1,98 @@
+"""
+Barrido de un parámetro de modulación: espectros de muchos cuadros en lote.
+
+Para ver cómo se abre el espectro al subir β no hace falta recalcular la
+señal completa en cada posición. La fase de todos los cuadros sale de un
+solo producto exterior,
+
+    φ_k(t) = 2π·fc·t + 2π·Δf_k·∫m(τ)dτ     (Δf_k = kf_k·Am_k),
+
+con la integral del mensaje normalizado calculada una vez. Los cuadros se
+procesan en bloques de filas (memoria acotada) con una FFT real por lote a
+lo largo del eje del tiempo, y de cada espectro solo se guarda la ventana
+fc ± B_máx reducida por máximos a un número fijo de puntos en float32.
+"""
+from typing import Tuple
+
+import numpy as np
+
+from .bandwidth import OCCUPIED_POWER_FRACTION, occupied_span
+from .fft_plan import rfft, spectrum_frequencies
+
+# Parámetros que pueden barrerse
+SWEEP_PARAMETERS = ("beta", "kf", "Am")
+# Puntos por espectro guardados en cada cuadro
+SWEEP_SPECTRUM_POINTS = 1000
+# Memoria máxima de un bloque de cuadros (fase + espectro)
+SWEEP_CHUNK_BYTES = 64 * 1024 * 1024
+
+
+def sweep_spectra(t: np.ndarray, m: np.ndarray, fc: float, deviations: np.ndarray, Fs: float,
+                  band: Tuple[float, float], points: int = SWEEP_SPECTRUM_POINTS,
+                  chunk_bytes: int = SWEEP_CHUNK_BYTES) -> dict:
+    """
+    Espectros de la señal FM para muchas desviaciones en una pasada por lotes.
+
+    Args:
+        t: Vector de tiempo
+        m: Mensaje normalizado (±1)
+        fc: Frecuencia portadora (Hz)
+        deviations: Desviación Δf de cada cuadro (Hz)
+        Fs: Frecuencia de muestreo (Hz)
+        band: (f_min, f_max) de la ventana guardada (Hz)
+        points: Puntos máximos por espectro
+        chunk_bytes: Memoria máxima por bloque de cuadros
+
+    Returns:
+        dict con freqs (points,), mag_db (cuadros, points) en float32, el
+        máximo de cada tramo de bins, y B_occupied (cuadros,) en Hz; sin
+        cuadros si la ventana no contiene ningún bin
+    """
+    n = len(t)
+    deviations = np.asarray(deviations, dtype=float)
+    frames = len(deviations)
+
+    # Ventana de bins y reducción por máximos a `points` tramos
+    freqs = spectrum_frequencies(n, Fs)
+    low, high = np.searchsorted(freqs, band[0]), np.searchsorted(freqs, band[1], side="right")
+    if high <= low:
+        return {"freqs": freqs[:0], "mag_db": np.empty((0, 0), dtype=np.float32), "B_occupied": np.empty(0)}
+    size = -(-(high - low) // points)  # Bins por tramo
+    buckets = -(-(high - low) // size)
+    high_padded = min(low + buckets * size, len(freqs))
+
+    integral = np.cumsum(m)
+    integral *= 2 * np.pi / Fs
+    carrier_phase = np.multiply(t, 2 * np.pi * fc)
+
+    mag_db = np.empty((frames, buckets), dtype=np.float32)
+    occupied = np.empty(frames)
+    rows = max(1, chunk_bytes // (n * 32))
+    for start in range(0, frames, rows):
+        stop = min(start + rows, frames)
+        # Fase de todos los cuadros del bloque: producto exterior Δf_k · ∫m
+        phase = np.multiply.outer(deviations[start:stop], integral)
+        phase += carrier_phase
+        np.cos(phase, out=phase)
+        spectrum = rfft(phase, axis=-1)
+        del phase
+
+        power = spectrum.real ** 2
+        power += spectrum.imag ** 2
+        occupied[start:stop] = occupied_span(power, OCCUPIED_POWER_FRACTION) * (Fs / n)
+
+        # |X|/N como en compute_spectrum, máximo por tramo y luego dB
+        window = np.zeros((stop - start, buckets * size))
+        window[:, :high_padded - low] = power[:, low:high_padded]
+        peak = window.reshape(stop - start, buckets, size).max(axis=-1)
+        np.sqrt(peak, out=peak)
+        peak /= n
+        peak += 1e-12
+        mag_db[start:stop] = 20 * np.log10(peak)
+
+    # Frecuencia del primer bin de cada tramo
+    return {
+        "freqs": freqs[low:low + buckets * size:size],
+        "mag_db": mag_db,
+        "B_occupied": occupied,
+    }
@@ -0,0 +1,52 @@
+"""
+Reducción de trazas para visualización.
+
+Una gráfica no puede mostrar más puntos que píxeles de ancho: enviar las N
+muestras de una señal al navegador solo agranda la carga. La reducción
+min-max conserva, en cada tramo, la muestra mínima y la máxima en su orden
+original, así que la envolvente (picos, ruido, recortes) se ve igual que
+con todas las muestras y el tamaño queda acotado sin importar N.
+"""
+from typing import Tuple
+
+import numpy as np
+
+# Puntos por traza enviados a las gráficas interactivas
+MAX_TRACE_POINTS = 2000
+
+
+def decimate_trace(x: np.ndarray, y: np.ndarray, max_points: int = MAX_TRACE_POINTS) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Reduce una traza a lo sumo a max_points puntos conservando mínimos y máximos.
+
+    Divide la traza en max_points/2 tramos iguales y toma de cada uno el
+    mínimo y el máximo (en el orden en que aparecen), con argmin y argmax
+    sobre una vista (tramos, muestras): sin bucles por tramo.
+
+    Args:
+        x: Abscisas (misma longitud que y)
+        y: Ordenadas
+        max_points: Puntos máximos de la salida (al menos 2)
+
+    Returns:
+        (x, y) reducidos; los originales si ya caben
+    """
+    n = len(y)
+    if n <= max_points:
+        return x, y
+    size = -(-n // (max_points // 2))  # Muestras por tramo
+    full = n // size
+    body = y[:full * size].reshape(full, size)
+    offsets = np.arange(full) * size
+    low = body.argmin(axis=1) + offsets
+    high = body.argmax(axis=1) + offsets
+
+    index = np.empty(2 * full + 2 * (full * size < n), dtype=np.intp)
+    index[0:2 * full:2] = np.minimum(low, high)
+    index[1:2 * full:2] = np.maximum(low, high)
+    if full * size < n:
+        # Último tramo incompleto
+        tail = y[full * size:]
+        ends = full * size + np.array([tail.argmin(), tail.argmax()])
+        index[2 * full:] = np.sort(ends)
+    return x[index], y[index]
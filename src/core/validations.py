@@ -1,9 +1,12 @@
 """
 Validaciones para parámetros de muestreo y señales.
 """
+import math
 from dataclasses import dataclass
 from typing import Optional
 
+from .fft_plan import next_fast_len
+
 
 @dataclass
 class ValidationResult:
@@ -13,6 +16,14 @@ class ValidationResult:
     level: str  # "error", "warning", "info"
 
 
+@dataclass
+class SamplingSuggestion:
+    """Frecuencia de muestreo mínima sugerida."""
+    Fs: float
+    N: int
+    constraint: str  # "nyquist", "mensaje", "visualización"
+
+
 def validate_nyquist(fc: float, delta_f: float, Fs: float) -> ValidationResult:
     """
     Valida el criterio de Nyquist mejorado para FM.
@@ -68,3 +79,35 @@ def validate_samples_per_period(Fs: float, fm: float, min_samples: float = 10.0)
         )
     
     return None
+
+
+def suggest_sampling_rate(fc: float, delta_f: float, fm: float, dur: float,
+                          nyquist_margin: float = 0.25, min_samples: float = 10.0,
+                          samples_per_carrier_cycle: float = 4.0) -> SamplingSuggestion:
+    """
+    Calcula la menor Fs que cumple todas las validaciones de muestreo.
+
+    La Fs resultante hace que N = Fs·dur sea una longitud 5-smooth, de modo
+    que las FFT de espectro y demodulación usen un tamaño eficiente.
+
+    Args:
+        fc: Frecuencia portadora (Hz)
+        delta_f: Desviación de frecuencia (Hz)
+        fm: Frecuencia del mensaje (Hz)
+        dur: Duración de la señal (s)
+        nyquist_margin: Margen relativo sobre 2·(fc + Δf)
+        min_samples: Mínimo de muestras por período del mensaje
+        samples_per_carrier_cycle: Mínimo de muestras por ciclo de portadora (visualización)
+
+    Returns:
+        SamplingSuggestion con Fs, N y la restricción que determinó el valor
+    """
+    floors = {
+        "nyquist": 2 * (fc + abs(delta_f)) * (1 + nyquist_margin),
+        "mensaje": min_samples * fm,
+        "visualización": samples_per_carrier_cycle * fc,
+    }
+    constraint = max(floors, key=floors.get)
+
+    N = next_fast_len(max(2, math.ceil(floors[constraint] * dur)))
+    return SamplingSuggestion(Fs=N / dur, N=N, constraint=constraint)
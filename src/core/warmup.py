@@ -0,0 +1,164 @@
+"""
+Precalentamiento de cachés con configuraciones frecuentes.
+
+Calcula de antemano las etapas del pipeline para los valores por defecto
+del sidebar y cada forma de onda, de modo que la primera sesión después de
+un despliegue encuentre los resultados en la caché.
+
+Uso desde la línea de comandos (desde src/):
+    python -m core.warmup [--defaults-only] [--config lista.json] [--snr 20]
+
+El archivo --config contiene una lista JSON de dicts con claves de
+render_sidebar() en unidades SI; las claves omitidas toman el valor por
+defecto, p. ej. [{"waveform": "Cuadrada", "kf": 20000}].
+"""
+import argparse
+import json
+import os
+import time
+from dataclasses import dataclass
+from typing import List, Optional
+
+from .memory_profile import memory_mode_enabled
+from .pipeline import config_from_params
+from .waveforms import BUILTIN_WAVEFORMS
+from .workers import ComputePool, get_compute_pool
+
+# Estado inicial del sidebar (unidades SI); debe coincidir con app/sidebar.py
+DEFAULT_PARAMS = {
+    "waveform": "Senoidal",
+    "auto_fs": True,
+    "Fs": 10_000_000.0,
+    "dur": 0.005,
+    "fc": 1_000_000.0,
+    "fm": 1_000.0,
+    "Am": 1.0,
+    "kf": 5_000.0,  # β = 5 con fm = 1 kHz y Am = 1 V
+    "auto_h": True,
+    "H": 1,
+    "show_carrier": True,
+}
+DEFAULT_SNR_DB = 20
+
+
+@dataclass
+class WarmupReport:
+    """Resultado del precalentamiento de una configuración."""
+    label: str
+    seconds: float
+    cached: bool  # True si ya estaba en la caché en disco
+
+
+def default_warmup_params(all_waveforms: bool = True) -> List[dict]:
+    """
+    Configuraciones a precalentar: los valores por defecto y cada forma de onda.
+
+    Args:
+        all_waveforms: Incluir una configuración por cada forma de onda
+
+    Returns:
+        Lista de dicts con el formato de render_sidebar()
+    """
+    waveforms = list(BUILTIN_WAVEFORMS) if all_waveforms else [DEFAULT_PARAMS["waveform"]]
+    return [dict(DEFAULT_PARAMS, waveform=waveform) for waveform in waveforms]
+
+
+def load_warmup_params(path) -> List[dict]:
+    """
+    Lee una lista de configuraciones desde un archivo JSON.
+
+    Args:
+        path: Ruta del archivo
+
+    Returns:
+        Lista de dicts completados con DEFAULT_PARAMS
+    """
+    with open(path, encoding="utf-8") as f:
+        entries = json.load(f)
+    return [dict(DEFAULT_PARAMS, **entry) for entry in entries]
+
+
+def server_warmup_params() -> List[dict]:
+    """
+    Configuraciones que precalienta el servidor al arrancar.
+
+    DEMO_FM_WARMUP=0 desactiva el precalentamiento; DEMO_FM_WARMUP_FILE
+    apunta a una lista JSON que reemplaza la lista por defecto. En modo de
+    memoria no se precalienta, para no mezclar sus asignaciones con las mediciones.
+    """
+    if os.environ.get("DEMO_FM_WARMUP", "1") == "0" or memory_mode_enabled():
+        return []
+    path = os.environ.get("DEMO_FM_WARMUP_FILE")
+    if path:
+        return load_warmup_params(path)
+    return default_warmup_params()
+
+
+def warm_up(params_list: List[dict], snr_db: float = DEFAULT_SNR_DB,
+            pool: Optional[ComputePool] = None) -> List[WarmupReport]:
+    """
+    Ejecuta las etapas del pipeline para cada configuración.
+
+    Args:
+        params_list: Configuraciones con el formato de render_sidebar()
+        snr_db: SNR de la etapa de demodulación
+        pool: Pool de cómputo (por defecto, el compartido del proceso)
+
+    Returns:
+        Lista de WarmupReport, una por configuración
+    """
+    pool = pool or get_compute_pool()
+    reports = []
+    for params in params_list:
+        config, _, _ = config_from_params(params)
+        cached = pool.cache is not None and pool.cache.get("signals", (config,)) is not None
+
+        start = time.perf_counter()
+        pool.run("signals", config)
+        pool.run("demodulation", config, snr_db)
+        reports.append(WarmupReport(
+            label=f"{config.waveform}, Fs={config.Fs / 1e6:.3f} MHz, N={config.N:,}",
+            seconds=time.perf_counter() - start,
+            cached=cached,
+        ))
+    return reports
+
+
+def format_report(reports: List[WarmupReport]) -> str:
+    """Resumen legible del precalentamiento."""
+    lines = [
+        f"{'configuración':<48} {'tiempo [ms]':>12}  estado",
+    ]
+    for report in reports:
+        state = "ya en caché" if report.cached else "calculado"
+        lines.append(f"{report.label:<48} {report.seconds * 1000:>12.1f}  {state}")
+    total = sum(report.seconds for report in reports)
+    lines.append(f"{len(reports)} configuraciones en {total * 1000:.1f} ms")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Precalienta la caché de resultados de la demo FM.")
+    parser.add_argument("--defaults-only", action="store_true",
+                        help="Solo la configuración por defecto (sin recorrer formas de onda)")
+    parser.add_argument("--config", metavar="JSON",
+                        help="Lista JSON de configuraciones a precalentar")
+    parser.add_argument("--snr", type=float, default=DEFAULT_SNR_DB,
+                        help="SNR de la etapa de demodulación (dB)")
+    args = parser.parse_args(argv)
+
+    pool = get_compute_pool()
+    if pool.cache is None:
+        print("Aviso: la caché en disco está desactivada (DEMO_FM_CACHE=0); "
+              "el precalentamiento no persistirá.")
+    if args.config:
+        params_list = load_warmup_params(args.config)
+    else:
+        params_list = default_warmup_params(not args.defaults_only)
+    reports = warm_up(params_list, args.snr, pool)
+    print(format_report(reports))
+    pool.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,16 @@
 """
 Generadores de señales para modulación FM.
 """
+from collections import deque
+from fractions import Fraction
+from functools import lru_cache
+from typing import Callable, Optional
+
 import numpy as np
 
+from .expressions import canonical_expression, compile_expression
+from .fsk import gfsk_message
+
 
 def square_wave(t: np.ndarray, fm: float) -> np.ndarray:
     """Genera una onda cuadrada normalizada a ±1."""
@@ -31,22 +39,215 @@ WAVEFORM_GENERATORS = {
     "Cuadrada": square_wave,
     "Diente de Sierra": sawtooth_wave,
     "Triangular": triangle_wave,
+    "GFSK": gfsk_message,
 }
+# Mensajes periódicos predefinidos: tablas por período, rotación de estaciones y
+# precalentamiento. Los aleatorios (periodic = False, como GFSK) solo se eligen
+# en la barra lateral
+BUILTIN_WAVEFORMS = tuple(
+    name for name, generator in WAVEFORM_GENERATORS.items() if getattr(generator, "periodic", True)
+)
+
+# Los mensajes definidos por expresión se registran como "m(t) = <expresión>":
+# el nombre basta para recompilarlos en otro proceso (pool de cómputo, caché)
+EXPRESSION_PREFIX = "m(t) = "
+# Expresiones registradas a la vez; las más antiguas salen del registro
+MAX_REGISTERED_EXPRESSIONS = 32
+_registered_expressions = deque()
+
+
+def is_expression(waveform: str) -> bool:
+    """True si el nombre corresponde a un mensaje definido por expresión."""
+    return waveform.startswith(EXPRESSION_PREFIX)
+
+
+def register_expression(text: str) -> str:
+    """
+    Valida, compila y registra una expresión en WAVEFORM_GENERATORS.
+
+    Args:
+        text: Expresión en t y fm (ver core.expressions)
+
+    Returns:
+        Nombre de la forma de onda, utilizable donde se espera un nombre de
+        WAVEFORM_GENERATORS
+
+    Raises:
+        ValueError: si la expresión no es válida
+    """
+    name = EXPRESSION_PREFIX + canonical_expression(text)
+    get_generator(name)
+    return name
+
+
+def get_generator(waveform: str) -> Callable[[np.ndarray, float], np.ndarray]:
+    """
+    Generador de una forma de onda por nombre.
+
+    Las expresiones aún no registradas en este proceso se compilan (con
+    caché por texto) y se registran; los nombres desconocidos caen en la
+    senoidal, como antes.
+
+    Args:
+        waveform: Nombre en WAVEFORM_GENERATORS o "m(t) = <expresión>"
+
+    Returns:
+        Función generator(t, fm)
+
+    Raises:
+        ValueError: si es una expresión inválida
+    """
+    generator = WAVEFORM_GENERATORS.get(waveform)
+    if generator is not None:
+        return generator
+    if not is_expression(waveform):
+        return sine_wave
+    generator = compile_expression(waveform[len(EXPRESSION_PREFIX):])
+    WAVEFORM_GENERATORS[waveform] = generator
+    _registered_expressions.append(waveform)
+    while len(_registered_expressions) > MAX_REGISTERED_EXPRESSIONS:
+        WAVEFORM_GENERATORS.pop(_registered_expressions.popleft(), None)
+    return generator
+
+
+def message_period_samples(t: np.ndarray, fm: float, max_denominator: int = 1000) -> Optional[int]:
+    """
+    Calcula cuántas muestras abarca un período exacto del mensaje.
+
+    Si Fs/fm = p/q (fracción irreducible), p muestras cubren exactamente q
+    períodos de m(t): es el período común (mcm) entre la rejilla de muestreo
+    y el mensaje. Requiere que t esté uniformemente muestreado.
+
+    Args:
+        t: Vector de tiempo (uniforme)
+        fm: Frecuencia del mensaje (Hz)
+        max_denominator: Máximo de períodos del mensaje q a considerar
+
+    Returns:
+        p (muestras por período común) o None si no existe uno útil
+    """
+    N = len(t)
+    if N < 4 or fm <= 0:
+        return None
+
+    dt = (t[-1] - t[0]) / (N - 1)
+    if dt <= 0:
+        return None
+
+    ratio = 1.0 / (fm * dt)  # Fs / fm
+    frac = Fraction(ratio).limit_denominator(max_denominator)
+    p = frac.numerator
+
+    # La fracción debe ser exacta (a precisión de máquina) y el período
+    # común debe ser más corto que el registro para que valga la pena.
+    if abs(p * fm * dt - frac.denominator) > 1e-9 * frac.denominator or p * 2 > N:
+        return None
+
+    return p
+
+
+def _tile_into(table: np.ndarray, out: np.ndarray) -> np.ndarray:
+    """Repite table hasta llenar out (equivalente a np.resize, sin asignar)."""
+    n = len(out)
+    filled = min(len(table), n)
+    out[:filled] = table[:filled]
+    while filled < n:  # Duplicar lo ya copiado: O(log(n/p)) copias
+        step = min(filled, n - filled)
+        out[filled:filled + step] = out[:step]
+        filled += step
+    return out
 
 
-def generate_message(t: np.ndarray, fm: float, waveform: str, amplitude: float = 1.0) -> np.ndarray:
+def generate_message(t: np.ndarray, fm: float, waveform: str, amplitude: float = 1.0,
+                     out: np.ndarray = None) -> np.ndarray:
     """
     Genera la señal moduladora m(t).
-    
+
+    El mensaje es periódico en 1/fm: se evalúa un solo período común
+    (ver message_period_samples) y se repite hasta cubrir todo t, así el
+    costo escala con un período y no con la longitud del registro.
+
     Args:
         t: Vector de tiempo
         fm: Frecuencia del mensaje (Hz)
-        waveform: Tipo de onda (Senoidal, Cuadrada, Diente de Sierra, Triangular)
+        waveform: Nombre en WAVEFORM_GENERATORS o "m(t) = <expresión>"
         amplitude: Amplitud Am (V)
+        out: Arreglo destino opcional (misma longitud que t)
     
     Returns:
         Señal moduladora escalada por amplitud
     """
-    generator = WAVEFORM_GENERATORS.get(waveform, sine_wave)
-    m_norm = generator(t, fm)
-    return amplitude * m_norm
+    generator = get_generator(waveform)
+
+    # Las expresiones no periódicas en 1/fm (p. ej. un chirp) se evalúan completas
+    p = message_period_samples(t, fm) if getattr(generator, "periodic", True) else None
+    if p is None:
+        return np.multiply(amplitude, generator(t, fm), out=out)
+
+    # t[j] = t0 + j·dt: la tabla respeta la fase inicial de t
+    table = generator(t[:p], fm)
+    # La periodicidad de las expresiones se sondeó con otros fm: se confirma
+    # con el período siguiente (message_period_samples garantiza 2p ≤ N)
+    if hasattr(generator, "expression") and not np.allclose(generator(t[p:2 * p], fm), table, atol=1e-9):
+        return np.multiply(amplitude, generator(t, fm), out=out)
+    table *= amplitude
+    if out is None:
+        return np.resize(table, len(t))
+    return _tile_into(table, out)
+
+
+# Muestras del período de referencia para estimar armónicos (potencia de 2)
+HARMONIC_PERIOD_SAMPLES = 4096
+# Fracción de la potencia de m(t) que deben capturar los H armónicos
+HARMONIC_POWER_FRACTION = 0.99
+
+
+@lru_cache(maxsize=32)
+def harmonic_power_fractions(waveform: str) -> np.ndarray:
+    """
+    Fracción de la potencia alterna de m(t) en cada armónico de fm.
+
+    Evalúa un solo período (fm = 1, T = 1) con HARMONIC_PERIOD_SAMPLES
+    muestras: el bin k de su rfft es el armónico k, así que el costo no
+    depende de la duración de la señal. Los generadores con atributo
+    harmonic_periods (mensajes aleatorios como GFSK) se evalúan en esa
+    cantidad de períodos y el armónico k reúne la potencia de la banda
+    (k ± ½)·fm. Cacheado por forma de onda.
+
+    Args:
+        waveform: Nombre en WAVEFORM_GENERATORS
+
+    Returns:
+        Arreglo de solo lectura; el elemento k es la fracción en k·fm (k = 0, la
+        componente continua, vale 0 si se evalúa un solo período)
+    """
+    generator = get_generator(waveform)
+    periods = getattr(generator, "harmonic_periods", 1)
+    samples = np.arange(HARMONIC_PERIOD_SAMPLES * periods) / HARMONIC_PERIOD_SAMPLES
+    power = np.abs(np.fft.rfft(generator(samples, 1.0))) ** 2
+    power[0] = 0.0
+    if periods > 1:
+        # Bin j = j/periods armónicos: bandas de ancho fm centradas en cada armónico
+        starts = np.arange(HARMONIC_PERIOD_SAMPLES // 2 + 1) * periods - periods // 2
+        power = np.add.reduceat(power, np.maximum(starts, 0))
+    total = power.sum()
+    fractions = power / total if total > 0 else power
+    fractions.flags.writeable = False
+    return fractions
+
+
+@lru_cache(maxsize=128)
+def estimate_harmonics(waveform: str, power_fraction: float = HARMONIC_POWER_FRACTION) -> int:
+    """
+    Menor H tal que los armónicos 1..H capturan power_fraction de la potencia de m(t).
+
+    Args:
+        waveform: Nombre en WAVEFORM_GENERATORS
+        power_fraction: Fracción objetivo de la potencia (0-1)
+
+    Returns:
+        H estimado (al menos 1)
+    """
+    cumulative = np.cumsum(harmonic_power_fractions(waveform))
+    H = int(np.searchsorted(cumulative, power_fraction * cumulative[-1]))
+    return max(1, min(H, len(cumulative) - 1))
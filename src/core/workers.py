@@ -0,0 +1,227 @@
+"""
+Pool de cómputo compartido entre sesiones.
+
+Las etapas de core.pipeline se ejecutan en un pool de procesos dimensionado
+según la máquina, de modo que sesiones concurrentes no compiten por el GIL
+del servidor. Las peticiones idénticas en curso se deduplican en un solo
+cómputo y los arreglos vuelven al servidor por memoria compartida en lugar
+de serializarse con pickle.
+"""
+import multiprocessing
+import os
+import threading
+import weakref
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import shared_memory
+from typing import Optional
+
+import numpy as np
+
+from .fft_plan import FFT_WORKERS, set_fft_workers
+from .memory_profile import memory_mode_enabled
+from .pipeline import STAGES
+from .result_cache import ResultCache, default_cache
+
+
+def _pack_result(result: dict) -> tuple:
+    """
+    Copia los arreglos de un resultado a un bloque de memoria compartida.
+
+    Args:
+        result: dict con arreglos NumPy y escalares
+
+    Returns:
+        (nombre del bloque, [(clave, dtype, forma, offset)], escalares)
+    """
+    arrays = {k: np.ascontiguousarray(v) for k, v in result.items() if isinstance(v, np.ndarray)}
+    scalars = {k: v for k, v in result.items() if not isinstance(v, np.ndarray)}
+
+    layout = []
+    offset = 0
+    for key, array in arrays.items():
+        offset = -(-offset // 64) * 64  # Alinear cada arreglo a 64 bytes
+        layout.append((key, array.dtype.str, array.shape, offset))
+        offset += array.nbytes
+
+    shm = shared_memory.SharedMemory(create=True, size=max(offset, 1))
+    try:
+        for (key, dtype, shape, start), array in zip(layout, arrays.values()):
+            np.ndarray(shape, dtype=dtype, buffer=shm.buf, offset=start)[...] = array
+        name = shm.name
+    finally:
+        shm.close()
+    return name, layout, scalars
+
+
+def _unpack_result(packed: tuple) -> dict:
+    """
+    Reconstruye un resultado desde memoria compartida, sin copiar los arreglos.
+
+    Los arreglos devueltos son vistas de solo lectura del bloque (pueden
+    compartirse entre varias sesiones). El nombre del bloque se elimina de
+    inmediato y el mapeo se cierra cuando ya no queda ninguna vista viva.
+
+    Args:
+        packed: Valor devuelto por _pack_result
+
+    Returns:
+        dict con arreglos NumPy y escalares
+    """
+    name, layout, scalars = packed
+    shm = shared_memory.SharedMemory(name=name)
+    try:
+        # Todas las vistas cuelgan de un único arreglo de bytes: al liberarse
+        # el último, el finalizador cierra el mapeo (ya sin buffers exportados)
+        segment = np.ndarray((shm.size,), dtype=np.uint8, buffer=shm.buf)
+        weakref.finalize(segment, shm.close)
+        result = {}
+        for key, dtype, shape, start in layout:
+            dtype = np.dtype(dtype)
+            size = dtype.itemsize * int(np.prod(shape))
+            array = segment[start:start + size].view(dtype).reshape(shape)
+            array.flags.writeable = False
+            result[key] = array
+    finally:
+        shm.unlink()  # El mapeo sigue siendo válido sin el nombre
+    result.update(scalars)
+    return result
+
+
+def _run_stage_in_worker(stage: str, args: tuple) -> tuple:
+    """Punto de entrada en el proceso hijo."""
+    return _pack_result(STAGES[stage](*args))
+
+
+def _freeze(result: dict) -> dict:
+    """Marca como solo lectura los arreglos de un resultado compartido."""
+    for value in result.values():
+        if isinstance(value, np.ndarray):
+            value.flags.writeable = False
+    return result
+
+
+class ComputePool:
+    """Pool de procesos con deduplicación de peticiones en curso."""
+
+    def __init__(self, workers: int, cache: Optional[ResultCache] = None):
+        """
+        Args:
+            workers: Número de procesos; 0 ejecuta las etapas en el hilo que llama
+            cache: Caché en disco consultada antes de calcular (opcional)
+        """
+        self.workers = workers
+        self.cache = cache
+        self._executor = self._new_executor() if workers > 0 else None
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self.deduplicated = 0  # Peticiones servidas por un cómputo ya en curso
+
+    def _new_executor(self) -> ProcessPoolExecutor:
+        # spawn: el servidor de Streamlit es multihilo y fork no es seguro. Los hilos
+        # de la FFT se reparten entre los procesos (con un proceso por núcleo, uno)
+        return ProcessPoolExecutor(
+            max_workers=self.workers, mp_context=multiprocessing.get_context("spawn"),
+            initializer=set_fft_workers, initargs=(max(1, FFT_WORKERS // self.workers),),
+        )
+
+    def run(self, stage: str, *args) -> dict:
+        """
+        Ejecuta una etapa del pipeline y devuelve su resultado.
+
+        Si otra sesión ya pidió la misma etapa con los mismos argumentos,
+        espera ese cómputo en lugar de lanzar uno nuevo.
+
+        Args:
+            stage: Nombre de la etapa en core.pipeline.STAGES
+            *args: Argumentos hashables de la etapa
+
+        Returns:
+            dict con arreglos (solo lectura) y escalares
+        """
+        key = (stage, args)
+        with self._lock:
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._inflight[key] = future
+            else:
+                self.deduplicated += 1
+
+        if owner:
+            try:
+                future.set_result(self._execute(stage, args))
+            except BaseException as exc:
+                future.set_exception(exc)
+            finally:
+                with self._lock:
+                    del self._inflight[key]
+
+        return future.result()
+
+    def _execute(self, stage: str, args: tuple) -> dict:
+        if self.cache is not None:
+            cached = self.cache.get(stage, args)
+            if cached is not None:
+                return cached
+
+        if self._executor is None:
+            result = _freeze(STAGES[stage](*args))
+        else:
+            executor = self._executor
+            try:
+                packed = executor.submit(_run_stage_in_worker, stage, args).result()
+            except BrokenProcessPool:
+                # Un proceso murió (p. ej. el OOM killer) y el pool queda inservible:
+                # se rehace una sola vez (la primera sesión que lo note) y se reintenta
+                with self._lock:
+                    if self._executor is executor:
+                        self._executor = self._new_executor()
+                        executor.shutdown(wait=False)
+                    executor = self._executor
+                packed = executor.submit(_run_stage_in_worker, stage, args).result()
+            result = _unpack_result(packed)
+
+        if self.cache is not None:
+            try:
+                self.cache.put(stage, args, result)
+            except OSError:
+                pass  # Disco lleno o sin permisos: el resultado sigue siendo válido
+        return result
+
+    def shutdown(self):
+        """Detiene los procesos del pool."""
+        if self._executor is not None:
+            self._executor.shutdown()
+
+
+_default_pool = None
+_default_lock = threading.Lock()
+
+
+def default_worker_count() -> int:
+    """
+    Número de procesos del pool por defecto.
+
+    Usa DEMO_FM_WORKERS si está definida; si no, un proceso por núcleo.
+    Con un solo núcleo no vale la pena un proceso aparte (0 = en línea).
+    """
+    env = os.environ.get("DEMO_FM_WORKERS")
+    if env is not None:
+        return max(0, int(env))
+    cores = os.cpu_count() or 1
+    return cores if cores > 1 else 0
+
+
+def get_compute_pool() -> ComputePool:
+    """Devuelve el pool compartido del proceso, creándolo en el primer uso."""
+    global _default_pool
+    if _default_pool is None:
+        with _default_lock:
+            if _default_pool is None and memory_mode_enabled():
+                # Modo de memoria: las etapas deben calcularse en este proceso para medirlas
+                _default_pool = ComputePool(0, cache=None)
+            elif _default_pool is None:
+                _default_pool = ComputePool(default_worker_count(), cache=default_cache())
+    return _default_pool
@@ -0,0 +1,126 @@
+"""
+Búferes de trabajo reutilizables para el pipeline.
+
+Un Workspace guarda arreglos de longitud N que se crean en el primer uso y
+se reutilizan en las ejecuciones siguientes del mismo tamaño. Las funciones
+de core escriben en ellos mediante sus parámetros ``out=``, así una
+reejecución con el mismo N casi no pide memoria nueva.
+
+Los workspaces se piden prestados con borrow_workspace() y vuelven a un
+grupo común al terminar: Streamlit usa un hilo nuevo en cada reejecución,
+así que no pueden pertenecer a un hilo. Los búferes se sobrescriben en el
+siguiente préstamo: solo sirven para resultados intermedios, nunca para
+arreglos que se devuelven, se cachean o se comparten entre sesiones.
+"""
+import threading
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Optional
+
+import numpy as np
+
+from .fft_plan import _readonly
+
+
+class Workspace:
+    """Conjunto de búferes con nombre para señales de N muestras."""
+
+    def __init__(self, n: int):
+        """
+        Args:
+            n: Longitud por defecto de los búferes (muestras)
+        """
+        self.n = n
+        self._buffers = {}
+        self.allocations = 0  # Búferes creados; no crece en estado estacionario
+
+    def buffer(self, name: str, dtype=np.float64, length: Optional[int] = None) -> np.ndarray:
+        """
+        Devuelve el búfer con ese nombre, creándolo si no existe.
+
+        El contenido no se inicializa: conserva lo que dejó el uso anterior.
+
+        Args:
+            name: Nombre del búfer (un nombre por resultado intermedio)
+            dtype: Tipo de dato
+            length: Longitud (por defecto, n)
+
+        Returns:
+            Arreglo 1-D reutilizable
+        """
+        length = self.n if length is None else length
+        key = (name, np.dtype(dtype).str, length)
+        buffer = self._buffers.get(key)
+        if buffer is None:
+            buffer = self._buffers[key] = np.empty(length, dtype=dtype)
+            self.allocations += 1
+        return buffer
+
+    def owns(self, array: np.ndarray) -> bool:
+        """True si array es uno de los búferes de este workspace."""
+        return any(array is buffer for buffer in self._buffers.values())
+
+    @property
+    def nbytes(self) -> int:
+        """Memoria total reservada por los búferes."""
+        return sum(buffer.nbytes for buffer in self._buffers.values())
+
+
+# Workspaces libres, el más reciente primero. Se conservan pocos: cada uno
+# ocupa decenas de MB con N grande.
+MAX_IDLE_WORKSPACES = 2
+_idle = []
+_idle_lock = threading.Lock()
+_local = threading.local()
+
+
+@contextmanager
+def borrow_workspace(n: int):
+    """
+    Presta un workspace para señales de n muestras durante el bloque.
+
+    Reutiliza uno libre del mismo tamaño si existe; al salir del bloque
+    vuelve al grupo común.
+
+    Args:
+        n: Número de muestras
+
+    Yields:
+        Workspace de uso exclusivo durante el bloque
+    """
+    with _idle_lock:
+        workspace = next((w for w in _idle if w.n == n), None)
+        if workspace is not None:
+            _idle.remove(workspace)
+    if workspace is None:
+        workspace = Workspace(n)
+
+    previous = getattr(_local, "workspace", None)
+    _local.workspace = workspace
+    try:
+        yield workspace
+    finally:
+        _local.workspace = previous
+        with _idle_lock:
+            _idle.insert(0, workspace)
+            del _idle[MAX_IDLE_WORKSPACES:]
+
+
+def current_workspace() -> Optional[Workspace]:
+    """Workspace prestado al hilo actual, o None fuera de borrow_workspace()."""
+    return getattr(_local, "workspace", None)
+
+
+@lru_cache(maxsize=8)
+def time_vector(n: int, Fs: float) -> np.ndarray:
+    """
+    Vector de tiempo de n muestras a Fs, compartido y de solo lectura.
+
+    Args:
+        n: Número de muestras
+        Fs: Frecuencia de muestreo (Hz)
+
+    Returns:
+        np.linspace(0, n/Fs, n, endpoint=False)
+    """
+    return _readonly(np.linspace(0, n / Fs, n, endpoint=False))
@@ -14,23 +14,37 @@ from pathlib import Path
 # Añadir el directorio src/ al path para imports correctos
 file_path = Path(__file__).resolve()
 src_dir = file_path.parent
-sys.path.insert(0, str(src_dir))
-
-import numpy as np
-import streamlit as st
-import matplotlib.pyplot as plt
-
-from core import (
-    generate_message,
-    FMParameters,
-    calculate_fm_signal,
-    calculate_carrier,
-    validate_nyquist,
-    validate_samples_per_period,
-)
-from app.sidebar import render_sidebar
-from app.components import render_metrics, render_about_section
-from app.tabs import render_time_tab, render_spectrum_tab, render_demodulation_tab
+if str(src_dir) not in sys.path:  # Streamlit reejecuta este script en cada interacción
+    sys.path.insert(0, str(src_dir))
+
+from app.startup import startup_timer, STARTUP_TIMINGS
+
+with startup_timer("numpy + streamlit"):
+    import numpy as np
+    import streamlit as st
+
+with startup_timer("core"):
+    from core import (
+        config_from_params,
+        get_compute_pool,
+        validate_nyquist,
+        validate_samples_per_period,
+    )
+
+with startup_timer("app"):
+    from app.sidebar import render_sidebar
+    from app.components import (
+        render_metrics,
+        render_bandwidth_comparison,
+        render_about_section,
+        render_instrumentation,
+        render_memory_report,
+    )
+    # Las pestañas cargan matplotlib solo al dibujar (ver app.plotting)
+    from app.tabs import render_time_tab, render_spectrum_tab, render_demodulation_tab, render_sweep_tab
+    from app.figures import reset_figures, flush_figures
+    from app.warmup import start_server_warmup, WARMUP_STATUS
+    from app.memory import begin_memory_profile, memory_stage, finish_memory_profile
 
 
 # ============================================================================
@@ -73,6 +87,15 @@ st.markdown(
 # ============================================================================
 
 def main():
+    with startup_timer("primera ejecución de main()"):
+        _run()
+
+
+def _run():
+    # Primera ejecución del proceso: precalentar cachés en segundo plano
+    start_server_warmup()
+    begin_memory_profile()
+
     # Título principal
     st.markdown(
         '<h1 class="main-header">📡 Demo de Modulación FM</h1>', unsafe_allow_html=True
@@ -89,34 +112,29 @@ def main():
     
     # Extraer parámetros
     waveform = params_dict["waveform"]
-    Fs = params_dict["Fs"]
-    dur = params_dict["dur"]
+    auto_fs = params_dict["auto_fs"]
     fc = params_dict["fc"]
     fm = params_dict["fm"]
-    Am = params_dict["Am"]
-    kf = params_dict["kf"]
-    H = params_dict["H"]
     show_carrier = params_dict["show_carrier"]
 
     # ============================================================================
     # CÓMPUTO DE SEÑALES
     # ============================================================================
 
-    # Generar vector de tiempo
-    N = int(Fs * dur)
-    t = np.linspace(0, dur, N, endpoint=False)
-    dt = 1.0 / Fs
-
-    # Generar señal moduladora
-    m = generate_message(t, fm, waveform, Am)
-    m_norm = m / Am if Am > 0 else m  # Normalizada para demodulación
-
-    # Calcular parámetros FM
-    params = FMParameters(fc, fm, Am, kf, H)
-
-    # Generar señales
-    s, fi, _ = calculate_fm_signal(t, fc, kf, m, dt)
-    c = calculate_carrier(t, fc) if show_carrier else None
+    # Fs automática (si está activa) y N eficiente para la FFT
+    with memory_stage("configuración"):
+        config, fft_plan, sampling = config_from_params(params_dict)
+    Fs = config.Fs
+    params = config.params
+    if sampling is not None:
+        st.caption(
+            f"⚙️ Fs automática: {Fs / 1_000_000:.3f} MHz (N = {config.N:,} muestras, "
+            f"limitada por {sampling.constraint})"
+        )
+
+    # Mensaje, señal FM, portadora y espectros en el pool de cómputo compartido
+    with memory_stage("señales"):
+        signals = get_compute_pool().run("signals", config)
 
     # ============================================================================
     # VALIDACIONES DE MUESTREO
@@ -126,7 +144,7 @@ def main():
     nyquist_result = validate_nyquist(fc, params.delta_f, Fs)
     if not nyquist_result.is_valid:
         st.error(nyquist_result.message)
-    elif nyquist_result.level == "warning":
+    elif nyquist_result.level == "warning" and not auto_fs:
         st.warning(nyquist_result.message)
 
     # Validación 2: Muestras por período
@@ -138,32 +156,49 @@ def main():
     # MÉTRICAS PRINCIPALES
     # ============================================================================
 
-    render_metrics(params)
+    render_metrics(params, signals["B_occupied"])
+    render_bandwidth_comparison(fm, params.beta)
     st.divider()
 
     # ============================================================================
     # PESTAÑAS DE VISUALIZACIÓN
     # ============================================================================
 
-    tabs = st.tabs(["⏱️ Tiempo", "📊 Espectro", "🔧 Demodulación"])
+    reset_figures()
+    tabs = st.tabs(["⏱️ Tiempo", "📊 Espectro", "🔧 Demodulación", "🎞️ Barrido"])
+
+    # Las figuras de las pestañas se rasterizan en paralelo al final, aunque
+    # una pestaña falle: las demás no pierden sus figuras pendientes
+    try:
+        # Tab 1: Tiempo
+        with tabs[0], memory_stage("pestaña Tiempo"):
+            render_time_tab(signals["t"], signals["m"], signals["s"], signals["fi"],
+                            signals.get("c"), params, show_carrier)
 
-    # Tab 1: Tiempo
-    with tabs[0]:
-        render_time_tab(t, m, s, fi, c, params, show_carrier)
+        # Tab 2: Espectro
+        with tabs[1], memory_stage("pestaña Espectro"):
+            render_spectrum_tab(signals, params, waveform)
 
-    # Tab 2: Espectro
-    with tabs[1]:
-        render_spectrum_tab(m, s, params, Fs, waveform)
+        # Tab 3: Demodulación
+        with tabs[2], memory_stage("pestaña Demodulación"):
+            render_demodulation_tab(signals["t"], signals["m_norm"], signals["s"], params, config)
 
-    # Tab 3: Demodulación
-    with tabs[2]:
-        render_demodulation_tab(t, m_norm, s, params, Fs)
+        # Tab 4: Barrido
+        with tabs[3], memory_stage("pestaña Barrido"):
+            render_sweep_tab(config)
+    finally:
+        with memory_stage("rasterizado de figuras"):
+            flush_figures()
 
     # ============================================================================
     # INFORMACIÓN ADICIONAL
     # ============================================================================
 
     st.divider()
+    render_instrumentation(fft_plan, STARTUP_TIMINGS, WARMUP_STATUS)
+    memory_profile = finish_memory_profile()
+    if memory_profile is not None:
+        render_memory_report(memory_profile)
     render_about_section()
 
 